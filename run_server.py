@@ -11,6 +11,7 @@ from loguru import logger
 from upgrade_codes.upgrade_manager import UpgradeManager
 
 from src.open_llm_vtuber.server import WebSocketServer
+from src.open_llm_vtuber.workers.supervisor import run_workers
 from src.open_llm_vtuber.config_manager import Config, read_yaml, validate_config
 
 os.environ["HF_HOME"] = str(Path(__file__).parent / "models")
@@ -141,6 +142,11 @@ def run(console_log_level: str):
     if server_config.enable_proxy:
         logger.info("Proxy mode enabled - /proxy-ws endpoint will be available")
 
+    if server_config.workers.count > 1:
+        logger.info(f"Starting {server_config.workers.count} workers...")
+        run_workers(config, init_logger, console_log_level)
+        return
+
     # Initialize the WebSocket server (synchronous part)
     server = WebSocketServer(config=config)
 
@@ -160,6 +166,8 @@ def run(console_log_level: str):
         host=server_config.host,
         port=server_config.port,
         log_level=console_log_level.lower(),
+        # Compress the messages of clients that offer permessage-deflate
+        ws_per_message_deflate=True,
     )
 
 
@@ -0,0 +1,173 @@
+"""
+Benchmark WebSocket connection setup.
+
+Usage:
+    python scripts/benchmark_connection_setup.py [--connections N] [--rounds N]
+
+Opens N concurrent connections against a default context built from
+config_templates/conf.default.yaml with stubbed engines (no models are
+loaded and no MCP server is started, tools are listed by a stub adapter)
+and reports the setup latency per connection. The copy-on-write setup of
+WebSocketHandler is compared with the previous one, which deep-copied the
+configs and read mcp_servers.json for every connection.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from loguru import logger
+
+# Add project root to path to enable imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from src.open_llm_vtuber.config_manager.utils import read_yaml, validate_config  # noqa: E402
+from src.open_llm_vtuber.mcpp.server_registry import ServerRegistry  # noqa: E402
+from src.open_llm_vtuber.mcpp.tool_adapter import ToolAdapter  # noqa: E402
+from src.open_llm_vtuber.mcpp.types import FormattedTool  # noqa: E402
+from src.open_llm_vtuber.service_context import ServiceContext  # noqa: E402
+from src.open_llm_vtuber.websocket_handler import WebSocketHandler  # noqa: E402
+
+
+class StubLive2dModel:
+    model_info = {"name": "benchmark"}
+
+
+class StubToolAdapter(ToolAdapter):
+    """Lists a few fake tools per server instead of starting the servers"""
+
+    async def get_server_and_tool_info(self, enabled_servers):
+        servers_info, formatted_tools = {}, {}
+        for server_name in enabled_servers:
+            servers_info[server_name] = {}
+            for i in range(5):
+                tool_name = f"{server_name}_tool_{i}"
+                schema = {
+                    "type": "object",
+                    "properties": {"query": {"type": "string", "description": "Query"}},
+                    "required": ["query"],
+                }
+                servers_info[server_name][tool_name] = {
+                    "description": f"Tool {i} of {server_name}",
+                    "parameters": schema["properties"],
+                    "required": schema["required"],
+                }
+                formatted_tools[tool_name] = FormattedTool(
+                    input_schema=schema,
+                    related_server=server_name,
+                    description=f"Tool {i} of {server_name}",
+                )
+        return servers_info, formatted_tools
+
+
+class StubWebSocket:
+    async def send_text(self, text: str) -> None:
+        pass
+
+
+class DeepCopyWebSocketHandler(WebSocketHandler):
+    """The previous connection setup"""
+
+    async def _init_service_context(self, send_text, client_uid):
+        session_service_context = ServiceContext()
+        default = self.default_context_cache
+        await session_service_context.load_cache(
+            config=default.config.model_copy(deep=True),
+            system_config=default.system_config.model_copy(deep=True),
+            character_config=default.character_config.model_copy(deep=True),
+            live2d_model=default.live2d_model,
+            asr_engine=default.asr_engine,
+            tts_engine=default.tts_engine,
+            vad_engine=default.vad_engine,
+            agent_engine=default.agent_engine,
+            translate_engine=default.translate_engine,
+            # The registry was read again by every session
+            mcp_server_registery=None,
+            tool_adapter=default.tool_adapter,
+            send_text=send_text,
+            client_uid=client_uid,
+        )
+        return session_service_context
+
+
+def make_default_context() -> ServiceContext:
+    config = validate_config(
+        read_yaml(os.path.join(project_root, "config_templates", "conf.default.yaml"))
+    )
+    registry = ServerRegistry(os.path.join(project_root, "mcp_servers.json"))
+    context = ServiceContext()
+    context.config = config
+    context.system_config = config.system_config
+    context.character_config = config.character_config
+    context.live2d_model = StubLive2dModel()
+    context.asr_engine = object()
+    context.tts_engine = object()
+    context.agent_engine = object()
+    context.mcp_server_registery = registry
+    context.tool_adapter = StubToolAdapter(registry)
+    return context
+
+
+async def connect_all(handler: WebSocketHandler, connections: int, round_no: int):
+    latencies = []
+
+    async def connect(i: int):
+        started = time.perf_counter()
+        await handler.handle_new_connection(StubWebSocket(), f"bench-{round_no}-{i}")
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(connect(i) for i in range(connections)))
+    total_ms = (time.perf_counter() - started) * 1000
+    for client_uid in list(handler.client_contexts):
+        handler.client_connections.pop(client_uid, None)
+        handler.client_contexts.pop(client_uid, None)
+    return total_ms, sorted(latencies)
+
+
+async def run(handler_class, connections: int, rounds: int):
+    handler = handler_class(make_default_context())
+    # Warm up the tool catalog cache
+    await connect_all(handler, 1, -1)
+    totals, latencies = [], []
+    for round_no in range(rounds):
+        total_ms, round_latencies = await connect_all(handler, connections, round_no)
+        totals.append(total_ms)
+        latencies.extend(round_latencies)
+    latencies.sort()
+    return {
+        "total_ms": sum(totals) / len(totals),
+        "p50_ms": latencies[len(latencies) // 2],
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark connection setup")
+    parser.add_argument("--connections", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    # Connection setup logs a lot, only log the results
+    logger.remove()
+    logger.add(
+        sys.stderr, level="INFO", filter=lambda record: record["name"] == "__main__"
+    )
+
+    for name, handler_class in [
+        ("deep copy (previous)", DeepCopyWebSocketHandler),
+        ("copy-on-write", WebSocketHandler),
+    ]:
+        result = asyncio.run(run(handler_class, args.connections, args.rounds))
+        logger.info(
+            f"{name:22} {args.connections} concurrent connects: "
+            f"{result['total_ms']:7.1f} ms total, "
+            f"p50 {result['p50_ms']:6.2f} ms, p95 {result['p95_ms']:6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
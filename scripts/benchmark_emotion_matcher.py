@@ -0,0 +1,139 @@
+"""
+Benchmark emotion tag extraction and removal of Live2dModel.
+
+Usage:
+    python scripts/benchmark_emotion_matcher.py [--emotions N] [--repeat N]
+
+Compares the precompiled matcher of Live2dModel with the previous
+implementation (a scan over all emotion keys at every '[') on a model with a
+large emotion map, and checks that both find the same emotions.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from loguru import logger
+
+# Add project root to path to enable imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from src.open_llm_vtuber.live2d_model import Live2dModel  # noqa: E402
+
+
+def reference_extract_emotion(emo_map: dict, str_to_check: str) -> list:
+    """The previous Live2dModel.extract_emotion"""
+    expression_list = []
+    str_to_check = str_to_check.lower()
+
+    i = 0
+    while i < len(str_to_check):
+        if str_to_check[i] != "[":
+            i += 1
+            continue
+        for key in emo_map.keys():
+            emo_tag = f"[{key}]"
+            if str_to_check[i : i + len(emo_tag)] == emo_tag:
+                expression_list.append(emo_map[key])
+                i += len(emo_tag) - 1
+                break
+        i += 1
+    return expression_list
+
+
+def reference_remove_emotion_keywords(emo_map: dict, target_str: str) -> str:
+    """The previous Live2dModel.remove_emotion_keywords"""
+    lower_str = target_str.lower()
+
+    for key in emo_map.keys():
+        lower_key = f"[{key}]".lower()
+        while lower_key in lower_str:
+            start_index = lower_str.find(lower_key)
+            end_index = start_index + len(lower_key)
+            target_str = target_str[:start_index] + target_str[end_index:]
+            lower_str = lower_str[:start_index] + lower_str[end_index:]
+    return target_str
+
+
+def make_sentences(keys: list, count: int) -> list:
+    rng = random.Random(0)
+    words = ["well", "I", "think", "that", "is", "really", "nice", "[note]", "you"]
+    sentences = []
+    for _ in range(count):
+        parts = [rng.choice(words) for _ in range(rng.randint(5, 20))]
+        for _ in range(rng.randint(0, 3)):
+            parts.insert(rng.randint(0, len(parts)), f"[{rng.choice(keys)}]")
+        sentences.append(" ".join(parts) + ".")
+    return sentences
+
+
+def timed(func, sentences: list, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for sentence in sentences:
+            func(sentence)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the emotion matcher")
+    parser.add_argument("--emotions", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    emotion_map = {f"Emotion_{i}": i for i in range(args.emotions)}
+    model_dict = [{"name": "benchmark", "emotionMap": emotion_map}]
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".json", delete=False, encoding="utf-8"
+    ) as f:
+        json.dump(model_dict, f)
+        model_dict_path = f.name
+
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+    try:
+        model = Live2dModel("benchmark", model_dict_path=model_dict_path)
+    finally:
+        os.remove(model_dict_path)
+
+    sentences = make_sentences(list(emotion_map), 500)
+    emo_map = model.emo_map
+
+    for sentence in sentences:
+        assert model.extract_emotion(sentence) == reference_extract_emotion(
+            emo_map, sentence
+        )
+        assert model.remove_emotion_keywords(
+            sentence
+        ) == reference_remove_emotion_keywords(emo_map, sentence)
+
+    results = {
+        "extract (previous)": timed(
+            lambda s: reference_extract_emotion(emo_map, s), sentences, args.repeat
+        ),
+        "extract (compiled)": timed(model.extract_emotion, sentences, args.repeat),
+        "remove (previous)": timed(
+            lambda s: reference_remove_emotion_keywords(emo_map, s),
+            sentences,
+            args.repeat,
+        ),
+        "remove (compiled)": timed(
+            model.remove_emotion_keywords, sentences, args.repeat
+        ),
+        "extract + remove (single pass)": timed(
+            model.extract_and_remove_emotion, sentences, args.repeat
+        ),
+    }
+    calls = len(sentences) * args.repeat
+    logger.info(f"{args.emotions} emotions, {calls} sentences per method")
+    for name, elapsed in results.items():
+        logger.info(f"{name:32} {elapsed * 1e6 / calls:8.1f} µs/sentence")
+
+
+if __name__ == "__main__":
+    main()
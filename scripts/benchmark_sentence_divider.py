@@ -0,0 +1,98 @@
+"""
+Benchmark the SentenceDivider with streamed LLM token traces.
+
+Usage:
+    python scripts/benchmark_sentence_divider.py [--method pysbd|regex] [--repeat N]
+        [--trace traces.jsonl]
+
+A trace file contains one JSON list of token strings per line, e.g. tokens
+recorded from a real LLM response. Without a trace file, built-in English,
+Chinese and mixed responses are split into LLM-like tokens.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+from typing import List
+
+from loguru import logger
+
+# Add project root to path to enable imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from src.open_llm_vtuber.utils.sentence_divider import SentenceDivider  # noqa: E402
+
+SAMPLE_RESPONSES = [
+    "Oh, hi there! It's so nice to see you again. I was just thinking about "
+    "what we talked about yesterday, you know, the trip to the mountains. "
+    "Did you end up booking the cabin? I really hope the weather is good, "
+    "because hiking in the rain is not fun at all. Let me know how it goes!",
+    "你好呀！今天过得怎么样？我刚刚在想我们昨天聊的那个话题，就是关于去山里旅行的事情。"
+    "你订好小木屋了吗？希望天气会很好，因为下雨天爬山一点都不好玩。记得告诉我结果哦！",
+    "<think>The user asks about the weather. I should answer briefly and "
+    "mention the forecast.</think>The forecast says it will be sunny tomorrow, "
+    "around 24 degrees. Perfect for a picnic, right? Don't forget sunscreen.",
+    "Sure, here is the function you asked for: def add(a, b): return a + b "
+    "and you can call it like add(1, 2) which gives you three as the result "
+    "without any extra setup or imports needed for this simple case",
+]
+
+# Words with their trailing spaces, single CJK characters, or punctuation
+_TOKEN_PATTERN = re.compile(r"\s*[A-Za-z0-9']+|\s*[^\sA-Za-z0-9']")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into chunks of roughly the size LLMs stream."""
+    return _TOKEN_PATTERN.findall(text)
+
+
+async def stream_tokens(tokens: List[str]):
+    for token in tokens:
+        yield token
+
+
+async def run_benchmark(traces: List[List[str]], method: str, repeat: int) -> None:
+    divider = SentenceDivider(segment_method=method, valid_tags=["think"])
+    token_count = 0
+    sentence_count = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for tokens in traces:
+            token_count += len(tokens)
+            async for _sentence in divider.process_stream(stream_tokens(tokens)):
+                sentence_count += 1
+    elapsed = time.perf_counter() - start
+
+    logger.info(
+        f"[{method}] {token_count} tokens, {sentence_count} sentences in "
+        f"{elapsed:.3f}s: {token_count / elapsed:,.0f} tokens/sec"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the SentenceDivider")
+    parser.add_argument("--method", choices=["pysbd", "regex"], default="pysbd")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--trace", help="JSONL file with one token list per line")
+    args = parser.parse_args()
+
+    if args.trace:
+        with open(args.trace, encoding="utf-8") as f:
+            traces = [json.loads(line) for line in f if line.strip()]
+    else:
+        traces = [tokenize(text) for text in SAMPLE_RESPONSES]
+
+    # Only report the result, not the debug output of every sentence
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+
+    asyncio.run(run_benchmark(traces, args.method, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Benchmark the server -> client WebSocket protocols.
+
+Usage:
+    python scripts/benchmark_ws_protocol.py [--seconds S] [--sample-rate HZ] [--rounds N]
+        [--codec wav|native|opus|aac]
+
+Encodes the audio message of a generated sentence (a sine wave of S seconds,
+16-bit mono) with protocol version 1 (JSON with base64 WAV) and version 2
+(binary frame with raw PCM, see utils/ws_protocol.py), and reports the size of
+each message, raw and compressed with deflate as permessage-deflate would,
+and the CPU time to encode it. Control messages, which are JSON text in both
+versions, are reported with and without deflate. With --codec, the audio is
+encoded like with that system_config.audio_output.codec (opus and aac need
+ffmpeg).
+"""
+
+import argparse
+import json
+import math
+import os
+import struct
+import sys
+import tempfile
+import time
+import wave
+import zlib
+
+from loguru import logger
+
+# Add project root to path to enable imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from src.open_llm_vtuber.agent.output_types import Actions, DisplayText  # noqa: E402
+from src.open_llm_vtuber.utils.audio_encoder import AUDIO_CODECS, AudioEncoder  # noqa: E402
+from src.open_llm_vtuber.utils.stream_audio import (  # noqa: E402
+    prepare_audio_frame,
+    prepare_audio_payload,
+)
+from src.open_llm_vtuber.utils.ws_protocol import decode_audio_frame  # noqa: E402
+
+CONTROL_MESSAGES = [
+    {"type": "control", "text": "conversation-chain-start"},
+    {"type": "full-text", "text": "Thinking..."},
+    {"type": "user-input-transcription", "text": "What is the weather like today?"},
+    {"type": "backend-synth-complete"},
+    {"type": "force-new-message"},
+]
+
+
+def write_sine_wav(path: str, seconds: float, sample_rate: int) -> None:
+    frames = int(seconds * sample_rate)
+    samples = (
+        int(8000 * math.sin(2 * math.pi * 220 * i / sample_rate) * (1 - i / frames))
+        for i in range(frames)
+    )
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(struct.pack(f"<{frames}h", *samples))
+
+
+def deflated_size(data: bytes) -> int:
+    """Size of a message compressed like permessage-deflate (raw deflate)."""
+    compressor = zlib.compressobj(wbits=-15)
+    return len(compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)) - 4
+
+
+def time_encode(encode, rounds: int) -> float:
+    """Mean CPU time of encode() in microseconds."""
+    started = time.process_time()
+    for _ in range(rounds):
+        encode()
+    return (time.process_time() - started) / rounds * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark WebSocket protocols")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--sample-rate", type=int, default=24000)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--codec", choices=AUDIO_CODECS, default="wav")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(
+        sys.stderr, level="INFO", filter=lambda record: record["name"] == "__main__"
+    )
+
+    display_text = DisplayText(text="Hello there, how are you doing today?", name="Mao")
+    actions = Actions(expressions=[3])
+    encoder = AudioEncoder(args.codec)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        audio_path = os.path.join(tmp, "sentence.wav")
+        write_sine_wav(audio_path, args.seconds, args.sample_rate)
+
+        def encode_v1() -> bytes:
+            payload = prepare_audio_payload(
+                audio_path, display_text=display_text, actions=actions, encoder=encoder
+            )
+            return json.dumps(payload).encode("utf-8")
+
+        def encode_v2() -> bytes:
+            return prepare_audio_frame(
+                audio_path, display_text=display_text, actions=actions, encoder=encoder
+            )
+
+        v1, v2 = encode_v1(), encode_v2()
+        decoded = decode_audio_frame(v2)
+        assert decoded["display_text"] == display_text.to_dict()
+        assert len(decoded["volumes"]) == len(json.loads(v1)["volumes"])
+
+        logger.info(
+            f"Audio message, {args.seconds:g} s at {args.sample_rate} Hz, "
+            f"codec {encoder.codec} "
+            f"(mean of {args.rounds} encodes):"
+        )
+        for name, message, encode in [
+            ("v1 JSON + base64", v1, encode_v1),
+            ("v2 binary", v2, encode_v2),
+        ]:
+            logger.info(
+                f"  {name:22} {len(message):9d} bytes, "
+                f"{deflated_size(message):9d} deflated, "
+                f"{time_encode(encode, args.rounds):8.0f} us to encode, "
+                f"{time_encode(lambda: deflated_size(message), args.rounds):8.0f} us to deflate"
+            )
+
+    raw = sum(len(json.dumps(m).encode("utf-8")) for m in CONTROL_MESSAGES)
+    deflated = sum(
+        deflated_size(json.dumps(m).encode("utf-8")) for m in CONTROL_MESSAGES
+    )
+    logger.info(
+        f"Control messages (JSON text in both versions): {raw} bytes, {deflated} "
+        "deflated independently (permessage-deflate keeps its context between "
+        "messages, so repeated keys compress further)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Check that streaming LLM backends do not block the event loop.
+
+Usage:
+    python scripts/check_llm_streaming.py [--tokens N] [--token-delay-ms MS]
+        [--max-stall-ms MS]
+
+Streams a completion from a local fake server through AsyncLLMWithTemplate,
+and a blocking token generator (as llama.cpp produces them) through
+iterate_in_thread, while a heartbeat task measures how long the event loop
+goes without running it. The fake server runs in a thread and sleeps between
+tokens, so a backend reading the stream synchronously stalls the event loop
+for the whole generation (one second with the default settings). Exits with
+status 1 if the longest stall exceeds --max-stall-ms, which leaves room for
+one-off work such as the first connection to the server.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import AsyncIterator, Callable, Dict, Iterator, Tuple
+
+from loguru import logger
+
+# Add project root to path to enable imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from src.open_llm_vtuber.agent.stateless_llm.stateless_llm_with_template import (  # noqa: E402
+    AsyncLLMWithTemplate,
+)
+from src.open_llm_vtuber.utils.async_bridge import iterate_in_thread  # noqa: E402
+from src.open_llm_vtuber.utils.http_client import http_clients  # noqa: E402
+
+HEARTBEAT_INTERVAL = 0.005
+
+
+def make_handler(tokens: int, token_delay: float):
+    class CompletionHandler(BaseHTTPRequestHandler):
+        """Streams a completion in the format of the llama.cpp server."""
+
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            try:
+                for i in range(tokens):
+                    time.sleep(token_delay)
+                    line = json.dumps({"content": f"token{i} ", "stop": False})
+                    self.wfile.write(f"data: {line}\n\n".encode())
+                    self.wfile.flush()
+                line = json.dumps({"content": "", "stop": True})
+                self.wfile.write(f"data: {line}\n\n".encode())
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, format, *args):
+            pass
+
+    return CompletionHandler
+
+
+def blocking_tokens(tokens: int, token_delay: float) -> Iterator[str]:
+    """Tokens of a local model, each one blocking while it is generated."""
+    for i in range(tokens):
+        time.sleep(token_delay)
+        yield f"token{i} "
+
+
+async def longest_stall(
+    stream: Callable[[], AsyncIterator[str]],
+) -> Tuple[int, float]:
+    """Consume a token stream while a heartbeat runs.
+
+    Returns:
+        Tuple[int, float]: (number of tokens, longest time in ms the heartbeat did not run)
+    """
+    stall = 0.0
+    done = asyncio.Event()
+
+    async def heartbeat() -> None:
+        nonlocal stall
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            now = time.perf_counter()
+            stall = max(stall, now - last - HEARTBEAT_INTERVAL)
+            last = now
+
+    heartbeat_task = asyncio.create_task(heartbeat())
+    # Let the heartbeat start before the stream
+    await asyncio.sleep(0)
+    count = 0
+    try:
+        async for _token in stream():
+            count += 1
+    finally:
+        done.set()
+        await heartbeat_task
+    return count, stall * 1000
+
+
+async def run_checks(
+    port: int, tokens: int, token_delay: float, max_stall_ms: float
+) -> bool:
+    base_url = f"http://127.0.0.1:{port}/completion"
+    llm = AsyncLLMWithTemplate(model="fake", base_url=base_url)
+    # Creating the shared HTTP client (and its SSL context) blocks once per
+    # event loop, not while tokens stream
+    http_clients.get(base_url)
+    checks: Dict[str, Callable[[], AsyncIterator[str]]] = {
+        "AsyncLLMWithTemplate": lambda: llm.chat_completion(
+            [{"role": "user", "content": "Hello"}]
+        ),
+        "iterate_in_thread": lambda: iterate_in_thread(
+            lambda: blocking_tokens(tokens, token_delay)
+        ),
+    }
+    ok = True
+    for name, stream in checks.items():
+        count, stall_ms = await longest_stall(stream)
+        passed = count == tokens and stall_ms <= max_stall_ms
+        ok = ok and passed
+        logger.info(
+            f"{'OK' if passed else 'FAILED'} {name}: {count}/{tokens} tokens, "
+            f"event loop stalled at most {stall_ms:.1f} ms"
+        )
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check that streaming LLM backends do not block the event loop"
+    )
+    parser.add_argument("--tokens", type=int, default=40)
+    parser.add_argument("--token-delay-ms", type=float, default=25)
+    parser.add_argument("--max-stall-ms", type=float, default=100)
+    args = parser.parse_args()
+
+    # Only report the result, not the debug output of the LLM
+    logger.remove()
+    logger.add(
+        sys.stderr, level="INFO", filter=lambda record: record["name"] == "__main__"
+    )
+
+    token_delay = args.token_delay_ms / 1000
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), make_handler(args.tokens, token_delay)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        ok = asyncio.run(
+            run_checks(
+                server.server_address[1], args.tokens, token_delay, args.max_stall_ms
+            )
+        )
+    finally:
+        server.shutdown()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
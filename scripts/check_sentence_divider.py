@@ -0,0 +1,196 @@
+"""
+Differential check of the incremental SentenceDivider.
+
+Usage:
+    python scripts/check_sentence_divider.py [--seeds N] [--tokens N]
+
+SentenceDivider only scans the text added since the last token for sentence
+boundaries, and only segments again the end of a buffer whose sentence ends
+were rejected. This check streams a corpus (tags, CJK, abbreviations,
+versions, decimals, code, tool dicts...) split at random points through it
+and through a reference divider that scans and segments the whole buffer for
+every token, under all segmentation modes, and reports any difference in the
+output. It then times a long stream of rejected sentence ends ("v1.0 v1.1
+...") to show that the time per token does not grow with the buffer.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List, Tuple, Union
+
+from langdetect import DetectorFactory
+from loguru import logger
+
+# Add project root to path to enable imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from src.open_llm_vtuber.utils.sentence_divider import (  # noqa: E402
+    ChunkingPolicy,
+    SentenceDivider,
+)
+
+CORPUS = [
+    "Oh, hi there! It's so nice to see you again. I was just thinking about "
+    "what we talked about yesterday, you know, the trip to the mountains. "
+    "Did you end up booking the cabin? Let me know how it goes!",
+    "Mr. Smith met Dr. Jones at 3.30 p.m. on St. Patrick's day, e.g. the "
+    "17th. They discussed the U.S. economy vs. the E.U. one. Interesting, "
+    "isn't it? I think so... Maybe not!",
+    "Upgrade from v1.2.3 to v2.0.1 first. Then call obj.attr.method() and "
+    "read config.system_config.host, which is 127.0.0.1 by default. Pi is "
+    "about 3.14159 and e is 2.71828. Done.",
+    "<think>The user asks about the weather. I should answer briefly.</think>"
+    "The forecast says it will be sunny tomorrow, around 24.5 degrees. "
+    "<think>Nested <think>tags</think> are odd.</think>Perfect for a picnic!",
+    "你好呀！今天过得怎么样？我刚刚在想我们昨天聊的那个话题，就是关于去山里旅行的事情。"
+    "你订好小木屋了吗？版本是v1.2.3，价格是3.5元。记得告诉我结果哦！",
+    "こんにちは。今日はいい天気ですね！散歩に行きませんか？Version 2.1 が出ました。",
+    "Sure, here is the function you asked for: def add(a, b): return a + b "
+    "and you can call it like add(1, 2) which gives you three as the result "
+    "without any extra setup or imports needed for this simple case",
+    " ".join(f"v1.{i}" for i in range(120)) + ". Those are all the versions.",
+    "Visit https://example.com/docs/v1.2/index.html or www.example.org. "
+    'He said "it works." Then he left. She replied (quietly). "Really?" '
+    "she asked. Yes! No? Maybe...",
+    "Bonjour, je m'appelle Marie. J'habite à Paris depuis 2.5 ans. "
+    "C'est une belle ville, n'est-ce pas ? Oui !",
+]
+
+TOOL_CALL = {"type": "tool_call_status", "status": "running"}
+
+
+class ReferenceDivider(SentenceDivider):
+    """Scans and segments the whole buffer for every token."""
+
+    def _has_pending_boundary(self) -> bool:
+        pattern = (
+            self._first_boundary_pattern
+            if self._is_first_sentence and self.faster_first_response
+            else self._boundary_pattern
+        )
+        return pattern.search(self._buffer) is not None
+
+    def _segment_buffer(self) -> Tuple[List[str], str]:
+        return self._segment_text(self._buffer)
+
+
+def split_randomly(text: str, rng: random.Random) -> List[Union[str, Dict[str, Any]]]:
+    """Split text into tokens of 1 to 8 characters, with a few tool dicts."""
+    items: List[Union[str, Dict[str, Any]]] = []
+    pos = 0
+    while pos < len(text):
+        size = rng.randint(1, 8)
+        items.append(text[pos : pos + size])
+        pos += size
+        if rng.random() < 0.02:
+            items.append(dict(TOOL_CALL))
+    return items
+
+
+async def stream_items(items: List[Any]):
+    for item in items:
+        yield item
+
+
+async def divide(divider: SentenceDivider, items: List[Any]) -> List[Any]:
+    output = []
+    async for item in divider.process_stream(stream_items(items)):
+        if isinstance(item, dict):
+            output.append(item)
+        else:
+            output.append((item.text, [str(tag) for tag in item.tags]))
+    return output
+
+
+def divider_settings() -> List[Dict[str, Any]]:
+    settings = []
+    for segment_method in ("pysbd", "regex"):
+        for faster_first_response in (True, False):
+            for first_chunk_words in (0, 6):
+                settings.append(
+                    {
+                        "segment_method": segment_method,
+                        "faster_first_response": faster_first_response,
+                        "chunking_policy": ChunkingPolicy(
+                            first_chunk_words=first_chunk_words
+                        ),
+                    }
+                )
+    return settings
+
+
+async def check_corpus(seeds: int) -> int:
+    """Compare the output of both dividers, returns the number of differences."""
+    differences = 0
+    runs = 0
+    for settings in divider_settings():
+        divider = SentenceDivider(valid_tags=["think"], **settings)
+        reference = ReferenceDivider(valid_tags=["think"], **settings)
+        for text in CORPUS:
+            for seed in range(seeds):
+                items = split_randomly(text, random.Random(seed))
+                expected = await divide(reference, items)
+                actual = await divide(divider, items)
+                runs += 1
+                if actual != expected:
+                    differences += 1
+                    logger.error(
+                        f"Different output ({settings}, seed {seed}):\n"
+                        f"  tokens:    {items}\n"
+                        f"  reference: {expected}\n"
+                        f"  divider:   {actual}"
+                    )
+    logger.info(f"{runs} streams compared, {differences} with a different output")
+    return differences
+
+
+async def time_rejected_ends(token_counts: List[int]) -> None:
+    """Time a stream whose sentence ends are all rejected by the segmentation."""
+    for count in token_counts:
+        items = [f"v1.{i} " for i in range(count)]
+        for divider_class in (SentenceDivider, ReferenceDivider):
+            divider = divider_class()
+            start = time.perf_counter()
+            await divide(divider, items)
+            elapsed = time.perf_counter() - start
+            logger.info(
+                f"{divider_class.__name__}: {count} 'v1.N ' tokens in {elapsed:.3f}s"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Differential check of the incremental SentenceDivider"
+    )
+    parser.add_argument(
+        "--seeds", type=int, default=10, help="Random splits of each text"
+    )
+    parser.add_argument(
+        "--tokens",
+        type=int,
+        nargs="+",
+        default=[250, 500, 1000],
+        help="Token counts of the timed streams",
+    )
+    args = parser.parse_args()
+
+    # Language detection is random, make it give both dividers the same result
+    DetectorFactory.seed = 0
+    # Only report the result, not the debug output of every sentence
+    logger.remove()
+    logger.add(
+        sys.stderr, level="INFO", filter=lambda record: record["name"] == "__main__"
+    )
+
+    differences = asyncio.run(check_corpus(args.seeds))
+    asyncio.run(time_rejected_ends(args.tokens))
+    sys.exit(1 if differences else 0)
+
+
+if __name__ == "__main__":
+    main()
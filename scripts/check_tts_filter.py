@@ -0,0 +1,147 @@
+"""
+Differential check of the combined TTSTextFilter.
+
+Usage:
+    python scripts/check_tts_filter.py [--cases N] [--seed N]
+
+TTSTextFilter removes asterisk spans, brackets, parentheses, angle brackets,
+whitespace runs and special characters in one filter. This check filters
+random texts (nested and unbalanced brackets, asterisks of any length, line
+breaks, Unicode spaces, combining marks, fullwidth forms, emoji...) under
+every combination of the preprocessor flags, and compares the output with
+the previous tts_filter chain: filter_asterisks, filter_brackets,
+filter_parentheses, filter_angle_brackets and remove_special_characters one
+after the other. Exits with status 1 on any difference.
+"""
+
+import argparse
+import itertools
+import os
+import random
+import sys
+from typing import Dict, List
+
+from loguru import logger
+
+# Add project root to path to enable imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from src.open_llm_vtuber.utils.tts_preprocessor import (  # noqa: E402
+    TTSTextFilter,
+    filter_angle_brackets,
+    filter_asterisks,
+    filter_brackets,
+    filter_parentheses,
+    remove_special_characters,
+)
+
+FLAGS = (
+    "remove_special_char",
+    "ignore_brackets",
+    "ignore_parentheses",
+    "ignore_asterisks",
+    "ignore_angle_brackets",
+)
+# Characters the filters treat specially, and text around them
+PIECES = [
+    "a",
+    "Hello",
+    "你好",
+    "\u00e9",
+    "e\u0301",
+    "\u0301",
+    "ｈｉ",
+    "（",
+    "）",
+    "＊",
+    "½",
+    "\U0001f600",
+    "♪",
+    "~",
+    "-",
+    "!",
+    "。",
+    "1.5",
+    "[",
+    "]",
+    "(",
+    ")",
+    "<",
+    ">",
+    "*",
+    "**",
+    "***",
+    " ",
+    "  ",
+    "\n",
+    "\t",
+    "\u3000",
+    "\xa0",
+    "\u200b",
+]
+
+
+def random_text(rng: random.Random) -> str:
+    return "".join(rng.choice(PIECES) for _ in range(rng.randint(0, 30)))
+
+
+def reference_filter(text: str, flags: Dict[str, bool]) -> str:
+    """The filters applied one after the other, as tts_filter did before."""
+    if flags["ignore_asterisks"]:
+        text = filter_asterisks(text)
+    if flags["ignore_brackets"]:
+        text = filter_brackets(text)
+    if flags["ignore_parentheses"]:
+        text = filter_parentheses(text)
+    if flags["ignore_angle_brackets"]:
+        text = filter_angle_brackets(text)
+    if flags["remove_special_char"]:
+        text = remove_special_characters(text)
+    return text
+
+
+def flag_combinations() -> List[Dict[str, bool]]:
+    return [
+        dict(zip(FLAGS, values))
+        for values in itertools.product((False, True), repeat=len(FLAGS))
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Differential check of the combined TTSTextFilter"
+    )
+    parser.add_argument(
+        "--cases", type=int, default=2000, help="Random texts per flag combination"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    texts = [random_text(rng) for _ in range(args.cases)]
+    differences = 0
+    combinations = flag_combinations()
+    for flags in combinations:
+        text_filter = TTSTextFilter(**flags)
+        for text in texts:
+            expected = reference_filter(text, flags)
+            actual = text_filter(text)
+            if actual != expected:
+                differences += 1
+                logger.error(
+                    f"Different output ({flags}):\n"
+                    f"  text:      {text!r}\n"
+                    f"  reference: {expected!r}\n"
+                    f"  filter:    {actual!r}"
+                )
+    logger.info(
+        f"{len(texts) * len(combinations)} texts compared under "
+        f"{len(combinations)} flag combinations, {differences} with a different "
+        "output"
+    )
+    sys.exit(1 if differences else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Fuzz the StreamJSONDetector against json.loads.
+
+Usage:
+    python scripts/fuzz_json_detector.py [--cases N] [--seed N]
+
+Random JSON objects (with braces, quotes, escapes and non-ASCII text inside
+strings) are serialized with random formatting, mixed with plain text that
+contains stray braces and unclosed quotes, and streamed to the detector in
+random chunks. The detector must return exactly the objects json decodes
+when trying every "{" from left to right and skipping the decoded ones.
+That is each serialized object, unless an unclosed quote before it turned
+the text in between into a JSON object.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+
+from loguru import logger
+
+# Add project root to path to enable imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from src.open_llm_vtuber.mcpp.json_detector import StreamJSONDetector  # noqa: E402
+
+STRING_ALPHABET = 'ab {}[]:,"\\/\n\té你\U0001f600'
+# Plain text around the objects, with stray braces and an unclosed '{"'
+PROSE_PIECES = [
+    "Sure! ",
+    "use { and } ",
+    "{not json} ",
+    "set {x} ",
+    "a} ",
+    "{",
+    "\n",
+    "ok. ",
+    'I typed {"oops then: ',
+]
+
+
+def random_string(rng: random.Random) -> str:
+    return "".join(rng.choice(STRING_ALPHABET) for _ in range(rng.randint(0, 8)))
+
+
+def random_value(rng: random.Random, depth: int):
+    kind = rng.randint(0, 6 if depth < 3 else 3)
+    if kind == 0:
+        return rng.randint(-1000, 1000)
+    if kind == 1:
+        return rng.choice([True, False, None, 1.5])
+    if kind in (2, 3):
+        return random_string(rng)
+    if kind == 4:
+        return [random_value(rng, depth + 1) for _ in range(rng.randint(0, 3))]
+    return random_object(rng, depth + 1)
+
+
+def random_object(rng: random.Random, depth: int = 0) -> dict:
+    return {
+        random_string(rng): random_value(rng, depth) for _ in range(rng.randint(0, 4))
+    }
+
+
+def random_dump(rng: random.Random, obj: dict) -> str:
+    return json.dumps(
+        obj,
+        ensure_ascii=rng.random() < 0.5,
+        indent=rng.choice([None, 2]),
+        separators=rng.choice([None, (",", ":")]),
+    )
+
+
+def random_chunks(rng: random.Random, text: str) -> list:
+    chunks = []
+    pos = 0
+    while pos < len(text):
+        size = rng.choice([1, 2, 3, 5, 8, 20])
+        chunks.append(text[pos : pos + size])
+        pos += size
+    return chunks
+
+
+def decode_objects(text: str) -> list:
+    """The JSON objects found by decoding from every "{", left to right."""
+    decoder = json.JSONDecoder()
+    objects = []
+    pos = text.find("{")
+    while pos != -1:
+        try:
+            obj, end = decoder.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            end = pos + 1
+        else:
+            objects.append(obj)
+        pos = text.find("{", end)
+    return objects
+
+
+def run_case(rng: random.Random) -> None:
+    text = ""
+    for _ in range(rng.randint(0, 4)):
+        text += "".join(rng.choice(PROSE_PIECES) for _ in range(rng.randint(0, 3)))
+        text += random_dump(rng, random_object(rng))
+    text += "".join(rng.choice(PROSE_PIECES) for _ in range(rng.randint(0, 3)))
+    # An unclosed '{"' could still become an object until a quote or a line
+    # break shows it cannot, the objects after it are found from there on
+    text += "\n"
+    expected = decode_objects(text)
+
+    detector = StreamJSONDetector()
+    found = []
+    for chunk in random_chunks(rng, text):
+        found.extend(detector.process_chunk(chunk))
+
+    if found != expected:
+        raise AssertionError(
+            f"Mismatch for {text!r}:\nexpected {expected!r}\nfound    {found!r}"
+        )
+    assert detector.get_all_jsons() == expected
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fuzz the StreamJSONDetector")
+    parser.add_argument("--cases", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Candidates rejected by json.loads are expected, only log the result
+    logger.remove()
+    logger.add(
+        sys.stderr, level="INFO", filter=lambda record: record["name"] == "__main__"
+    )
+
+    rng = random.Random(args.seed)
+    for _ in range(args.cases):
+        run_case(rng)
+    logger.info(f"{args.cases} cases passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -57,7 +57,10 @@ class AgentFactory:
 
             # Create the stateless LLM
             llm = StatelessLLMFactory.create_llm(
-                llm_provider=llm_provider, system_prompt=system_prompt, **llm_config
+                llm_provider=llm_provider,
+                system_prompt=system_prompt,
+                llm_configs=llm_configs,
+                **llm_config,
             )
 
             tool_prompts = kwargs.get("system_config", {}).get("tool_prompts", {})
@@ -83,6 +86,13 @@ class AgentFactory:
                 tool_manager=tool_manager,
                 tool_executor=tool_executor,
                 mcp_prompt_string=mcp_prompt_string,
+                max_context_tokens=basic_memory_settings.get(
+                    "max_context_tokens", 8192
+                ),
+                summarize_evicted_turns=basic_memory_settings.get(
+                    "summarize_evicted_turns", True
+                ),
+                chunking_policy=basic_memory_settings.get("chunking_policy"),
             )
 
         elif conversation_agent_choice == "mem0_agent":
@@ -14,13 +14,9 @@ from ..output_types import SentenceOutput, DisplayText
 from ..stateless_llm.stateless_llm_interface import StatelessLLMInterface
 from ..stateless_llm.claude_llm import AsyncLLM as ClaudeAsyncLLM
 from ..stateless_llm.openai_compatible_llm import AsyncLLM as OpenAICompatibleAsyncLLM
+from ..stateless_llm.router_llm import RouterLLM
 from ...chat_history_manager import get_history
-from ..transformers import (
-    sentence_divider,
-    actions_extractor,
-    tts_filter,
-    display_processor,
-)
+from ..transformers import OutputPipeline, output_pipeline
 from ...config_manager import TTSPreprocessorConfig
 from ..input_types import BatchInput, TextSource
 from prompts import prompt_loader
@@ -29,6 +25,8 @@ from ...mcpp.json_detector import StreamJSONDetector
 from ...mcpp.types import ToolCallObject
 from ...mcpp.tool_executor import ToolExecutor
 from ..memory_manager import ChromaMemoryManager
+from ..context_window import ContextWindowManager
+from ...utils.sentence_divider import ChunkingPolicy
 import os
 import glob
 import json
@@ -55,6 +53,9 @@ class BasicMemoryAgent(AgentInterface):
         tool_executor: Optional[ToolExecutor] = None,
         mcp_prompt_string: str = "",
         memory_reflection_interval: int = 5,  # New: configurable N
+        max_context_tokens: int = 8192,
+        summarize_evicted_turns: bool = True,
+        chunking_policy: Optional[Dict[str, Any]] = None,
     ):
         """Initialize agent with LLM and configuration."""
         super().__init__()
@@ -63,6 +64,14 @@ class BasicMemoryAgent(AgentInterface):
         self._tts_preprocessor_config = tts_preprocessor_config
         self._faster_first_response = faster_first_response
         self._segment_method = segment_method
+        self._output_pipeline = OutputPipeline.default(
+            live2d_model=live2d_model,
+            tts_preprocessor_config=tts_preprocessor_config,
+            faster_first_response=faster_first_response,
+            segment_method=segment_method,
+            valid_tags=["think"],
+            chunking_policy=ChunkingPolicy(**(chunking_policy or {})),
+        )
         self._use_mcpp = use_mcpp
         self.interrupt_method = interrupt_method
         self._tool_prompts = tool_prompts or {}
@@ -74,6 +83,11 @@ class BasicMemoryAgent(AgentInterface):
         self._mcp_prompt_string = mcp_prompt_string
         self._json_detector = StreamJSONDetector()
         self.memory_manager = ChromaMemoryManager()
+        self._context_window = ContextWindowManager(
+            max_tokens=max_context_tokens,
+            summarize=summarize_evicted_turns,
+        )
+        self._context_window.set_summarizer(self._summarize_with_llm)
 
         self._formatted_tools_openai = []
         self._formatted_tools_claude = []
@@ -144,7 +158,14 @@ class BasicMemoryAgent(AgentInterface):
     def _set_llm(self, llm: StatelessLLMInterface):
         """Set the LLM for chat completion."""
         self._llm = llm
-        self.chat = self._chat_function_factory()
+        self._chat_function = self._chat_function_factory()
+        self.chat = self._chat_function
+
+    def _llm_is(self, llm_type: type) -> bool:
+        """Whether the LLM (or every LLM wrapped by a router) is of the given type."""
+        if isinstance(self._llm, RouterLLM):
+            return all(isinstance(llm, llm_type) for llm in self._llm.llms)
+        return isinstance(self._llm, llm_type)
 
     def set_system(self, system: str):
         """Set the system prompt."""
@@ -224,8 +245,24 @@ class BasicMemoryAgent(AgentInterface):
         logger.info(f"Loading history for conf_uid={conf_uid}, history_uid={history_uid}")
         # Do not load full chat history into self._memory; rely on ChromaDB recall only
         self._memory = []  # Clear in-memory chat history
+        self._context_window.reset()
         logger.info("Cleared in-memory chat history; using only ChromaDB for recall.")
 
+    async def _summarize_with_llm(self, prompt: str) -> str:
+        """Run a one-off completion for the context window's rolling summary."""
+        response = ""
+        async for chunk in self._llm.chat_completion(
+            [{"role": "user", "content": prompt}], self._system
+        ):
+            if isinstance(chunk, dict) and chunk.get("type") == "text_delta":
+                response += chunk.get("text", "")
+            elif isinstance(chunk, str):
+                response += chunk
+        if response.startswith(("Error calling the chat endpoint", "__API_NOT_SUPPORT")):
+            logger.warning(f"Summary generation failed: {response}")
+            return ""
+        return response
+
     def handle_interrupt(self, heard_response: str) -> None:
         """Handle user interruption."""
         if self._interrupt_handled:
@@ -275,7 +312,6 @@ class BasicMemoryAgent(AgentInterface):
 
     def _to_messages(self, input_data: BatchInput) -> List[Dict[str, Any]]:
         """Prepare messages for LLM API call, injecting relevant memories from ChromaDB and the active personality prompt."""
-        messages = []
         # Load the active personality/system prompt using prompt_loader and conf.yaml for persona name
         try:
             import yaml
@@ -320,20 +356,21 @@ class BasicMemoryAgent(AgentInterface):
                         recalled_memories.append(str(results))
             except Exception as e:
                 logger.warning(f"Failed to query ChromaDB for memories: {e}")
-        # Inject memories as context, not as a script
+        # Keep the system prompt (and the rolling summary) at the start of the
+        # prompt so it stays identical across turns and can be cached by the provider.
+        prefix_messages = [{"role": "system", "content": system_prompt}]
+        summary_message = self._context_window.summary_message()
+        if summary_message:
+            prefix_messages.append(summary_message)
+        # Inject memories as context, not as a script. They change every turn,
+        # so they go after the chat history instead of into the system prompt.
+        memory_messages = []
         if recalled_memories:
             memories_text = '\n'.join(f"- {m}" for m in recalled_memories)
-            messages.append({
-                "role": "system",
-                "content": f"{system_prompt}\n\nYou have the following memories. Use them to help answer the user's question if relevant, but do not repeat them verbatim or list them. Answer naturally and in character.\nMemories:\n{memories_text}"
-            })
-        else:
-            messages.append({
+            memory_messages.append({
                 "role": "system",
-                "content": system_prompt
+                "content": f"You have the following memories. Use them to help answer the user's question if relevant, but do not repeat them verbatim or list them. Answer naturally and in character.\nMemories:\n{memories_text}"
             })
-        # Add regular memory
-        messages.extend(self._memory.copy())
         user_content = []
         text_prompt = user_query
         if text_prompt:
@@ -359,9 +396,29 @@ class BasicMemoryAgent(AgentInterface):
                 logger.warning(
                     "User input contains images but none could be processed."
                 )
+        input_messages = []
+        if user_content:
+            input_messages.append({"role": "user", "content": user_content})
+
+        # Trim the chat memory to the token budget before building the prompt
+        self._context_window.fit(
+            self._memory,
+            reserved_tokens=self._context_window.count_tokens(
+                prefix_messages + memory_messages + input_messages
+            ),
+        )
+        history_messages = self._memory.copy()
+        messages = prefix_messages + history_messages + memory_messages + input_messages
+        self._context_window.record_prompt(
+            {
+                "system": prefix_messages,
+                "history": history_messages,
+                "memories": memory_messages,
+                "input": input_messages,
+            }
+        )
+
         if user_content:
-            user_message = {"role": "user", "content": user_content}
-            messages.append(user_message)
             skip_memory = False
             if input_data.metadata and input_data.metadata.get("skip_memory", False):
                 skip_memory = True
@@ -571,9 +628,9 @@ class BasicMemoryAgent(AgentInterface):
                         logger.warning(
                             f"LLM {getattr(self._llm, 'model', '')} has no native tool support. Switching to prompt mode."
                         )
+                        # The tool manager is shared with other sessions and is
+                        # left as is, prompt mode just stops sending the tools
                         self.prompt_mode_flag = True
-                        if self._tool_manager:
-                            self._tool_manager.disable()
                         if self._json_detector:
                             self._json_detector.reset()
                         goto_next_while_iteration = True
@@ -669,14 +726,7 @@ class BasicMemoryAgent(AgentInterface):
     ) -> Callable[[BatchInput], AsyncIterator[Union[SentenceOutput, Dict[str, Any]]]]:
         """Create the chat pipeline function."""
 
-        @tts_filter(self._tts_preprocessor_config)
-        @display_processor()
-        @actions_extractor(self._live2d_model)
-        @sentence_divider(
-            faster_first_response=self._faster_first_response,
-            segment_method=self._segment_method,
-            valid_tags=["think"],
-        )
+        @output_pipeline(self._output_pipeline)
         async def chat_with_memory(
             input_data: BatchInput,
         ) -> AsyncIterator[Union[str, Dict[str, Any]]]:
@@ -691,11 +741,11 @@ class BasicMemoryAgent(AgentInterface):
 
             if self._use_mcpp and self._tool_manager:
                 tools = None
-                if isinstance(self._llm, ClaudeAsyncLLM):
+                if self._llm_is(ClaudeAsyncLLM):
                     tool_mode = "Claude"
                     tools = self._formatted_tools_claude
                     llm_supports_native_tools = True
-                elif isinstance(self._llm, OpenAICompatibleAsyncLLM):
+                elif self._llm_is(OpenAICompatibleAsyncLLM):
                     tool_mode = "OpenAI"
                     tools = self._formatted_tools_openai
                     llm_supports_native_tools = True
@@ -752,8 +802,7 @@ class BasicMemoryAgent(AgentInterface):
         input_data: BatchInput,
     ) -> AsyncIterator[Union[SentenceOutput, Dict[str, Any]]]:
         """Run chat pipeline."""
-        chat_func_decorated = self._chat_function_factory()
-        async for output in chat_func_decorated(input_data):
+        async for output in self._chat_function(input_data):
             yield output
 
     def reset_interrupt(self) -> None:
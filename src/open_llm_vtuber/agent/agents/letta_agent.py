@@ -1,12 +1,7 @@
 from typing import AsyncIterator, List, Dict, Any
 from .agent_interface import AgentInterface
 from ..output_types import SentenceOutput
-from ..transformers import (
-    sentence_divider,
-    actions_extractor,
-    tts_filter,
-    display_processor,
-)
+from ..transformers import OutputPipeline, output_pipeline
 from ...config_manager import TTSPreprocessorConfig
 from ..input_types import BatchInput, TextSource
 from letta_client import Letta
@@ -37,18 +32,14 @@ class LettaAgent(AgentInterface):
         self._faster_first_response = faster_first_response
         self._segment_method = segment_method
 
-        # Delay decorator application
-        self.chat = tts_filter(self._tts_preprocessor_config)(
-            display_processor()(
-                actions_extractor(self._live2d_model)(
-                    sentence_divider(
-                        faster_first_response=self._faster_first_response,
-                        segment_method=self._segment_method,
-                        valid_tags=["think"],
-                    )(self.chat)
-                )
-            )
+        self._output_pipeline = OutputPipeline.default(
+            live2d_model=self._live2d_model,
+            tts_preprocessor_config=self._tts_preprocessor_config,
+            faster_first_response=self._faster_first_response,
+            segment_method=self._segment_method,
+            valid_tags=["think"],
         )
+        self.chat = output_pipeline(self._output_pipeline)(self.chat)
 
     def set_memory_from_history(self, conf_uid: str, history_uid: str) -> None:
         # The Letta Server automatically stores historical messages, so this part is not needed
@@ -0,0 +1,263 @@
+"""Token-budgeted context window for agents that keep their own chat memory.
+
+The manager keeps the prompt under a configurable token budget by evicting the
+oldest turns of the chat memory. Evicted turns are folded into a rolling summary
+that is generated in the background, so the request that triggered the eviction
+is not delayed by an extra LLM call.
+
+Eviction happens in chunks (down to a low-water mark) rather than one message
+per turn. This keeps the beginning of the prompt identical across several
+consecutive turns, so provider-side prompt caching stays effective.
+"""
+
+import asyncio
+import json
+import re
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from ..utils.metrics import metrics
+
+try:
+    import tiktoken
+
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken is optional, fall back to a heuristic
+    _ENCODING = None
+
+# CJK characters are usually one token each, other text is roughly 4 chars/token
+_CJK_PATTERN = re.compile(r"[぀-ヿ㐀-䶿一-鿿가-힯]")
+# Overhead for role and message separators in chat formats
+_MESSAGE_OVERHEAD_TOKENS = 4
+# Rough cost of an image in the prompt
+_IMAGE_TOKENS = 85
+
+SUMMARY_PROMPT = (
+    "Summarize the conversation below for your own future reference. "
+    "Keep names, facts, promises and open questions, drop small talk. "
+    "Answer with a short paragraph of at most {max_words} words.\n\n"
+    "{previous_summary}"
+    "Conversation:\n{conversation}"
+)
+
+
+def count_text_tokens(text: str) -> int:
+    """Count the tokens of a piece of text (exact with tiktoken, estimated otherwise)."""
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    cjk_count = len(_CJK_PATTERN.findall(text))
+    return cjk_count + (len(text) - cjk_count + 3) // 4
+
+
+class ContextWindowManager:
+    """Fit the chat memory of an agent into a token budget."""
+
+    def __init__(
+        self,
+        max_tokens: int = 8192,
+        summarize: bool = True,
+        low_water_ratio: float = 0.75,
+        summary_max_words: int = 200,
+        cache_size: int = 4096,
+    ):
+        """
+        Args:
+            max_tokens: Token budget for the whole prompt. 0 or less disables trimming.
+            summarize: Whether evicted turns are folded into a rolling summary.
+            low_water_ratio: When the budget is exceeded, the history is trimmed down
+                to this fraction of the remaining budget, so that evictions (and
+                prefix changes) happen rarely.
+            summary_max_words: Length limit given to the LLM for the rolling summary.
+            cache_size: Number of per-message token counts to keep.
+        """
+        self.max_tokens = max_tokens
+        self.summarize = summarize
+        self.low_water_ratio = low_water_ratio
+        self.summary_max_words = summary_max_words
+
+        self._token_cache: OrderedDict[str, int] = OrderedDict()
+        self._cache_size = cache_size
+
+        self.summary: str = ""
+        self._pending_evicted: List[Dict[str, Any]] = []
+        self._summary_task: Optional[asyncio.Task] = None
+        self._summarizer: Optional[Callable[[str], Awaitable[str]]] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_tokens is not None and self.max_tokens > 0
+
+    def set_summarizer(self, summarizer: Callable[[str], Awaitable[str]]) -> None:
+        """Set the coroutine function used to generate summaries from a prompt."""
+        self._summarizer = summarizer
+
+    def reset(self) -> None:
+        """Forget the rolling summary, e.g. when a new chat history is loaded."""
+        if self._summary_task and not self._summary_task.done():
+            self._summary_task.cancel()
+        self._summary_task = None
+        self._pending_evicted = []
+        self.summary = ""
+
+    # ==== Token counting
+
+    def count_message_tokens(self, message: Dict[str, Any]) -> int:
+        """Count the tokens of a chat message. Results are cached per message content."""
+        content = message.get("content")
+        key = f"{message.get('role')}\x00" + (
+            content
+            if isinstance(content, str)
+            else json.dumps(content, ensure_ascii=False, sort_keys=True, default=str)
+        )
+        cached = self._token_cache.get(key)
+        if cached is not None:
+            self._token_cache.move_to_end(key)
+            return cached
+
+        tokens = _MESSAGE_OVERHEAD_TOKENS
+        if isinstance(content, str):
+            tokens += count_text_tokens(content)
+        elif isinstance(content, list):
+            for item in content:
+                if not isinstance(item, dict):
+                    tokens += count_text_tokens(str(item))
+                elif item.get("type") == "text":
+                    tokens += count_text_tokens(item.get("text", ""))
+                elif item.get("type") in ("image_url", "image"):
+                    tokens += _IMAGE_TOKENS
+                else:
+                    tokens += count_text_tokens(
+                        json.dumps(item, ensure_ascii=False, default=str)
+                    )
+        elif content is not None:
+            tokens += count_text_tokens(str(content))
+        if message.get("tool_calls"):
+            tokens += count_text_tokens(
+                json.dumps(message["tool_calls"], ensure_ascii=False, default=str)
+            )
+
+        self._token_cache[key] = tokens
+        if len(self._token_cache) > self._cache_size:
+            self._token_cache.popitem(last=False)
+        return tokens
+
+    def count_tokens(self, messages: List[Dict[str, Any]]) -> int:
+        return sum(self.count_message_tokens(message) for message in messages)
+
+    # ==== Budget enforcement
+
+    def summary_message(self) -> Optional[Dict[str, str]]:
+        """The rolling summary as a system message, or None if there is none yet."""
+        if not self.summary:
+            return None
+        return {
+            "role": "system",
+            "content": f"Summary of the earlier conversation:\n{self.summary}",
+        }
+
+    def fit(
+        self,
+        history: List[Dict[str, Any]],
+        reserved_tokens: int,
+    ) -> int:
+        """
+        Trim the history in place so the prompt fits into the budget.
+
+        Args:
+            history: The chat memory of the agent. Evicted messages are removed from it.
+            reserved_tokens: Tokens used by the parts of the prompt that cannot be
+                evicted (system prompt, summary, recalled memories, new user input).
+
+        Returns:
+            int: Number of messages evicted.
+        """
+        if not self.enabled or not history:
+            return 0
+
+        budget = max(self.max_tokens - reserved_tokens, 0)
+        history_tokens = self.count_tokens(history)
+        if history_tokens <= budget:
+            return 0
+
+        target = int(budget * self.low_water_ratio)
+        evict_count = 0
+        while evict_count < len(history) and history_tokens > target:
+            history_tokens -= self.count_message_tokens(history[evict_count])
+            evict_count += 1
+        # Keep the history starting with a user message, some providers require it
+        while evict_count < len(history) and history[evict_count]["role"] != "user":
+            evict_count += 1
+
+        evicted = history[:evict_count]
+        del history[:evict_count]
+
+        metrics.inc("agent.context.evicted_messages", evict_count)
+        logger.info(
+            f"Context window: evicted {evict_count} old messages "
+            f"(budget {self.max_tokens} tokens, {reserved_tokens} reserved)."
+        )
+
+        if self.summarize and self._summarizer:
+            self._pending_evicted.extend(evicted)
+            self._schedule_summary()
+        return evict_count
+
+    def record_prompt(self, parts: Dict[str, List[Dict[str, Any]]]) -> int:
+        """Log and record the token count of the prompt that is about to be sent."""
+        counts = {name: self.count_tokens(messages) for name, messages in parts.items()}
+        total = sum(counts.values())
+        metrics.observe("agent.prompt_tokens", total)
+        for name, count in counts.items():
+            metrics.observe(f"agent.prompt_tokens.{name}", count)
+        details = ", ".join(f"{name}={count}" for name, count in counts.items())
+        logger.info(f"Prompt tokens for this turn: {total} ({details})")
+        return total
+
+    # ==== Rolling summary
+
+    def _schedule_summary(self) -> None:
+        if self._summary_task and not self._summary_task.done():
+            # The running task picks up the pending messages when it finishes
+            return
+        try:
+            self._summary_task = asyncio.get_running_loop().create_task(
+                self._summarize_pending()
+            )
+        except RuntimeError:
+            logger.warning("No running event loop, evicted turns are not summarized.")
+            self._pending_evicted = []
+
+    async def _summarize_pending(self) -> None:
+        while self._pending_evicted:
+            evicted = self._pending_evicted
+            self._pending_evicted = []
+            conversation = "\n".join(
+                f"{message.get('role')}: {message.get('content')}"
+                for message in evicted
+                if isinstance(message.get("content"), str) and message.get("content")
+            )
+            if not conversation:
+                continue
+            previous_summary = (
+                f"Summary so far:\n{self.summary}\n\n" if self.summary else ""
+            )
+            prompt = SUMMARY_PROMPT.format(
+                max_words=self.summary_max_words,
+                previous_summary=previous_summary,
+                conversation=conversation,
+            )
+            try:
+                summary = (await self._summarizer(prompt)).strip()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Failed to summarize evicted turns: {e}")
+                continue
+            if summary:
+                self.summary = summary
+                metrics.inc("agent.context.summaries")
+                logger.debug(f"Updated rolling conversation summary: {summary}")
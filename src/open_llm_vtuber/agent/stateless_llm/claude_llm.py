@@ -4,12 +4,17 @@ for language generation.
 """
 
 import json
+import time
 from typing import AsyncIterator, List, Dict, Any
 
 from loguru import logger
 from anthropic import AsyncAnthropic, NOT_GIVEN
 
 from .stateless_llm_interface import StatelessLLMInterface
+from ...utils.metrics import metrics
+
+# Marks the end of a prompt prefix that Anthropic may cache between requests
+CACHE_CONTROL = {"type": "ephemeral"}
 
 
 class AsyncLLM(StatelessLLMInterface):
@@ -19,6 +24,7 @@ class AsyncLLM(StatelessLLMInterface):
         base_url: str = None,
         llm_api_key: str = None,
         system: str = None,
+        prompt_caching: bool = True,
     ):
         """
         Initialize Claude LLM.
@@ -28,9 +34,11 @@ class AsyncLLM(StatelessLLMInterface):
             base_url (str): Base URL for Claude API
             llm_api_key (str): Claude API key
             system (str): System prompt
+            prompt_caching (bool): Whether to mark the tools and system prompt as cacheable
         """
         self.model = model
         self.system = system
+        self.prompt_caching = prompt_caching
 
         # Initialize Claude client
         self.client = AsyncAnthropic(
@@ -81,6 +89,38 @@ class AsyncLLM(StatelessLLMInterface):
         # Handle plain text content or non-list content
         return message
 
+    def _build_system(self, system: str) -> str | List[Dict[str, Any]]:
+        """Build the system parameter, with a cache breakpoint if caching is enabled."""
+        if not system:
+            return ""
+        if not self.prompt_caching:
+            return system
+        return [{"type": "text", "text": system, "cache_control": CACHE_CONTROL}]
+
+    def _build_tools(self, tools: List[Dict[str, Any]] | None):
+        """Sort tools by name for a stable prefix and mark the last one as cacheable."""
+        if not tools:
+            return NOT_GIVEN
+        tools = sorted(tools, key=lambda tool: tool.get("name", ""))
+        if self.prompt_caching:
+            # Copy the last tool so the shared, pre-formatted tool list is not modified
+            tools[-1] = {**tools[-1], "cache_control": CACHE_CONTROL}
+        return tools
+
+    def _record_usage(self, usage: Dict[str, Any]) -> None:
+        """Log and record the prompt cache usage reported in message_start."""
+        input_tokens = usage.get("input_tokens") or 0
+        cache_read = usage.get("cache_read_input_tokens") or 0
+        cache_write = usage.get("cache_creation_input_tokens") or 0
+        metrics.observe("llm.prompt_tokens", input_tokens + cache_read + cache_write)
+        metrics.observe("llm.cached_prompt_tokens", cache_read)
+        metrics.inc("llm.cache_write_tokens", cache_write)
+        logger.info(
+            f"Claude usage: input_tokens={input_tokens}, "
+            f"cache_read_input_tokens={cache_read}, "
+            f"cache_creation_input_tokens={cache_write}"
+        )
+
     async def chat_completion(
         self,
         messages: List[Dict[str, Any]],
@@ -119,12 +159,14 @@ class AsyncLLM(StatelessLLMInterface):
             logger.debug(f"Sending messages to Claude API: {converted_messages}")
             logger.debug(f"Tools provided: {tools}")
 
+            request_start = time.perf_counter()
+            first_token_recorded = False
             async with self.client.messages.stream(
                 messages=converted_messages,
-                system=system if system else (self.system if self.system else ""),
+                system=self._build_system(system or self.system),
                 model=self.model,
                 max_tokens=1024,
-                tools=tools if tools else NOT_GIVEN,
+                tools=self._build_tools(tools),
             ) as stream:
                 current_tool_call_info = None
                 partial_json_accumulator = ""
@@ -132,6 +174,8 @@ class AsyncLLM(StatelessLLMInterface):
                 async for event in stream:
                     if event.type == "message_start":
                         logger.debug("Stream: message_start")
+                        if event.message.usage:
+                            self._record_usage(event.message.usage.model_dump())
                         yield {
                             "type": "message_start",
                             "data": event.message.model_dump(exclude_none=True),
@@ -162,6 +206,12 @@ class AsyncLLM(StatelessLLMInterface):
                             f"Stream: content_block_delta - Index: {event.index}, Delta Type: {event.delta.type}"
                         )
                         if event.delta.type == "text_delta":
+                            if not first_token_recorded:
+                                first_token_recorded = True
+                                metrics.observe(
+                                    "llm.time_to_first_token_ms",
+                                    (time.perf_counter() - request_start) * 1000,
+                                )
                             yield {"type": "text_delta", "text": event.delta.text}
                         elif event.delta.type == "input_json_delta":
                             if (
@@ -2,12 +2,13 @@
 This class provides a stateless interface to llama.cpp for language generation.
 """
 
-import asyncio
+import threading
 from typing import AsyncIterator, List, Dict, Any
 from llama_cpp import Llama
 from loguru import logger
 
 from .stateless_llm_interface import StatelessLLMInterface
+from ...utils.async_bridge import iterate_in_thread
 
 
 class LLM(StatelessLLMInterface):
@@ -25,6 +26,8 @@ class LLM(StatelessLLMInterface):
         """
         logger.info(f"Initializing llama cpp with model path: {model_path}")
         self.model_path = model_path
+        # The Llama object is not thread-safe, generations are serialized
+        self._lock = threading.Lock()
         try:
             self.llm = Llama(model_path=model_path, **kwargs)
         except Exception as e:
@@ -55,17 +58,18 @@ class LLM(StatelessLLMInterface):
                     *messages,
                 ]
 
-            # Create chat completion in a separate thread to avoid blocking
-            chat_completion = await asyncio.get_event_loop().run_in_executor(
-                None,
+            # Both creating the completion and generating each token are blocking,
+            # so the whole generation runs in a worker thread.
+            chunks = iterate_in_thread(
                 lambda: self.llm.create_chat_completion(
                     messages=messages_with_system,
                     stream=True,
                 ),
+                lock=self._lock,
             )
 
             # Process chunks
-            for chunk in chat_completion:
+            async for chunk in chunks:
                 if chunk.get("choices") and chunk["choices"][0].get("delta"):
                     content = chunk["choices"][0]["delta"].get("content", "")
                     if content:
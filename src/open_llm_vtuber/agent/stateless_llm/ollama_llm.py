@@ -1,7 +1,10 @@
+import asyncio
 import atexit
+import httpx
 import requests
 from loguru import logger
 from .openai_compatible_llm import AsyncLLM
+from ...utils.http_client import http_clients
 
 
 class OllamaLLM(AsyncLLM):
@@ -27,29 +30,53 @@ class OllamaLLM(AsyncLLM):
             project_id=project_id,
             temperature=temperature,
         )
+        self._preload_task = None
         try:
-            # preload model
-            logger.info("Preloading model for Ollama")
-            # Send the POST request to preload model
-            logger.debug(
-                requests.post(
-                    base_url.replace("/v1", "") + "/api/chat",
-                    json={
-                        "model": model,
-                        "keep_alive": keep_alive,
-                    },
-                )
+            # Preload in the background when an event loop is running, so
+            # initializing the agent does not wait for the model to load.
+            self._preload_task = asyncio.get_running_loop().create_task(
+                self._preload_model()
             )
-        except requests.exceptions.ConnectionError as e:
-            logger.error(f"Failed to preload model: {e}")
+        except RuntimeError:
+            self._preload_model_sync()
+        # If keep_alive is less than 0, register cleanup to unload the model
+        if unload_at_exit:
+            atexit.register(self.cleanup)
+
+    def _preload_payload(self):
+        return (
+            self.base_url.replace("/v1", "") + "/api/chat",
+            {"model": self.model, "keep_alive": self.keep_alive},
+        )
+
+    def _log_preload_error(self, e: Exception, connection_error: bool):
+        logger.error(f"Failed to preload model: {e}")
+        if connection_error:
             logger.critical(
                 "Fail to connect to Ollama backend. Is Ollama server running? Try running `ollama list` to start the server and try again.\nThe AI will repeat 'Error connecting chat endpoint' until the server is running."
             )
+
+    async def _preload_model(self):
+        """Preload the model through the pooled async HTTP client."""
+        url, payload = self._preload_payload()
+        try:
+            logger.info("Preloading model for Ollama")
+            logger.debug(await http_clients.get(url).post(url, json=payload))
+        except httpx.ConnectError as e:
+            self._log_preload_error(e, connection_error=True)
         except Exception as e:
-            logger.error(f"Failed to preload model: {e}")
-        # If keep_alive is less than 0, register cleanup to unload the model
-        if unload_at_exit:
-            atexit.register(self.cleanup)
+            self._log_preload_error(e, connection_error=False)
+
+    def _preload_model_sync(self):
+        """Preload the model when no event loop is running."""
+        url, payload = self._preload_payload()
+        try:
+            logger.info("Preloading model for Ollama")
+            logger.debug(requests.post(url, json=payload))
+        except requests.exceptions.ConnectionError as e:
+            self._log_preload_error(e, connection_error=True)
+        except Exception as e:
+            self._log_preload_error(e, connection_error=False)
 
     def __del__(self):
         """Destructor to unload the model"""
@@ -3,22 +3,26 @@ This class is responsible for handling asynchronous interaction with OpenAI API
 endpoints for language generation.
 """
 
+import time
 from typing import AsyncIterator, List, Dict, Any
 from openai import (
     AsyncStream,
     AsyncOpenAI,
     APIError,
     APIConnectionError,
+    BadRequestError,
     RateLimitError,
     NotGiven,
     NOT_GIVEN,
 )
 from openai.types.chat import ChatCompletionChunk
 from openai.types.chat.chat_completion_chunk import ChoiceDeltaToolCall
+from openai.types.completion_usage import CompletionUsage
 from loguru import logger
 
 from .stateless_llm_interface import StatelessLLMInterface
 from ...mcpp.types import ToolCallObject
+from ...utils.metrics import metrics
 
 
 class AsyncLLM(StatelessLLMInterface):
@@ -52,11 +56,55 @@ class AsyncLLM(StatelessLLMInterface):
             api_key=llm_api_key,
         )
         self.support_tools = True
+        # Ask for token usage at the end of the stream, disabled if the server rejects it
+        self.include_usage = True
 
         logger.info(
             f"Initialized AsyncLLM with the parameters: {self.base_url}, {self.model}"
         )
 
+    @staticmethod
+    def _stable_tools(
+        tools: List[Dict[str, Any]] | NotGiven,
+    ) -> List[Dict[str, Any]] | NotGiven:
+        """Sort tools by name, so the tool block of the prompt is identical across
+        requests and sessions and can be reused by server-side prefix caches."""
+        if not tools:
+            return NOT_GIVEN
+        return sorted(tools, key=lambda tool: tool.get("function", {}).get("name", ""))
+
+    async def _create_stream(self, **kwargs) -> AsyncStream[ChatCompletionChunk]:
+        """Create the completion stream, requesting usage stats when supported."""
+        if self.include_usage:
+            try:
+                return await self.client.chat.completions.create(
+                    stream_options={"include_usage": True}, **kwargs
+                )
+            except BadRequestError as e:
+                if "stream_options" not in str(e):
+                    raise
+                self.include_usage = False
+                logger.warning(
+                    f"{self.model} does not support stream_options. Token usage will not be reported."
+                )
+        return await self.client.chat.completions.create(**kwargs)
+
+    def _record_usage(self, usage: CompletionUsage) -> None:
+        """Log and record prompt and cached token counts reported by the server."""
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", None)
+        if cached_tokens is None:
+            # DeepSeek reports its context cache hits in a separate field
+            cached_tokens = (usage.model_extra or {}).get("prompt_cache_hit_tokens")
+        cached_tokens = cached_tokens or 0
+        metrics.observe("llm.prompt_tokens", usage.prompt_tokens or 0)
+        metrics.observe("llm.cached_prompt_tokens", cached_tokens)
+        logger.info(
+            f"LLM usage: prompt_tokens={usage.prompt_tokens}, "
+            f"cached_tokens={cached_tokens}, "
+            f"completion_tokens={usage.completion_tokens}"
+        )
+
     async def chat_completion(
         self,
         messages: List[Dict[str, Any]],
@@ -95,11 +143,13 @@ class AsyncLLM(StatelessLLMInterface):
                 ]
             logger.debug(f"Messages: {messages_with_system}")
 
-            available_tools = tools if self.support_tools else NOT_GIVEN
+            available_tools = (
+                self._stable_tools(tools) if self.support_tools else NOT_GIVEN
+            )
 
-            stream: AsyncStream[
-                ChatCompletionChunk
-            ] = await self.client.chat.completions.create(
+            request_start = time.perf_counter()
+            first_token_recorded = False
+            stream: AsyncStream[ChatCompletionChunk] = await self._create_stream(
                 messages=messages_with_system,
                 model=self.model,
                 stream=True,
@@ -111,6 +161,20 @@ class AsyncLLM(StatelessLLMInterface):
             )
 
             async for chunk in stream:
+                if chunk.usage:
+                    self._record_usage(chunk.usage)
+                # The usage chunk (and some keep-alive chunks) carry no choices
+                if len(chunk.choices) == 0:
+                    if not chunk.usage:
+                        logger.info("Empty chunk received")
+                    continue
+                if not first_token_recorded:
+                    first_token_recorded = True
+                    metrics.observe(
+                        "llm.time_to_first_token_ms",
+                        (time.perf_counter() - request_start) * 1000,
+                    )
+
                 if self.support_tools:
                     has_tool_calls = (
                         hasattr(chunk.choices[0].delta, "tool_calls")
@@ -178,10 +242,7 @@ class AsyncLLM(StatelessLLMInterface):
                         accumulated_tool_calls = {}  # Reset for potential future tool calls
 
                 # Process regular content chunks
-                if len(chunk.choices) == 0:
-                    logger.info("Empty chunk received")
-                    continue
-                elif chunk.choices[0].delta.content is None:
+                if chunk.choices[0].delta.content is None:
                     chunk.choices[0].delta.content = ""
                 yield chunk.choices[0].delta.content
 
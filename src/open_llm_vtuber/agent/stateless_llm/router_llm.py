@@ -0,0 +1,280 @@
+"""Description: This file contains the implementation of the `RouterLLM` class.
+This class routes chat completions across several configured LLM providers, with
+per-provider concurrency limits, latency-aware provider choice, failover before
+the first token and optional hedged requests.
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from .stateless_llm_interface import StatelessLLMInterface
+from ...utils.metrics import metrics
+
+# Error strings yielded (instead of raised) by the other LLM implementations
+_ERROR_PREFIX = "Error calling the chat endpoint"
+# Claude events that come before any generated content
+_PREAMBLE_EVENT_TYPES = ("message_start", "ping")
+
+
+def _is_preamble(event: Any) -> bool:
+    """Events that come before the first token: Claude's message_start and ping,
+    and the empty content of OpenAI's role-only first chunk."""
+    if isinstance(event, dict):
+        return event.get("type") in _PREAMBLE_EVENT_TYPES
+    return event == ""
+
+
+class _ProviderFailure(Exception):
+    """Raised when a provider fails before producing its first token."""
+
+    def __init__(self, message: str, event: Any = None):
+        super().__init__(message)
+        self.event = event
+
+
+class _Provider:
+    """A wrapped LLM with its concurrency limit and latency statistics."""
+
+    def __init__(self, name: str, llm: StatelessLLMInterface, max_concurrency: int):
+        self.name = name
+        self.llm = llm
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.ttft_ewma: Optional[float] = None
+        self.cooldown_until: float = 0.0
+
+    def record_ttft(self, seconds: float, alpha: float) -> None:
+        if self.ttft_ewma is None:
+            self.ttft_ewma = seconds
+        else:
+            self.ttft_ewma = alpha * seconds + (1 - alpha) * self.ttft_ewma
+        metrics.observe(f"llm.router.{self.name}.ttft_ms", seconds * 1000)
+
+    def in_cooldown(self) -> bool:
+        return time.monotonic() < self.cooldown_until
+
+
+class _Attempt:
+    """One streaming request to one provider."""
+
+    def __init__(self, provider: _Provider, stream: AsyncIterator[Any]):
+        self.provider = provider
+        self.stream = stream
+        # Events received up to and including the first token
+        self.buffered: List[Any] = []
+
+    async def wait_first_token(self) -> None:
+        """Read events until the first token. Raises _ProviderFailure on errors."""
+        async for event in self.stream:
+            if isinstance(event, str) and event.startswith(_ERROR_PREFIX):
+                raise _ProviderFailure(event, event)
+            if isinstance(event, dict) and event.get("type") == "error":
+                raise _ProviderFailure(event.get("message", ""), event)
+            self.buffered.append(event)
+            if not _is_preamble(event):
+                return
+        # Stream ended without content, an empty answer is still an answer
+
+    async def close(self) -> None:
+        try:
+            await self.stream.aclose()
+        except Exception as e:
+            logger.debug(f"Error while closing stream of {self.provider.name}: {e}")
+
+
+class RouterLLM(StatelessLLMInterface):
+    def __init__(
+        self,
+        providers: List[Tuple[str, StatelessLLMInterface]],
+        max_concurrency: int = 4,
+        hedge_after_ms: Optional[float] = None,
+        failure_cooldown: float = 30.0,
+        latency_smoothing: float = 0.3,
+    ):
+        """
+        Initializes the router.
+
+        Parameters:
+        - providers (List[Tuple[str, StatelessLLMInterface]]): The (name, llm) pairs to
+            route across, in order of preference.
+        - max_concurrency (int): Maximum number of concurrent requests per provider.
+        - hedge_after_ms (float, optional): If the first token has not arrived after this
+            many milliseconds, a request to the next provider is started as well and the
+            slower one is cancelled. None disables hedging.
+        - failure_cooldown (float): Seconds a failed provider is moved to the end of
+            the preference list.
+        - latency_smoothing (float): Weight of the newest sample in the moving average
+            of the time to first token.
+        """
+        if not providers:
+            raise ValueError("RouterLLM needs at least one provider")
+        self.providers = [
+            _Provider(name, llm, max_concurrency) for name, llm in providers
+        ]
+        self.hedge_after_ms = hedge_after_ms
+        self.failure_cooldown = failure_cooldown
+        self.latency_smoothing = latency_smoothing
+        logger.info(
+            f"Initialized RouterLLM with providers: {[p.name for p in self.providers]}"
+        )
+
+    @property
+    def llms(self) -> List[StatelessLLMInterface]:
+        return [provider.llm for provider in self.providers]
+
+    def _rank_providers(self) -> List[_Provider]:
+        """Healthy, free and fast providers first. Unmeasured providers are tried
+        early so they get a latency estimate; ties keep the configured order."""
+        return sorted(
+            self.providers,
+            key=lambda p: (
+                p.in_cooldown(),
+                p.semaphore.locked(),
+                p.ttft_ewma if p.ttft_ewma is not None else 0.0,
+            ),
+        )
+
+    async def _provider_stream(
+        self,
+        provider: _Provider,
+        messages: List[Dict[str, Any]],
+        system: str,
+        tools: List[Dict[str, Any]],
+    ) -> AsyncIterator[Any]:
+        async with provider.semaphore:
+            start = time.perf_counter()
+            first_token = False
+            # Not every implementation accepts tools
+            kwargs = {"tools": tools} if tools else {}
+            async for event in provider.llm.chat_completion(messages, system, **kwargs):
+                if not first_token and not _is_preamble(event):
+                    first_token = True
+                    provider.record_ttft(
+                        time.perf_counter() - start, self.latency_smoothing
+                    )
+                yield event
+
+    def _start_attempt(
+        self, provider: _Provider, messages, system, tools
+    ) -> Tuple[_Attempt, asyncio.Task]:
+        logger.debug(f"RouterLLM: sending request to {provider.name}")
+        metrics.inc(f"llm.router.{provider.name}.requests")
+        attempt = _Attempt(
+            provider, self._provider_stream(provider, messages, system, tools)
+        )
+        return attempt, asyncio.create_task(attempt.wait_first_token())
+
+    def _mark_failed(self, provider: _Provider, error: BaseException) -> None:
+        logger.warning(f"RouterLLM: provider {provider.name} failed: {error}")
+        metrics.inc(f"llm.router.{provider.name}.failures")
+        provider.cooldown_until = time.monotonic() + self.failure_cooldown
+
+    async def _first_token_race(
+        self, messages, system, tools
+    ) -> Tuple[Optional[_Attempt], Any]:
+        """Run attempts until one produces its first token.
+
+        Returns the winning attempt (or None if every provider failed) and the
+        last error event seen.
+        """
+        candidates = self._rank_providers()
+        pending: Dict[asyncio.Task, _Attempt] = {}
+        last_error_event = None
+        hedged = False
+
+        attempt, task = self._start_attempt(candidates.pop(0), messages, system, tools)
+        pending[task] = attempt
+        try:
+            while pending:
+                can_hedge = (
+                    self.hedge_after_ms is not None and candidates and not hedged
+                )
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=self.hedge_after_ms / 1000 if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    hedged = True
+                    provider = candidates.pop(0)
+                    logger.info(
+                        f"RouterLLM: no first token after {self.hedge_after_ms} ms, hedging with {provider.name}"
+                    )
+                    metrics.inc("llm.router.hedged_requests")
+                    attempt, task = self._start_attempt(
+                        provider, messages, system, tools
+                    )
+                    pending[task] = attempt
+                    continue
+
+                for task in done:
+                    attempt = pending.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        return attempt, None
+                    if isinstance(error, _ProviderFailure) and error.event is not None:
+                        last_error_event = error.event
+                    self._mark_failed(attempt.provider, error)
+                    await attempt.close()
+
+                if not pending and candidates:
+                    provider = candidates.pop(0)
+                    logger.info(f"RouterLLM: failing over to {provider.name}")
+                    metrics.inc("llm.router.failovers")
+                    attempt, task = self._start_attempt(
+                        provider, messages, system, tools
+                    )
+                    pending[task] = attempt
+            return None, last_error_event
+        finally:
+            # Cancel the losers (or everything if we were cancelled ourselves)
+            for task, attempt in pending.items():
+                task.cancel()
+            for task, attempt in pending.items():
+                try:
+                    await task
+                except BaseException:
+                    pass
+                await attempt.close()
+
+    async def chat_completion(
+        self,
+        messages: List[Dict[str, Any]],
+        system: str = None,
+        tools: List[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Generates a chat completion with the best available provider.
+
+        The events of the winning provider are passed through unchanged, so the
+        output has the same format as the wrapped LLMs.
+
+        Parameters:
+        - messages (List[Dict[str, Any]]): The list of messages to send to the API.
+        - system (str, optional): System prompt to use for this completion.
+        - tools (List[Dict[str, Any]], optional): List of tools to use for this completion.
+
+        Yields:
+        - The events of the provider that produced the first token.
+        """
+        attempt, last_error_event = await self._first_token_race(
+            messages, system, tools
+        )
+        if attempt is None:
+            logger.error("RouterLLM: all providers failed.")
+            metrics.inc("llm.router.exhausted")
+            yield last_error_event or (
+                f"{_ERROR_PREFIX}: All LLM providers failed. See the logs for details."
+            )
+            return
+
+        logger.debug(f"RouterLLM: streaming from {attempt.provider.name}")
+        try:
+            for event in attempt.buffered:
+                yield event
+            async for event in attempt.stream:
+                yield event
+        finally:
+            await attempt.close()
@@ -4,13 +4,14 @@ compatible endpoints for language generation where the language model is not
 trained using a ChatML format.
 """
 
-import requests
+import httpx
 import json
 from jinja2 import Template
 from loguru import logger
 from typing import AsyncIterator, List, Dict, Any
 
 from .stateless_llm_interface import StatelessLLMInterface
+from ...utils.http_client import http_clients
 
 
 TEMPLATES = {
@@ -138,7 +139,6 @@ class AsyncLLMWithTemplate(StatelessLLMInterface):
         """
         logger.debug(f"Messages: {messages}")
         bos_token = "<|begin_of_text|>"
-        stream = None
         try:
             # If system prompt is provided, add it to the messages
             messages_with_system: List[Dict[str, Any]] = messages
@@ -157,10 +157,18 @@ class AsyncLLMWithTemplate(StatelessLLMInterface):
                 "temperature": self.temperature,
                 "prompt": prompt,
             }
-            with requests.post(
-                self.completion_url, headers=self.prompt_headers, json=data, stream=True
+            # Leaving the context (also when the consumer is interrupted) closes
+            # the connection, so the server stops generating tokens.
+            async with http_clients.get(self.completion_url).stream(
+                "POST",
+                self.completion_url,
+                headers=self.prompt_headers,
+                json=data,
+                # No read timeout: the server may take a while before the first token
+                timeout=httpx.Timeout(None, connect=10.0),
             ) as response:
-                for line in response.iter_lines():
+                response.raise_for_status()
+                async for line in response.aiter_lines():
                     if line:
                         line = self._clean_raw_bytes(line)
                         next_token = self._process_line(line)
@@ -170,21 +178,15 @@ class AsyncLLMWithTemplate(StatelessLLMInterface):
                             yield next_token
         except Exception as e:
             logger.error(f"LLM API WITH TEMPLATE: Error occurred: {e}")
-            logger.info(f"Base URL: {self.base_url}")
+            logger.info(f"Base URL: {self.completion_url}")
             logger.info(f"Model: {self.model}")
             logger.info(f"Messages: {messages}")
             logger.info(f"temperature: {self.temperature}")
             yield "Error calling the chat endpoint: Error occurred while generating response. See the logs for details."
-        finally:
-            # make sure the stream is properly closed
-            # so when interrupted, no more tokens will being generated.
-            if stream:
-                logger.debug("Chat completion finished.")
-                await stream.close()
-                logger.debug("Stream closed.")
 
     def _clean_raw_bytes(self, line):
-        line = line.decode("utf-8")
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
         line = line.removeprefix("data: ")
         line = json.loads(line)
         return line
@@ -73,6 +73,37 @@ class LLMFactory:
                 base_url=kwargs.get("base_url"),
                 model=kwargs.get("model"),
                 llm_api_key=kwargs.get("llm_api_key"),
+                prompt_caching=kwargs.get("prompt_caching", True),
+            )
+        elif llm_provider == "router_llm":
+            from .stateless_llm.router_llm import RouterLLM
+
+            llm_configs: dict = kwargs.get("llm_configs") or {}
+            providers = []
+            for provider_name in kwargs.get("providers") or []:
+                if provider_name == "router_llm":
+                    raise ValueError("router_llm cannot route to itself")
+                provider_config: dict = dict(llm_configs.get(provider_name) or {})
+                if not provider_config:
+                    raise ValueError(
+                        f"Configuration not found for LLM provider: {provider_name}"
+                    )
+                provider_config.pop("interrupt_method", None)
+                providers.append(
+                    (
+                        provider_name,
+                        LLMFactory.create_llm(
+                            llm_provider=provider_name,
+                            system_prompt=kwargs.get("system_prompt"),
+                            **provider_config,
+                        ),
+                    )
+                )
+            return RouterLLM(
+                providers=providers,
+                max_concurrency=kwargs.get("max_concurrency", 4),
+                hedge_after_ms=kwargs.get("hedge_after_ms"),
+                failure_cooldown=kwargs.get("failure_cooldown", 30.0),
             )
         else:
             raise ValueError(f"Unsupported LLM provider: {llm_provider}")
@@ -1,10 +1,20 @@
-from typing import AsyncIterator, Tuple, Callable, List, Union, Dict, Any
+from dataclasses import dataclass
+from typing import (
+    AsyncIterator,
+    Tuple,
+    Callable,
+    List,
+    Optional,
+    Union,
+    Dict,
+    Any,
+)
 from functools import wraps
 from .output_types import Actions, SentenceOutput, DisplayText
-from ..utils.tts_preprocessor import tts_filter as filter_text
+from ..utils.tts_preprocessor import tts_filter as filter_text, TTSTextFilter
 from ..live2d_model import Live2dModel
 from ..config_manager import TTSPreprocessorConfig
-from ..utils.sentence_divider import SentenceDivider
+from ..utils.sentence_divider import SentenceDivider, ChunkingPolicy
 from ..utils.sentence_divider import SentenceWithTags, TagState
 from loguru import logger
 
@@ -13,6 +23,7 @@ def sentence_divider(
     faster_first_response: bool = True,
     segment_method: str = "pysbd",
     valid_tags: List[str] = None,
+    chunking_policy: ChunkingPolicy = None,
 ):
     """
     Decorator that transforms token stream into sentences with tags
@@ -21,6 +32,7 @@ def sentence_divider(
         faster_first_response: bool - Whether to enable faster first response
         segment_method: str - Method for sentence segmentation
         valid_tags: List[str] - List of valid tags to process
+        chunking_policy: ChunkingPolicy - When to cut long text without punctuation
     """
 
     def decorator(
@@ -38,6 +50,7 @@ def sentence_divider(
                 faster_first_response=faster_first_response,
                 segment_method=segment_method,
                 valid_tags=valid_tags or [],
+                chunking_policy=chunking_policy,
             )
             stream_from_func = func(*args, **kwargs)
 
@@ -215,3 +228,190 @@ def tts_filter(
         return wrapper
 
     return decorator
+
+
+# ==== Fused output pipeline
+#
+# The decorators above run one async generator per step. OutputPipeline runs
+# the same steps as plain function calls on one record per sentence, so each
+# sentence crosses a single generator boundary. Steps are pluggable: any
+# callable taking a SentenceItem can be inserted into `pipeline.stages`.
+
+
+@dataclass
+class SentenceItem:
+    """A sentence on its way through the output pipeline"""
+
+    sentence: SentenceWithTags
+    actions: Actions
+    display: Optional[DisplayText] = None
+    tts_text: Optional[str] = None
+
+    @property
+    def is_tag(self) -> bool:
+        """Whether the sentence is a tag boundary (<think>, </think>) rather than text"""
+        return any(
+            tag.state in (TagState.START, TagState.END) for tag in self.sentence.tags
+        )
+
+
+# A stage updates the item in place
+OutputStage = Callable[[SentenceItem], None]
+
+
+class ActionsStage:
+    """Extract emotions from the sentence text, like actions_extractor"""
+
+    def __init__(self, live2d_model: Live2dModel):
+        self._live2d_model = live2d_model
+
+    def __call__(self, item: SentenceItem) -> None:
+        # Only extract emotions for non-tag text
+        if not item.is_tag:
+            expressions = self._live2d_model.extract_emotion(item.sentence.text)
+            if expressions:
+                item.actions.expressions = expressions
+
+
+class DisplayStage:
+    """Shape the display text, like display_processor"""
+
+    def __call__(self, item: SentenceItem) -> None:
+        text = item.sentence.text
+        # Handle think tag states
+        for tag in item.sentence.tags:
+            if tag.name == "think":
+                if tag.state == TagState.START:
+                    text = "("
+                elif tag.state == TagState.END:
+                    text = ")"
+        item.display = DisplayText(text=text)
+
+
+class TTSFilterStage:
+    """Filter the display text for TTS, like tts_filter. Skips think tag content."""
+
+    def __init__(self, tts_preprocessor_config: TTSPreprocessorConfig = None):
+        self._config = tts_preprocessor_config
+        self._filter: Optional[TTSTextFilter] = (
+            TTSTextFilter.from_config(tts_preprocessor_config)
+            if tts_preprocessor_config
+            else None
+        )
+
+    def __call__(self, item: SentenceItem) -> None:
+        if any(tag.name == "think" for tag in item.sentence.tags):
+            item.tts_text = ""
+            return
+        if self._filter is None:
+            self._filter = TTSTextFilter.from_config(TTSPreprocessorConfig())
+        try:
+            item.tts_text = self._filter(item.display.text)
+        except Exception as e:
+            logger.warning(f"Error filtering text for TTS: {e}")
+            item.tts_text = item.display.text
+
+
+class OutputPipeline:
+    """
+    Turns a token stream into SentenceOutput objects in one pass per sentence.
+
+    Build it once per agent configuration and call `run()` for every response.
+    """
+
+    def __init__(
+        self,
+        stages: List[OutputStage],
+        faster_first_response: bool = True,
+        segment_method: str = "pysbd",
+        valid_tags: List[str] = None,
+        chunking_policy: ChunkingPolicy = None,
+    ):
+        """
+        Args:
+            stages: List[OutputStage] - Steps applied to every sentence, in order
+            faster_first_response: bool - Whether to enable faster first response
+            segment_method: str - Method for sentence segmentation
+            valid_tags: List[str] - List of valid tags to process
+            chunking_policy: ChunkingPolicy - When to cut long text without punctuation
+        """
+        self.stages = stages
+        self._faster_first_response = faster_first_response
+        self._segment_method = segment_method
+        self._valid_tags = valid_tags or []
+        self._chunking_policy = chunking_policy
+
+    @classmethod
+    def default(
+        cls,
+        live2d_model: Live2dModel,
+        tts_preprocessor_config: TTSPreprocessorConfig = None,
+        **divider_kwargs,
+    ) -> "OutputPipeline":
+        """The pipeline equivalent to the sentence_divider, actions_extractor,
+        display_processor and tts_filter decorators stacked"""
+        return cls(
+            stages=[
+                ActionsStage(live2d_model),
+                DisplayStage(),
+                TTSFilterStage(tts_preprocessor_config),
+            ],
+            **divider_kwargs,
+        )
+
+    async def run(
+        self, token_stream: AsyncIterator[Union[str, Dict[str, Any]]]
+    ) -> AsyncIterator[Union[SentenceOutput, Dict[str, Any]]]:
+        """
+        Args:
+            token_stream: Tokens (str) and events (dict) from the agent
+
+        Yields:
+            SentenceOutput for every sentence, dicts are passed through unchanged
+        """
+        # The divider keeps per-response state, so each run gets its own
+        divider = SentenceDivider(
+            faster_first_response=self._faster_first_response,
+            segment_method=self._segment_method,
+            valid_tags=self._valid_tags,
+            chunking_policy=self._chunking_policy,
+        )
+        async for sentence in divider.process_stream(token_stream):
+            if isinstance(sentence, dict):
+                # Pass through dictionaries
+                yield sentence
+                continue
+
+            item = SentenceItem(sentence=sentence, actions=Actions())
+            for stage in self.stages:
+                stage(item)
+            display = item.display or DisplayText(text=sentence.text)
+            tts = item.tts_text if item.tts_text is not None else display.text
+
+            logger.debug(f"[{display.name}] display: {display.text}")
+            logger.debug(f"[{display.name}] tts: {tts}")
+
+            yield SentenceOutput(
+                display_text=display,
+                tts_text=tts,
+                actions=item.actions,
+            )
+
+
+def output_pipeline(pipeline: OutputPipeline):
+    """
+    Decorator that runs the token stream of the function through an OutputPipeline
+    """
+
+    def decorator(
+        func: Callable[..., AsyncIterator[Union[str, Dict[str, Any]]]],
+    ) -> Callable[..., AsyncIterator[Union[SentenceOutput, Dict[str, Any]]]]:
+        @wraps(func)
+        def wrapper(
+            *args, **kwargs
+        ) -> AsyncIterator[Union[SentenceOutput, Dict[str, Any]]]:
+            return pipeline.run(func(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
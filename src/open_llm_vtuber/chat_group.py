@@ -17,6 +17,10 @@ class ChatGroupManager:
         self.client_group_map: Dict[str, str] = {}  # client_uid -> group_id
         self.groups: Dict[str, Group] = {}  # group_id -> Group
 
+    def register_client(self, client_uid: str) -> None:
+        """Register a connected client, not in any group yet"""
+        self.client_group_map[client_uid] = ""
+
     def create_group_for_client(self, client_uid: str) -> str:
         group_id = f"group_{client_uid}"
         new_group = Group(group_id=group_id, owner_uid=client_uid, members={client_uid})
@@ -105,6 +109,7 @@ class ChatGroupManager:
         """
         group_id = self.client_group_map.get(client_uid)
         if not group_id or group_id not in self.groups:
+            self.client_group_map.pop(client_uid, None)
             return []
 
         group = self.groups[group_id]
@@ -11,6 +11,34 @@ from .stateless_llm import StatelessLLMConfigs
 # ======== Configurations for different Agents ========
 
 
+class ChunkingPolicyConfig(I18nMixin, BaseModel):
+    """Configuration for cutting long text without sentence end into TTS chunks."""
+
+    first_chunk_words: int = Field(0, alias="first_chunk_words")
+    first_chunk_timeout_ms: float = Field(0, alias="first_chunk_timeout_ms")
+    chunk_growth_factor: float = Field(2.0, alias="chunk_growth_factor")
+    max_chunk_words: int = Field(40, alias="max_chunk_words")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "first_chunk_words": Description(
+            en="Send the first chunk to TTS after this many words even without punctuation. 0 to disable (default: 0)",
+            zh="即使没有标点，也在这么多个词之后把第一段文本发送给 TTS。设置为 0 以禁用（默认：0）",
+        ),
+        "first_chunk_timeout_ms": Description(
+            en="Send the first chunk to TTS at the last complete word after this many milliseconds. 0 to disable (default: 0)",
+            zh="在这么多毫秒之后，在最后一个完整的词处把第一段文本发送给 TTS。设置为 0 以禁用（默认：0）",
+        ),
+        "chunk_growth_factor": Description(
+            en="Each following chunk may be this many times longer than the previous one (default: 2.0)",
+            zh="之后的每一段文本最多可以是前一段的多少倍长（默认：2.0）",
+        ),
+        "max_chunk_words": Description(
+            en="Upper limit of the chunk length in words (default: 40)",
+            zh="每段文本长度的上限（词数）（默认：40）",
+        ),
+    }
+
+
 class BasicMemoryAgentConfig(I18nMixin, BaseModel):
     """Configuration for the basic memory agent."""
 
@@ -27,12 +55,18 @@ class BasicMemoryAgentConfig(I18nMixin, BaseModel):
         "deepseek_llm",
         "groq_llm",
         "mistral_llm",
+        "router_llm",
     ] = Field(..., alias="llm_provider")
 
     faster_first_response: Optional[bool] = Field(True, alias="faster_first_response")
     segment_method: Literal["regex", "pysbd"] = Field("pysbd", alias="segment_method")
     use_mcpp: Optional[bool] = Field(False, alias="use_mcpp")
     mcp_enabled_servers: Optional[List[str]] = Field([], alias="mcp_enabled_servers")
+    max_context_tokens: int = Field(8192, alias="max_context_tokens")
+    summarize_evicted_turns: bool = Field(True, alias="summarize_evicted_turns")
+    chunking_policy: ChunkingPolicyConfig = Field(
+        ChunkingPolicyConfig(), alias="chunking_policy"
+    )
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "llm_provider": Description(
@@ -55,6 +89,18 @@ class BasicMemoryAgentConfig(I18nMixin, BaseModel):
             en="List of MCP servers to enable for the agent",
             zh="为智能体启用 MCP 服务器列表",
         ),
+        "max_context_tokens": Description(
+            en="Token budget of the prompt sent to the LLM. Oldest turns are dropped when it is exceeded. Set to 0 to disable (default: 8192)",
+            zh="发送给大语言模型的提示词的 token 上限。超出时会丢弃最早的对话。设置为 0 以禁用（默认：8192）",
+        ),
+        "summarize_evicted_turns": Description(
+            en="Whether dropped turns are summarized in the background and kept as a rolling summary (default: True)",
+            zh="是否在后台总结被丢弃的对话，并作为滚动摘要保留（默认：True）",
+        ),
+        "chunking_policy": Description(
+            en="When to send long text without punctuation to TTS early, to reduce the time to the first audio",
+            zh="何时提前把没有标点的长文本发送给 TTS，以减少首句音频的延迟",
+        ),
     }
 
 
@@ -1,5 +1,5 @@
 # config_manager/llm.py
-from typing import ClassVar, Literal
+from typing import ClassVar, List, Literal
 from pydantic import BaseModel, Field
 from .i18n import I18nMixin, Description
 
@@ -192,6 +192,7 @@ class ClaudeConfig(StatelessLLMBaseConfig):
     interrupt_method: Literal["system", "user"] = Field(
         "user", alias="interrupt_method"
     )
+    prompt_caching: bool = Field(True, alias="prompt_caching")
 
     _CLAUDE_DESCRIPTIONS: ClassVar[dict[str, Description]] = {
         "base_url": Description(
@@ -201,6 +202,10 @@ class ClaudeConfig(StatelessLLMBaseConfig):
         "model": Description(
             en="Name of the Claude model to use", zh="要使用的 Claude 模型名称"
         ),
+        "prompt_caching": Description(
+            en="Mark the system prompt and tools as cacheable to reduce latency and cost (default: True)",
+            zh="将系统提示词和工具标记为可缓存，以降低延迟和费用（默认：True）",
+        ),
     }
 
     DESCRIPTIONS: ClassVar[dict[str, Description]] = {
@@ -229,6 +234,39 @@ class LlamaCppConfig(StatelessLLMBaseConfig):
     }
 
 
+class RouterLLMConfig(StatelessLLMBaseConfig):
+    """Configuration for the LLM router, which spreads requests across other providers."""
+
+    providers: List[str] = Field(..., alias="providers")
+    max_concurrency: int = Field(4, alias="max_concurrency")
+    hedge_after_ms: float | None = Field(None, alias="hedge_after_ms")
+    failure_cooldown: float = Field(30.0, alias="failure_cooldown")
+
+    _ROUTER_DESCRIPTIONS: ClassVar[dict[str, Description]] = {
+        "providers": Description(
+            en="Names of the LLM configurations in llm_configs to route across, in order of preference",
+            zh="要路由的 llm_configs 中的 LLM 配置名称，按优先级排序",
+        ),
+        "max_concurrency": Description(
+            en="Maximum number of concurrent requests per provider (default: 4)",
+            zh="每个提供者的最大并发请求数（默认：4）",
+        ),
+        "hedge_after_ms": Description(
+            en="If the first token has not arrived after this many milliseconds, also send the request to the next provider and keep the faster one. Leave empty to disable",
+            zh="如果在此毫秒数后仍未收到第一个 token，则同时向下一个提供者发送请求，并保留更快的一个。留空以禁用",
+        ),
+        "failure_cooldown": Description(
+            en="Seconds a failed provider is tried last (default: 30)",
+            zh="失败的提供者被放到最后尝试的秒数（默认：30）",
+        ),
+    }
+
+    DESCRIPTIONS: ClassVar[dict[str, Description]] = {
+        **StatelessLLMBaseConfig.DESCRIPTIONS,
+        **_ROUTER_DESCRIPTIONS,
+    }
+
+
 class StatelessLLMConfigs(I18nMixin, BaseModel):
     """Pool of LLM provider configurations.
     This class contains configurations for different LLM providers."""
@@ -249,6 +287,7 @@ class StatelessLLMConfigs(I18nMixin, BaseModel):
     claude_llm: ClaudeConfig | None = Field(None, alias="claude_llm")
     llama_cpp_llm: LlamaCppConfig | None = Field(None, alias="llama_cpp_llm")
     mistral_llm: MistralConfig | None = Field(None, alias="mistral_llm")
+    router_llm: RouterLLMConfig | None = Field(None, alias="router_llm")
 
     DESCRIPTIONS: ClassVar[dict[str, Description]] = {
         "stateless_llm_with_template": Description(
@@ -282,4 +321,8 @@ class StatelessLLMConfigs(I18nMixin, BaseModel):
         "llama_cpp_llm": Description(
             en="Configuration for local Llama.cpp", zh="本地Llama.cpp配置"
         ),
+        "router_llm": Description(
+            en="Configuration for the LLM router with failover and hedging",
+            zh="带故障转移和对冲请求的 LLM 路由配置",
+        ),
     }
@@ -1,9 +1,148 @@
 # config_manager/system.py
 from pydantic import Field, model_validator
-from typing import Dict, ClassVar
+from typing import Dict, ClassVar, List, Literal
 from .i18n import I18nMixin, Description
 
 
+class HTTPClientConfig(I18nMixin):
+    """Settings of the shared HTTP connection pools used by HTTP-based engines."""
+
+    max_connections: int = Field(100, alias="max_connections")
+    max_keepalive_connections: int = Field(20, alias="max_keepalive_connections")
+    keepalive_expiry: float = Field(60.0, alias="keepalive_expiry")
+    timeout: float = Field(120.0, alias="timeout")
+    connect_timeout: float = Field(10.0, alias="connect_timeout")
+    http2: bool = Field(True, alias="http2")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "max_connections": Description(
+            en="Maximum number of connections per host", zh="每个主机的最大连接数"
+        ),
+        "max_keepalive_connections": Description(
+            en="Maximum number of idle connections kept alive per host",
+            zh="每个主机保持的最大空闲连接数",
+        ),
+        "keepalive_expiry": Description(
+            en="Seconds an idle connection is kept alive", zh="空闲连接保持的秒数"
+        ),
+        "timeout": Description(
+            en="Default request timeout in seconds", zh="默认请求超时时间（秒）"
+        ),
+        "connect_timeout": Description(
+            en="Connection timeout in seconds", zh="连接超时时间（秒）"
+        ),
+        "http2": Description(
+            en="Use HTTP/2 when available (requires the h2 package)",
+            zh="在可用时使用 HTTP/2（需要安装 h2 包）",
+        ),
+    }
+
+
+class EngineRegistryConfig(I18nMixin):
+    """Settings of the registry of ASR, TTS, VAD and translation engines shared by sessions."""
+
+    memory_budget_mb: int = Field(0, alias="memory_budget_mb")
+    warm_characters: List[str] = Field([], alias="warm_characters")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "memory_budget_mb": Description(
+            en="Memory (MB) the loaded engines may use before idle ones are unloaded, 0 for no limit",
+            zh="已加载引擎可使用的内存（MB），超出后卸载空闲引擎，0 表示不限制",
+        ),
+        "warm_characters": Description(
+            en="Character config files (e.g. conf.yaml or files in config_alts_dir) whose engines are loaded at startup",
+            zh="启动时预加载其引擎的角色配置文件（如 conf.yaml 或 config_alts_dir 中的文件）",
+        ),
+    }
+
+
+class AudioOutputConfig(I18nMixin):
+    """Settings of the audio sent to the clients."""
+
+    codec: Literal["wav", "native", "opus", "aac"] = Field("wav", alias="codec")
+    bitrate_kbps: int = Field(32, alias="bitrate_kbps")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "codec": Description(
+            en="Audio codec: wav (uncompressed), native (send compressed TTS output such as mp3 as is), opus or aac (encoded with ffmpeg)",
+            zh="音频编码：wav（不压缩）、native（直接发送 TTS 输出的压缩音频，如 mp3）、opus 或 aac（使用 ffmpeg 编码）",
+        ),
+        "bitrate_kbps": Description(
+            en="Bitrate of the opus and aac codecs (kbps)",
+            zh="opus 和 aac 编码的码率（kbps）",
+        ),
+    }
+
+
+class SendQueueConfig(I18nMixin):
+    """Settings of the outbound message queue of each client."""
+
+    max_messages: int = Field(256, alias="max_messages")
+    max_lag_ms: int = Field(5000, alias="max_lag_ms")
+    slow_consumer_policy: Literal["downgrade", "disconnect"] = Field(
+        "downgrade", alias="slow_consumer_policy"
+    )
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "max_messages": Description(
+            en="Messages queued for a client before it is disconnected",
+            zh="客户端断开连接前可排队的消息数",
+        ),
+        "max_lag_ms": Description(
+            en="Wait (ms) of the oldest queued message after which a client is a slow consumer",
+            zh="最早排队消息等待超过该时间（毫秒）后，客户端被视为慢速消费者",
+        ),
+        "slow_consumer_policy": Description(
+            en="What to do with slow consumers: downgrade (send text without audio until they catch up) or disconnect",
+            zh="慢速消费者的处理方式：downgrade（在其追上之前只发送文本、不发送音频）或 disconnect（断开连接）",
+        ),
+    }
+
+
+class ProxyQueueConfig(I18nMixin):
+    """Settings of the message queue of the proxy (/proxy-ws)."""
+
+    max_messages: int = Field(50, alias="max_messages", ge=1)
+    overflow_policy: Literal["drop", "merge"] = Field("drop", alias="overflow_policy")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "max_messages": Description(
+            en="Live chat messages waiting for their turn before the queue overflows",
+            zh="队列溢出前可排队等待的直播弹幕消息数",
+        ),
+        "overflow_policy": Description(
+            en="When the queue is full: drop (drop the oldest message of the lowest priority) or merge (append the new message to the last one of the same sender)",
+            zh="队列满时的处理方式：drop（丢弃最低优先级中最早的消息）或 merge（将新消息合并到同一发送者的最后一条消息）",
+        ),
+    }
+
+
+class WorkersConfig(I18nMixin):
+    """Settings of the multi-worker mode."""
+
+    count: int = Field(1, alias="count")
+    shared_engines: List[Literal["asr", "tts"]] = Field(
+        ["asr", "tts"], alias="shared_engines"
+    )
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "count": Description(
+            en="Number of worker processes serving the clients, 1 runs the server in a single process",
+            zh="服务客户端的工作进程数，1 表示以单进程运行服务器",
+        ),
+        "shared_engines": Description(
+            en="Engine kinds (asr, tts) loaded once in a shared engine process instead of in each worker",
+            zh="在共享引擎进程中只加载一次（而非在每个工作进程中加载）的引擎类型（asr、tts）",
+        ),
+    }
+
+    @model_validator(mode="after")
+    def check_count(cls, values):
+        if values.count < 1:
+            raise ValueError("workers.count must be at least 1")
+        return values
+
+
 class SystemConfig(I18nMixin):
     """System configuration settings."""
 
@@ -13,6 +152,14 @@ class SystemConfig(I18nMixin):
     config_alts_dir: str = Field(..., alias="config_alts_dir")
     tool_prompts: Dict[str, str] = Field(..., alias="tool_prompts")
     enable_proxy: bool = Field(False, alias="enable_proxy")
+    http_client: HTTPClientConfig = Field(HTTPClientConfig(), alias="http_client")
+    engine_registry: EngineRegistryConfig = Field(
+        EngineRegistryConfig(), alias="engine_registry"
+    )
+    audio_output: AudioOutputConfig = Field(AudioOutputConfig(), alias="audio_output")
+    send_queue: SendQueueConfig = Field(SendQueueConfig(), alias="send_queue")
+    workers: WorkersConfig = Field(WorkersConfig(), alias="workers")
+    proxy_queue: ProxyQueueConfig = Field(ProxyQueueConfig(), alias="proxy_queue")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "conf_version": Description(en="Configuration version", zh="配置文件版本"),
@@ -29,6 +176,30 @@ class SystemConfig(I18nMixin):
             en="Enable proxy mode for multiple clients",
             zh="启用代理模式以支持多个客户端使用一个 ws 连接",
         ),
+        "http_client": Description(
+            en="Connection pool settings for HTTP-based engines",
+            zh="基于 HTTP 的引擎的连接池设置",
+        ),
+        "engine_registry": Description(
+            en="Sharing, preloading and unloading of ASR, TTS, VAD and translation engines",
+            zh="ASR、TTS、VAD 和翻译引擎的共享、预加载与卸载",
+        ),
+        "audio_output": Description(
+            en="Encoding of the audio sent to the clients",
+            zh="发送给客户端的音频的编码",
+        ),
+        "send_queue": Description(
+            en="Outbound message queue of each client and handling of slow clients",
+            zh="每个客户端的发送消息队列及慢速客户端的处理",
+        ),
+        "workers": Description(
+            en="Worker processes, sticky routing of the clients and shared engines",
+            zh="工作进程、客户端的粘性路由及共享引擎",
+        ),
+        "proxy_queue": Description(
+            en="Queue of the live chat messages received in proxy mode",
+            zh="代理模式下接收的直播弹幕消息队列",
+        ),
     }
 
     @model_validator(mode="after")
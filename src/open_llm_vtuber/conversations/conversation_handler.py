@@ -72,7 +72,12 @@ async def handle_conversation_trigger(
     session_emoji = np.random.choice(EMOJI_LIST)
 
     group = chat_group_manager.get_client_group(client_uid)
-    if group and len(group.members) > 1:
+    # In the multi-worker mode, only the members connected to this worker
+    # take part in the conversation
+    group_members = (
+        {uid for uid in group.members if uid in client_contexts} if group else set()
+    )
+    if len(group_members) > 1:
         # Use group_id as task key for group conversations
         task_key = group.group_id
         if (
@@ -86,7 +91,7 @@ async def handle_conversation_trigger(
                     client_contexts=client_contexts,
                     client_connections=client_connections,
                     broadcast_func=broadcast_to_group,
-                    group_members=group.members,
+                    group_members=group_members,
                     initiator_client_uid=client_uid,
                     user_input=user_input,
                     images=images,
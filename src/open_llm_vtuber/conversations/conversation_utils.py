@@ -13,6 +13,8 @@ from ..agent.input_types import BatchInput, TextData, ImageData, TextSource, Ima
 from ..asr.asr_interface import ASRInterface
 from ..live2d_model import Live2dModel
 from ..tts.tts_interface import TTSInterface
+from ..translate.translation_stage import get_translation_stage
+from ..utils.audio_encoder import AudioEncoder
 from ..utils.stream_audio import prepare_audio_payload
 from ..service_context import ServiceContext
 from ..agent.agents.agent_interface import AgentInterface
@@ -69,7 +71,9 @@ async def process_agent_output(
                 translate_engine,
             )
         elif isinstance(output, AudioOutput):
-            full_response = await handle_audio_output(output, websocket_send)
+            full_response = await handle_audio_output(
+                output, websocket_send, tts_manager.audio_encoder
+            )
         else:
             logger.warning(f"Unknown output type: {type(output)}")
     except Exception as e:
@@ -98,8 +102,8 @@ async def handle_sentence_output(
 
         if translate_engine:
             if len(re.sub(r'[\s.,!?，。！？\'"』」）】\s]+', "", tts_text)):
-                tts_text = translate_engine.translate(tts_text)
-            logger.info(f"🏃 Text after translation: '''{tts_text}'''...")
+                # Translated in the background, the TTS task waits for the result
+                tts_text = get_translation_stage(translate_engine).translate(tts_text)
         else:
             logger.debug("🚫 No translation engine available. Skipping translation.")
 
@@ -118,6 +122,7 @@ async def handle_sentence_output(
 async def handle_audio_output(
     output: AudioOutput,
     websocket_send: WebSocketSend,
+    audio_encoder: Optional[AudioEncoder] = None,
 ) -> str:
     """Process and send AudioOutput directly to the client"""
     full_response = ""
@@ -127,6 +132,7 @@ async def handle_audio_output(
             audio_path=audio_path,
             display_text=display_text,
             actions=actions.to_dict() if actions else None,
+            encoder=audio_encoder,
         )
         await websocket_send(json.dumps(audio_payload))
     return full_response
@@ -170,6 +176,7 @@ async def finalize_conversation_turn(
     """Finalize a conversation turn"""
     if tts_manager.task_list:
         await asyncio.gather(*tts_manager.task_list)
+        tts_manager.emit_trace()
         await websocket_send(json.dumps({"type": "backend-synth-complete"}))
 
         response = await message_handler.wait_for_response(
@@ -216,6 +223,8 @@ async def send_conversation_end_signal(
 
 def cleanup_conversation(tts_manager: TTSTaskManager, session_emoji: str) -> None:
     """Clean up conversation resources"""
+    # Trace of an interrupted turn
+    tts_manager.emit_trace()
     tts_manager.clear()
     logger.debug(f"🧹 Clearing up conversation {session_emoji}.")
 
@@ -0,0 +1,191 @@
+"""
+Building blocks of the pipelined sentence executor used by TTSTaskManager.
+
+Every sentence of a conversation turn is wrapped in a SentenceJob and passed
+through a chain of PipelineStages. Each stage runs its own worker tasks and
+owns a bounded input queue, so a sentence can be synthesized while the next
+one is still being translated and the previous one is being sent. A full
+queue makes the previous stage (and finally the agent) wait. Stages with more
+than one worker may finish jobs out of order, the last stage restores the
+order with the sequence number of the jobs.
+
+PipelineTrace collects how long each stage worked on a job, how long the job
+waited in the stage's queue and how deep the queue got, and is emitted once
+per conversation turn.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from loguru import logger
+
+from ..agent.output_types import Actions, DisplayText
+from ..tts.tts_interface import TTSInterface
+from ..utils.metrics import metrics
+
+
+@dataclass
+class SentenceJob:
+    """A sentence on its way through the pipeline."""
+
+    sequence_number: int
+    # Text to synthesize, a pending translation of it, or None for silence
+    tts_text: Union[str, Awaitable[str], None]
+    display_text: DisplayText
+    actions: Optional[Actions]
+    tts_engine: TTSInterface
+    # Resolved once the sentence has been sent
+    done: asyncio.Future
+    audio_path: Optional[str] = None
+    # Encoded payload, ready to be sent (bytes for binary frames)
+    message: Union[str, bytes, None] = None
+    has_audio: bool = False
+    enqueued_at: float = 0.0
+
+
+@dataclass
+class StageStats:
+    """Latency and queue depth of one stage during one turn."""
+
+    items: int = 0
+    busy_ms: float = 0.0
+    max_ms: float = 0.0
+    wait_ms: float = 0.0
+    max_queue_depth: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "items": self.items,
+            "avg_ms": round(self.busy_ms / self.items, 1) if self.items else None,
+            "max_ms": round(self.max_ms, 1),
+            "avg_wait_ms": round(self.wait_ms / self.items, 1) if self.items else None,
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+
+class PipelineTrace:
+    """Per-turn trace of the stages of the sentence pipeline."""
+
+    def __init__(self, stage_names: List[str]):
+        self._stage_names = stage_names
+        self.stages: Dict[str, StageStats] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        self.stages = {name: StageStats() for name in self._stage_names}
+
+    def record(self, stage: str, busy_ms: float, wait_ms: float = 0.0) -> None:
+        """Record one job processed by a stage."""
+        stats = self.stages[stage]
+        stats.items += 1
+        stats.busy_ms += busy_ms
+        stats.max_ms = max(stats.max_ms, busy_ms)
+        stats.wait_ms += wait_ms
+        metrics.observe(f"pipeline.{stage}.latency_ms", busy_ms)
+        metrics.observe(f"pipeline.{stage}.wait_ms", wait_ms)
+
+    def record_queue_depth(self, stage: str, depth: int) -> None:
+        stats = self.stages[stage]
+        stats.max_queue_depth = max(stats.max_queue_depth, depth)
+
+    @property
+    def empty(self) -> bool:
+        return not any(stats.items for stats in self.stages.values())
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {name: stats.to_dict() for name, stats in self.stages.items()}
+
+    def emit(self) -> Dict[str, Dict[str, Any]]:
+        """Log and return the trace of the finished turn, then start a new one."""
+        trace = self.to_dict()
+        for name, stats in self.stages.items():
+            metrics.observe(f"pipeline.{name}.max_queue_depth", stats.max_queue_depth)
+        logger.info(
+            "Sentence pipeline: "
+            + " | ".join(
+                f"{name} n={stats['items']} avg={stats['avg_ms']}ms "
+                f"max={stats['max_ms']}ms wait={stats['avg_wait_ms']}ms "
+                f"depth<={stats['max_queue_depth']}"
+                for name, stats in trace.items()
+                if stats["items"]
+            )
+        )
+        self.reset()
+        return trace
+
+
+class PipelineStage:
+    """A pipeline stage with its own bounded queue and worker tasks."""
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[SentenceJob], Awaitable[None]],
+        trace: PipelineTrace,
+        workers: int = 1,
+        max_queue_size: int = 8,
+    ):
+        """
+        Args:
+            name: Name of the stage in the trace.
+            handler: Processes a job in place. Errors should be handled by the
+                handler, anything left is logged and the job moves on.
+            trace: Trace of the pipeline.
+            workers: Number of jobs processed concurrently.
+            max_queue_size: Capacity of the input queue.
+        """
+        self.name = name
+        self.handler = handler
+        self.trace = trace
+        self.workers = workers
+        self.next_stage: Optional["PipelineStage"] = None
+        self.queue: asyncio.Queue[SentenceJob] = asyncio.Queue(max_queue_size)
+        self._tasks: List[asyncio.Task] = []
+        # Jobs taken from the queue and not yet handed to the next stage
+        self._active: Dict[int, SentenceJob] = {}
+
+    async def put(self, job: SentenceJob) -> None:
+        """Queue a job, waiting while the queue is full."""
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._work()) for _ in range(self.workers)
+            ]
+        job.enqueued_at = time.perf_counter()
+        await self.queue.put(job)
+        self.trace.record_queue_depth(self.name, self.queue.qsize())
+
+    async def _work(self) -> None:
+        while True:
+            job = await self.queue.get()
+            self._active[job.sequence_number] = job
+            started = time.perf_counter()
+            try:
+                await self.handler(job)
+            except Exception as e:
+                logger.error(
+                    f"Pipeline stage {self.name} failed on sentence "
+                    f"{job.sequence_number}: {e}"
+                )
+            finally:
+                self.queue.task_done()
+            self.trace.record(
+                self.name,
+                busy_ms=(time.perf_counter() - started) * 1000,
+                wait_ms=(started - job.enqueued_at) * 1000,
+            )
+            if self.next_stage:
+                await self.next_stage.put(job)
+            del self._active[job.sequence_number]
+
+    def stop(self) -> List[SentenceJob]:
+        """Cancel the workers and return the jobs they had not passed on."""
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        jobs = list(self._active.values())
+        self._active.clear()
+        while not self.queue.empty():
+            jobs.append(self.queue.get_nowait())
+        return jobs
@@ -46,7 +46,9 @@ async def process_single_conversation(
         str: Complete response text
     """
     # Create TTSTaskManager for this conversation
-    tts_manager = TTSTaskManager()
+    tts_manager = TTSTaskManager(
+        ws_protocol=context.ws_protocol, audio_encoder=context.audio_encoder
+    )
     full_response = ""  # Initialize full_response here
 
     try:
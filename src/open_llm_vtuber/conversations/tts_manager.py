@@ -1,35 +1,82 @@
 import asyncio
 import json
 import re
+import time
 import uuid
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, Union
 from loguru import logger
 
 from ..agent.output_types import DisplayText, Actions
 from ..live2d_model import Live2dModel
 from ..tts.tts_interface import TTSInterface
-from ..utils.stream_audio import prepare_audio_payload
+from ..utils.metrics import metrics
+from ..utils.stream_audio import prepare_audio_frame, prepare_audio_payload
+from ..utils.audio_encoder import AudioEncoder
+from ..utils.ws_protocol import PROTOCOL_V1, PROTOCOL_V2
+from .sentence_pipeline import PipelineStage, PipelineTrace, SentenceJob
 from .types import WebSocketSend
 
 
 class TTSTaskManager:
-    """Manages TTS tasks and ensures ordered delivery to frontend while allowing parallel TTS generation"""
-
-    def __init__(self) -> None:
-        self.task_list: List[asyncio.Task] = []
-        self._lock = asyncio.Lock()
-        # Queue to store ordered payloads
-        self._payload_queue: asyncio.Queue[Dict] = asyncio.Queue()
-        # Task to handle sending payloads in order
-        self._sender_task: Optional[asyncio.Task] = None
+    """
+    Runs the sentences of a conversation through a pipeline of stages
+    (translate -> tts -> encode -> send) and delivers them to the frontend in
+    order, while the stages work on different sentences at the same time.
+    """
+
+    # The "agent" entry of the trace is the time the agent took to produce
+    # each sentence (LLM tokens and sentence segmentation)
+    STAGES = ["agent", "translate", "tts", "encode", "send"]
+
+    def __init__(
+        self,
+        tts_concurrency: int = 4,
+        encode_concurrency: int = 2,
+        max_queue_size: int = 8,
+        ws_protocol: int = PROTOCOL_V1,
+        audio_encoder: Optional[AudioEncoder] = None,
+    ) -> None:
+        """
+        Args:
+            tts_concurrency: Number of sentences synthesized at the same time.
+            encode_concurrency: Number of payloads encoded at the same time.
+            max_queue_size: Capacity of the queue in front of each stage.
+            ws_protocol: Protocol version of the client's WebSocket. Version 2
+                clients get the audio as binary frames.
+            audio_encoder: Encoder of the client's session, WAV if None.
+        """
+        self.ws_protocol = ws_protocol
+        self.audio_encoder = audio_encoder
+        # Futures resolved once the sentence has been sent
+        self.task_list: List[asyncio.Future] = []
+        self.trace = PipelineTrace(self.STAGES)
+        self._websocket_send: Optional[WebSocketSend] = None
         # Counter for maintaining order
         self._sequence_counter = 0
         self._next_sequence_to_send = 0
+        self._buffered_jobs: Dict[int, SentenceJob] = {}
+        # The manager is created at the start of a conversation turn
+        self._turn_started_at = time.perf_counter()
+        self._last_sentence_at = self._turn_started_at
+        self._first_audio_sent = False
+
+        self._stages = [
+            PipelineStage("translate", self._translate, self.trace, 1, max_queue_size),
+            PipelineStage(
+                "tts", self._synthesize, self.trace, tts_concurrency, max_queue_size
+            ),
+            PipelineStage(
+                "encode", self._encode, self.trace, encode_concurrency, max_queue_size
+            ),
+            PipelineStage("send", self._send, self.trace, 1, max_queue_size),
+        ]
+        for stage, next_stage in zip(self._stages, self._stages[1:]):
+            stage.next_stage = next_stage
 
     async def speak(
         self,
-        tts_text: str,
+        tts_text: Union[str, Awaitable[str]],
         display_text: DisplayText,
         actions: Optional[Actions],
         live2d_model: Live2dModel,
@@ -37,131 +84,135 @@ class TTSTaskManager:
         websocket_send: WebSocketSend,
     ) -> None:
         """
-        Queue a TTS task while maintaining order of delivery.
+        Queue a sentence while maintaining order of delivery. Waits only while
+        the pipeline is full.
 
         Args:
-            tts_text: Text to synthesize
+            tts_text: Text to synthesize, or an awaitable of it (e.g. a pending
+                translation) that is awaited by the pipeline
             display_text: Text to display in UI
             actions: Live2D model actions
             live2d_model: Live2D model instance
             tts_engine: TTS engine instance
             websocket_send: WebSocket send function
         """
-        if len(re.sub(r'[\s.,!?，。！？\'"』」）】\s]+', "", tts_text)) == 0:
-            logger.debug("Empty TTS text, sending silent display payload")
-            # Get current sequence number for silent payload
-            current_sequence = self._sequence_counter
-            self._sequence_counter += 1
-
-            # Start sender task if not running
-            if not self._sender_task or self._sender_task.done():
-                self._sender_task = asyncio.create_task(
-                    self._process_payload_queue(websocket_send)
-                )
-
-            await self._send_silent_payload(display_text, actions, current_sequence)
-            return
-
-        logger.debug(
-            f"🏃Queuing TTS task for: '''{tts_text}''' (by {display_text.name})"
-        )
-
-        # Get current sequence number
-        current_sequence = self._sequence_counter
-        self._sequence_counter += 1
+        now = time.perf_counter()
+        self.trace.record("agent", busy_ms=(now - self._last_sentence_at) * 1000)
 
-        # Start sender task if not running
-        if not self._sender_task or self._sender_task.done():
-            self._sender_task = asyncio.create_task(
-                self._process_payload_queue(websocket_send)
+        if isinstance(tts_text, str) and self._is_silent(tts_text):
+            logger.debug("Empty TTS text, sending silent display payload")
+            tts_text = None
+        else:
+            logger.debug(
+                f"🏃Queuing TTS task for: '''{display_text.text}''' (by {display_text.name})"
             )
 
-        # Create and queue the TTS task
-        task = asyncio.create_task(
-            self._process_tts(
-                tts_text=tts_text,
-                display_text=display_text,
-                actions=actions,
-                live2d_model=live2d_model,
-                tts_engine=tts_engine,
-                sequence_number=current_sequence,
-            )
+        self._websocket_send = websocket_send
+        job = SentenceJob(
+            sequence_number=self._sequence_counter,
+            tts_text=tts_text,
+            display_text=display_text,
+            actions=actions,
+            tts_engine=tts_engine,
+            done=asyncio.get_running_loop().create_future(),
         )
-        self.task_list.append(task)
+        self._sequence_counter += 1
+        self.task_list.append(job.done)
 
-    async def _process_payload_queue(self, websocket_send: WebSocketSend) -> None:
-        """
-        Process and send payloads in correct order.
-        Runs continuously until all payloads are processed.
-        """
-        buffered_payloads: Dict[int, Dict] = {}
+        await self._stages[0].put(job)
+        # Time spent waiting for a full pipeline is not the agent's
+        self._last_sentence_at = time.perf_counter()
 
-        while True:
-            try:
-                # Get payload from queue
-                payload, sequence_number = await self._payload_queue.get()
-                buffered_payloads[sequence_number] = payload
+    @staticmethod
+    def _is_silent(tts_text: str) -> bool:
+        """Whether the text has nothing to synthesize"""
+        return len(re.sub(r'[\s.,!?，。！？\'"』」）】\s]+', "", tts_text)) == 0
 
-                # Send payloads in order
-                while self._next_sequence_to_send in buffered_payloads:
-                    next_payload = buffered_payloads.pop(self._next_sequence_to_send)
-                    await websocket_send(json.dumps(next_payload))
-                    self._next_sequence_to_send += 1
+    async def _translate(self, job: SentenceJob) -> None:
+        """Wait for the translation of the sentence, if any"""
+        if job.tts_text is None or isinstance(job.tts_text, str):
+            return
+        try:
+            # Shielded, other conversations may wait for the same translation
+            job.tts_text = await asyncio.shield(job.tts_text)
+        except Exception as e:
+            logger.error(f"Error translating sentence: {e}")
+            job.tts_text = None
+            return
+        logger.info(f"🏃 Text after translation: '''{job.tts_text}'''...")
+        if self._is_silent(job.tts_text):
+            job.tts_text = None
 
-                self._payload_queue.task_done()
+    async def _synthesize(self, job: SentenceJob) -> None:
+        """Generate the audio file of the sentence"""
+        if job.tts_text is None:
+            return
+        try:
+            job.audio_path = await self._generate_audio(job.tts_engine, job.tts_text)
+        except Exception as e:
+            logger.error(f"Error generating audio: {e}")
 
-            except asyncio.CancelledError:
-                break
+    async def _encode(self, job: SentenceJob) -> None:
+        """Encode the payload of the sentence, off the event loop"""
+        try:
+            job.message, job.has_audio = await asyncio.to_thread(
+                self._encode_payload, job.audio_path, job.display_text, job.actions
+            )
+        except Exception as e:
+            logger.error(f"Error preparing audio payload: {e}")
+            # Send silent payload for error case
+            job.message, job.has_audio = self._encode_payload(
+                None, job.display_text, job.actions
+            )
+        finally:
+            self._remove_audio_file(job)
 
-    async def _send_silent_payload(
+    def _encode_payload(
         self,
+        audio_path: Optional[str],
         display_text: DisplayText,
         actions: Optional[Actions],
-        sequence_number: int,
-    ) -> None:
-        """Queue a silent audio payload"""
-        audio_payload = prepare_audio_payload(
-            audio_path=None,
+    ) -> Tuple[Union[str, bytes], bool]:
+        if self.ws_protocol == PROTOCOL_V2:
+            return (
+                prepare_audio_frame(
+                    audio_path=audio_path,
+                    display_text=display_text,
+                    actions=actions,
+                    encoder=self.audio_encoder,
+                ),
+                audio_path is not None,
+            )
+        payload: Dict[str, Any] = prepare_audio_payload(
+            audio_path=audio_path,
             display_text=display_text,
             actions=actions,
+            encoder=self.audio_encoder,
         )
-        await self._payload_queue.put((audio_payload, sequence_number))
-
-    async def _process_tts(
-        self,
-        tts_text: str,
-        display_text: DisplayText,
-        actions: Optional[Actions],
-        live2d_model: Live2dModel,
-        tts_engine: TTSInterface,
-        sequence_number: int,
-    ) -> None:
-        """Process TTS generation and queue the result for ordered delivery"""
-        audio_file_path = None
-        try:
-            audio_file_path = await self._generate_audio(tts_engine, tts_text)
-            payload = prepare_audio_payload(
-                audio_path=audio_file_path,
-                display_text=display_text,
-                actions=actions,
-            )
-            # Queue the payload with its sequence number
-            await self._payload_queue.put((payload, sequence_number))
-
-        except Exception as e:
-            logger.error(f"Error preparing audio payload: {e}")
-            # Queue silent payload for error case
-            payload = prepare_audio_payload(
-                audio_path=None,
-                display_text=display_text,
-                actions=actions,
-            )
-            await self._payload_queue.put((payload, sequence_number))
-
-        finally:
-            if audio_file_path:
-                tts_engine.remove_file(audio_file_path)
-                logger.debug("Audio cache file cleaned.")
+        return json.dumps(payload), bool(payload.get("audio"))
+
+    async def _send(self, job: SentenceJob) -> None:
+        """Send the payloads that are next in order"""
+        self._buffered_jobs[job.sequence_number] = job
+        while self._next_sequence_to_send in self._buffered_jobs:
+            next_job = self._buffered_jobs.pop(self._next_sequence_to_send)
+            self._next_sequence_to_send += 1
+            try:
+                await self._websocket_send(next_job.message)
+                if next_job.has_audio and not self._first_audio_sent:
+                    self._record_first_audio()
+            except Exception as e:
+                logger.error(f"Error sending audio payload: {e}")
+            finally:
+                if not next_job.done.done():
+                    next_job.done.set_result(None)
+
+    def _record_first_audio(self) -> None:
+        """Record the time from the start of the turn to the first audio sent"""
+        self._first_audio_sent = True
+        elapsed_ms = (time.perf_counter() - self._turn_started_at) * 1000
+        metrics.observe("conversation.time_to_first_audio_ms", elapsed_ms)
+        logger.info(f"Time to first audio: {elapsed_ms:.0f} ms")
 
     async def _generate_audio(self, tts_engine: TTSInterface, text: str) -> str:
         """Generate audio file from text"""
@@ -171,12 +222,30 @@ class TTSTaskManager:
             file_name_no_ext=f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}",
         )
 
+    @staticmethod
+    def _remove_audio_file(job: SentenceJob) -> None:
+        if job.audio_path:
+            job.tts_engine.remove_file(job.audio_path)
+            job.audio_path = None
+            logger.debug("Audio cache file cleaned.")
+
+    def emit_trace(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Log the stage trace of the turn, if any sentence went through"""
+        if self.trace.empty:
+            return None
+        trace = self.trace.emit()
+        self._last_sentence_at = time.perf_counter()
+        return trace
+
     def clear(self) -> None:
         """Clear all pending tasks and reset state"""
+        for stage in self._stages:
+            for job in stage.stop():
+                self._remove_audio_file(job)
+                job.done.cancel()
+        for job in self._buffered_jobs.values():
+            job.done.cancel()
+        self._buffered_jobs.clear()
         self.task_list.clear()
-        if self._sender_task:
-            self._sender_task.cancel()
         self._sequence_counter = 0
         self._next_sequence_to_send = 0
-        # Create a new queue to clear any pending items
-        self._payload_queue = asyncio.Queue()
@@ -1,11 +1,12 @@
-from typing import List, Dict, Callable, Optional, TypedDict, Awaitable, ClassVar
+from typing import List, Dict, Callable, Optional, TypedDict, Awaitable, ClassVar, Union
 from dataclasses import dataclass, field
 from pydantic import BaseModel
 
 from ..agent.output_types import Actions, DisplayText
 
 # Type definitions
-WebSocketSend = Callable[[str], Awaitable[None]]
+# Takes bytes (binary frames) only on protocol version 2 connections
+WebSocketSend = Callable[[Union[str, bytes]], Awaitable[None]]
 BroadcastFunc = Callable[[List[str], dict, Optional[str]], Awaitable[None]]
 
 
@@ -11,6 +11,7 @@ import sys
 import os
 
 from .live_interface import LivePlatformInterface
+from ..proxy_message_queue import PRIORITY_NORMAL, PRIORITY_SUPERCHAT
 
 # Import the blivedm library
 try:
@@ -180,12 +181,25 @@ class BiliBiliLivePlatform(LivePlatformInterface):
         except Exception as e:
             logger.error(f"Error forwarding danmaku to proxy: {e}")
 
-    async def _send_to_proxy(self, text: str) -> bool:
+    async def _handle_super_chat(self, text: str):
+        """
+        Forward a superchat to VTuber, ahead of the queued danmaku.
+
+        Args:
+            text: The superchat text received from BiliBili
+        """
+        try:
+            await self._send_to_proxy(text, priority=PRIORITY_SUPERCHAT)
+        except Exception as e:
+            logger.error(f"Error forwarding superchat to proxy: {e}")
+
+    async def _send_to_proxy(self, text: str, priority: int = PRIORITY_NORMAL) -> bool:
         """
         Send danmaku text to the proxy.
 
         Args:
             text: The danmaku text to send
+            priority: Priority of the message in the proxy message queue
 
         Returns:
             bool: True if sent successfully
@@ -195,7 +209,7 @@ class BiliBiliLivePlatform(LivePlatformInterface):
             return False
 
         try:
-            message = {"type": "text-input", "text": text}
+            message = {"type": "text-input", "text": text, "priority": priority}
             await self._websocket.send(json.dumps(message))
             logger.info(f"Sent danmaku to VTuber: {text}")
             return True
@@ -281,6 +295,21 @@ class BiliBiliLivePlatform(LivePlatformInterface):
             logger.debug(f"[Room {client.room_id}] {message.uname}: {message.msg}")
             asyncio.create_task(self.platform._handle_danmaku(message.msg))
 
+        def _on_super_chat(
+            self, client: blivedm.BLiveClient, message: web_models.SuperChatMessage
+        ):
+            """
+            Handle superchat message from BiliBili Live.
+
+            Args:
+                client: The BiliBili Live client
+                message: The superchat message
+            """
+            logger.debug(
+                f"[Room {client.room_id}] Superchat ¥{message.price} {message.uname}: {message.message}"
+            )
+            asyncio.create_task(self.platform._handle_super_chat(message.message))
+
         def _on_heartbeat(
             self, client: blivedm.BLiveClient, message: web_models.HeartbeatMessage
         ):
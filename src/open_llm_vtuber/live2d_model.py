@@ -1,4 +1,7 @@
 import json
+import re
+from typing import List, Tuple
+
 import chardet
 from loguru import logger
 
@@ -17,6 +20,7 @@ class Live2dModel:
         model_info (dict): The information of the Live2D model.
         emo_map (dict): The emotion map of the Live2D model.
         emo_str (str): The string representation of the emotion map of the Live2D model.
+        emo_pattern (re.Pattern): Precompiled pattern matching any emotion tag of the emotion map.
     """
 
     model_dict_path: str
@@ -24,6 +28,7 @@ class Live2dModel:
     model_info: dict
     emo_map: dict
     emo_str: str
+    emo_pattern: re.Pattern
 
     def __init__(
         self, live2d_model_name: str, model_dict_path: str = "model_dict.json"
@@ -52,6 +57,14 @@ class Live2dModel:
         # emo_str is a string of the keys in the emoMap dictionary. The keys are enclosed in square brackets.
         # example: `"[fear], [anger], [disgust], [sadness], [joy], [neutral], [surprise]"`
 
+        # One alternation of all emotion tags, so a text is scanned once no matter
+        # how many emotions the model defines. Keys keep their order, so the first
+        # key that matches at a position wins, as before.
+        self.emo_pattern: re.Pattern = re.compile(
+            r"\[(" + "|".join(re.escape(key) for key in self.emo_map) + r")\]",
+            re.IGNORECASE,
+        )
+
     def _load_file_content(self, file_path: str) -> str:
         """Load the content of a file with robust encoding handling."""
         # Try common encodings first
@@ -153,23 +166,12 @@ class Live2dModel:
         Returns:
             list: A list of values of the emotions found in the string. An empty list is returned if no emotions are found.
         """
-
-        expression_list = []
-        str_to_check = str_to_check.lower()
-
-        i = 0
-        while i < len(str_to_check):
-            if str_to_check[i] != "[":
-                i += 1
-                continue
-            for key in self.emo_map.keys():
-                emo_tag = f"[{key}]"
-                if str_to_check[i : i + len(emo_tag)] == emo_tag:
-                    expression_list.append(self.emo_map[key])
-                    i += len(emo_tag) - 1
-                    break
-            i += 1
-        return expression_list
+        if not self.emo_map:
+            return []
+        return [
+            self.emo_map[match.group(1).lower()]
+            for match in self.emo_pattern.finditer(str_to_check)
+        ]
 
     def remove_emotion_keywords(self, target_str: str) -> str:
         """
@@ -181,14 +183,31 @@ class Live2dModel:
         Returns:
             str: The cleaned string with the emotion keywords removed.
         """
+        return self.extract_and_remove_emotion(target_str)[1]
+
+    def extract_and_remove_emotion(self, text: str) -> Tuple[List, str]:
+        """
+        Extract the emotions of the input string and remove the emotion keywords
+        from it in a single pass.
+
+        Parameters:
+            text (str): The string to check for emotions.
+
+        Returns:
+            Tuple[List, str]: The values of the emotions found in the string, and
+            the cleaned string.
+        """
+        if not self.emo_map:
+            return [], text
+
+        expression_list = []
 
-        lower_str = target_str.lower()
+        def collect(match: re.Match) -> str:
+            expression_list.append(self.emo_map[match.group(1).lower()])
+            return ""
 
-        for key in self.emo_map.keys():
-            lower_key = f"[{key}]".lower()
-            while lower_key in lower_str:
-                start_index = lower_str.find(lower_key)
-                end_index = start_index + len(lower_key)
-                target_str = target_str[:start_index] + target_str[end_index:]
-                lower_str = lower_str[:start_index] + lower_str[end_index:]
-        return target_str
+        cleaned = self.emo_pattern.sub(collect, text)
+        # Removing a tag can join the text around it into a new tag, e.g. "[jo[joy]y]"
+        while self.emo_pattern.search(cleaned):
+            cleaned = self.emo_pattern.sub("", cleaned)
+        return expression_list, cleaned
@@ -1,16 +1,51 @@
 import json
-from typing import List, Dict, Any, Optional, Tuple
+import re
+from typing import List, Dict, Any, Optional
 from loguru import logger
 
+# Characters that change the state of the scanner inside an object
+_STRUCTURE_PATTERN = re.compile(r'[{}"]')
+# Characters that end a string, escape the next one, or cannot be in a string
+_STRING_PATTERN = re.compile(r'["\\\x00-\x1f]')
+_NON_SPACE_PATTERN = re.compile(r"\S")
+# Characters that can follow a string in a JSON object
+_AFTER_STRING_CHARS = ":,}]"
 
-class StreamJSONDetector:
-    """Detector for real-time JSON detection in streaming text."""
 
-    def __init__(self):
-        self.buffer = ""  # Store text that has not been fully processed
-        self.potential_jsons = []  # Store possible JSON starting positions
+class StreamJSONDetector:
+    """Detector for real-time JSON detection in streaming text.
+
+    The text is scanned once with a small state machine (brace depth, inside
+    a string, escaped character) that continues where the previous chunk
+    stopped. Braces and quotes inside strings are not counted. A candidate
+    is given up as soon as it cannot be a JSON object: its first key does
+    not start right after the "{" or is not followed by ":", a string is
+    followed by anything else than ":,}]", or contains a raw line break. An
+    unclosed quote in prose thus does not hold back the objects after it
+    beyond the next quote or line break. Text before the current
+    candidate object is dropped, so the buffer never holds more than one
+    unfinished object.
+    """
+
+    def __init__(self, max_object_size: int = 65536):
+        """
+        Args:
+            max_object_size (int): Candidates that grow beyond this many
+                characters without closing are given up.
+        """
+        self.max_object_size = max_object_size
+        self.buffer = ""  # Unconsumed text, starting at the current candidate
         self.completed_jsons = []  # Store completed JSON objects
-        self.processed_ranges = []  # Store processed intervals [start, end]
+        self._restart(0)
+
+    def _restart(self, pos: int) -> None:
+        """Look for the next candidate from the given position."""
+        self._pos = pos  # Next position of the buffer to scan
+        self._depth = 0  # Brace depth of the candidate, 0 if there is none
+        self._in_string = False
+        self._expect_key = False  # Right after a "{", expecting '"' or "}"
+        self._in_key = False  # The current or last string is a key after a "{"
+        self._after_string = False  # Right after a string, checking what follows
 
     def process_chunk(self, chunk: str) -> List[Dict[str, Any]]:
         """Process a single text chunk, return a list of complete JSON objects found in this chunk.
@@ -21,104 +56,122 @@ class StreamJSONDetector:
         Returns:
             List[Dict[str, Any]]: List of complete JSON objects parsed from the current chunk
         """
-        # Add new chunk to buffer
-        old_length = len(self.buffer)
         self.buffer += chunk
+        new_jsons = []
 
-        # Update potential JSON starting positions
-        self._find_potential_starts(old_length)
-
-        # Try to parse potential JSON objects
-        new_jsons = self._try_parse_jsons()
-
-        return new_jsons
-
-    def _find_potential_starts(self, start_from: int) -> None:
-        """Find new potential JSON starting positions in the buffer.
+        while True:
+            if self._depth == 0:
+                start = self.buffer.find("{", self._pos)
+                if start == -1:
+                    # No candidate, nothing to keep
+                    self.buffer = ""
+                    self._pos = 0
+                    break
+                # Drop the text before the candidate
+                self.buffer = self.buffer[start:]
+                self._pos = 1
+                self._depth = 1
+                self._expect_key = True
+
+            end = self._scan()
+            if end is None:
+                if len(self.buffer) > self.max_object_size:
+                    logger.warning(
+                        f"Giving up JSON candidate after {len(self.buffer)} characters"
+                    )
+                    self._restart(1)
+                    continue
+                # Incomplete, wait for more text
+                break
+            if end == -1:
+                # Not a JSON object, look for one after its "{"
+                self._restart(1)
+                continue
 
-        Args:
-            start_from (int): Position to start searching from
-        """
-        for i in range(start_from, len(self.buffer)):
-            if self.buffer[i] == "{" and not self._is_in_processed_range(i):
-                self.potential_jsons.append(i)
+            json_str = self.buffer[:end]
+            try:
+                json_data = json.loads(json_str)
+            except json.JSONDecodeError:
+                logger.warning(
+                    f"JSON structure found but parsing failed: {json_str[:50]}..."
+                )
+                self._restart(1)
+                continue
 
-    def _is_in_processed_range(self, pos: int) -> bool:
-        """Check if a specified position is within a processed range.
+            new_jsons.append(json_data)
+            self.completed_jsons.append(json_data)
+            self.buffer = self.buffer[end:]
+            self._restart(0)
 
-        Args:
-            pos (int): Position to check
-
-        Returns:
-            bool: True if position is within a processed range, otherwise False
-        """
-        for start, end in self.processed_ranges:
-            if start <= pos <= end:
-                return True
-        return False
+        return new_jsons
 
-    def _try_parse_jsons(self) -> List[Dict[str, Any]]:
-        """Try to parse JSON objects from the current buffer.
+    def _scan(self) -> Optional[int]:
+        """Continue scanning the current candidate.
 
         Returns:
-            List[Dict[str, Any]]: List of newly parsed JSON objects
+            Optional[int]: The end (exclusive) of the candidate if it is
+                complete, -1 if it cannot be a JSON object, or None if more
+                text is needed.
         """
-        new_jsons = []
-        remaining_potential = []
-
-        # Sort by starting position, process outermost JSON first
-        self.potential_jsons.sort()
+        buffer = self.buffer
+        pos = self._pos
+
+        while True:
+            if self._in_string:
+                match = _STRING_PATTERN.search(buffer, pos)
+                if match is None:
+                    break
+                char = match.group()
+                if char < " ":
+                    # JSON strings cannot contain raw control characters
+                    return -1
+                if char == "\\":
+                    if match.end() >= len(buffer):
+                        # The escaped character is in the next chunk
+                        self._pos = match.start()
+                        return None
+                    pos = match.end() + 1
+                else:
+                    self._in_string = False
+                    self._after_string = True
+                    pos = match.end()
+                continue
 
-        for start_idx in self.potential_jsons:
-            # Skip if this position is already within a processed range
-            if self._is_in_processed_range(start_idx):
+            if self._expect_key or self._after_string:
+                match = _NON_SPACE_PATTERN.search(buffer, pos)
+                if match is None:
+                    break
+                char = match.group()
+                if self._expect_key:
+                    if char not in '"}':
+                        return -1
+                    self._in_key = char == '"'
+                    self._expect_key = False
+                else:
+                    if char not in (":" if self._in_key else _AFTER_STRING_CHARS):
+                        return -1
+                    self._in_key = False
+                    self._after_string = False
+                pos = match.start()
                 continue
 
-            result, end_idx = self._extract_json(start_idx)
-            if result is not None:
-                new_jsons.append(result)
-                # Mark this range as processed
-                self.processed_ranges.append((start_idx, end_idx))
-                self.completed_jsons.append(result)
+            match = _STRUCTURE_PATTERN.search(buffer, pos)
+            if match is None:
+                break
+            pos = match.end()
+            char = match.group()
+            if char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+                self._expect_key = True
             else:
-                # This JSON may not be complete yet, keep it
-                remaining_potential.append(start_idx)
-
-        self.potential_jsons = remaining_potential
-        return new_jsons
-
-    def _extract_json(self, start_idx: int) -> Tuple[Optional[Dict[str, Any]], int]:
-        """Try to extract a complete JSON object from the given position.
-
-        Args:
-            start_idx (int): Potential starting position of JSON
-
-        Returns:
-            Tuple[Optional[Dict[str, Any]], int]: Parsed JSON object and ending position,
-                                               or (None, -1) if incomplete
-        """
-        stack = 1
-        i = start_idx + 1
-
-        while i < len(self.buffer) and stack > 0:
-            if self.buffer[i] == "{":
-                stack += 1
-            elif self.buffer[i] == "}":
-                stack -= 1
-            i += 1
-
-        # If complete JSON is found
-        if stack == 0:
-            json_str = self.buffer[start_idx:i]
-            try:
-                json_data = json.loads(json_str)
-                return json_data, i - 1
-            except json.JSONDecodeError:
-                logger.warning(
-                    f"JSON structure found but parsing failed: {json_str[:50]}..."
-                )
+                self._depth -= 1
+                if self._depth == 0:
+                    return pos
 
-        return None, -1
+        self._pos = len(buffer)
+        return None
 
     def get_all_jsons(self) -> List[Dict[str, Any]]:
         """Get all JSON objects parsed so far.
@@ -131,9 +184,8 @@ class StreamJSONDetector:
     def reset(self) -> None:
         """Reset detector state, prepare to process a new stream."""
         self.buffer = ""
-        self.potential_jsons = []
         self.completed_jsons = []
-        self.processed_ranges = []
+        self._restart(0)
 
 
 # Usage example
@@ -2,12 +2,13 @@
 
 import shutil
 import json
+from datetime import timedelta
 
 from pathlib import Path
 from typing import Dict, Optional, Union, Any
 from loguru import logger
 
-from .types import MCPServer
+from .types import MCPServer, ToolCachePolicy
 from .utils.path import validate_file
 
 DEFAULT_CONFIG_PATH = "mcp_servers.json"
@@ -80,12 +81,31 @@ class ServerRegistry:
                     )
                     continue
 
+            timeout = server_details.get("timeout", None)
+            if isinstance(timeout, (int, float)):
+                # Seconds in the config file
+                timeout = timedelta(seconds=timeout)
+
+            tool_cache = {}
+            for tool_name, policy in server_details.get("cache", {}).items():
+                try:
+                    tool_cache[tool_name] = ToolCachePolicy(
+                        ttl=float(policy["ttl"]),
+                        max_entries=max(1, int(policy.get("max_entries", 128))),
+                    )
+                except (KeyError, TypeError, ValueError, AttributeError):
+                    logger.warning(
+                        f"MCPSM: Invalid cache policy for tool '{tool_name}' of '{server_name}'. Ignoring."
+                    )
+
             self.servers[server_name] = MCPServer(
                 name=server_name,
                 command=command,
                 args=server_details["args"],
                 env=server_details.get("env", None),
-                timeout=server_details.get("timeout", None),
+                timeout=timeout,
+                max_concurrency=max(1, int(server_details.get("max_concurrency", 4))),
+                tool_cache=tool_cache,
             )
             logger.debug(f"MCPSM: Loaded server: '{server_name}'.")
 
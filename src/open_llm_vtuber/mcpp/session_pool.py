@@ -0,0 +1,309 @@
+"""
+Process-wide pool of MCP server sessions.
+
+Starting an MCP server means spawning a process (uvx, npx, node...) and
+running the MCP handshake, which takes seconds. Instead of every client
+session (and every tool discovery) starting its own copy of each server,
+the pool keeps one long-lived stdio session per configured server and
+multiplexes the calls of all client sessions over it. MCP sessions handle
+concurrent requests, the number of calls in flight per server is capped by
+MCPServer.max_concurrency.
+
+Each session lives in its own task, because the stdio transport has to be
+closed by the task that opened it. A background check pings the running
+servers, restarts those that stopped answering and shuts down the ones that
+have been idle for too long. Servers are started again on their next use.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.shared.exceptions import McpError
+from mcp import types as mcp_types
+from mcp.types import CallToolResult, Tool
+
+from .types import MCPServer
+from ..utils.metrics import metrics
+
+DEFAULT_TIMEOUT = timedelta(seconds=30)
+# Error code of an MCP request that timed out
+REQUEST_TIMEOUT = 408
+
+
+class PooledServer:
+    """A long-lived session with one MCP server."""
+
+    def __init__(self, server: MCPServer):
+        self.server = server
+        self.session: Optional[ClientSession] = None
+        # Tool list of the running session and its fingerprint
+        self.tools: Optional[List[Tool]] = None
+        self.tools_fingerprint: Optional[str] = None
+        # Called when the server announces that its tool list changed
+        self.on_tools_changed: Optional[Callable[[str], None]] = None
+        self.semaphore = asyncio.Semaphore(server.max_concurrency)
+        self.lock = asyncio.Lock()
+        self.in_flight = 0
+        self.last_used = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    @property
+    def timeout(self) -> timedelta:
+        return self.server.timeout or DEFAULT_TIMEOUT
+
+    @property
+    def running(self) -> bool:
+        return (
+            self.session is not None
+            and self._task is not None
+            and not self._task.done()
+        )
+
+    async def get_session(self) -> ClientSession:
+        """Get the session, starting the server if it is not running."""
+        if self.running:
+            return self.session
+        async with self.lock:
+            if not self.running:
+                await self._start()
+            return self.session
+
+    async def _start(self) -> None:
+        logger.info(f"MCPP: Starting server '{self.server.name}'...")
+        ready = asyncio.get_running_loop().create_future()
+        self._stop = asyncio.Event()
+        self._task = asyncio.create_task(self._run(ready))
+        try:
+            self.session = await ready
+        except Exception as e:
+            logger.exception(
+                f"MCPP: Failed to connect to server '{self.server.name}': {e}"
+            )
+            raise RuntimeError(
+                f"MCPP: Failed to connect to server '{self.server.name}'."
+            ) from e
+        metrics.inc("mcp.server_starts")
+        logger.info(f"MCPP: Connected to server '{self.server.name}'.")
+
+    async def _run(self, ready: asyncio.Future) -> None:
+        """Open the session and keep it open until stopped."""
+        server_params = StdioServerParameters(
+            command=self.server.command,
+            args=self.server.args,
+            env=self.server.env,
+        )
+        try:
+            async with stdio_client(server_params) as (read, write):
+                async with ClientSession(
+                    read,
+                    write,
+                    read_timeout_seconds=self.timeout,
+                    message_handler=self._handle_message,
+                ) as session:
+                    await session.initialize()
+                    ready.set_result(session)
+                    await self._stop.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.warning(f"MCPP: Server '{self.server.name}' stopped: {e}")
+        finally:
+            if self._task is asyncio.current_task():
+                self.session = None
+                self.tools = None
+            if not ready.done():
+                ready.set_exception(
+                    RuntimeError(f"Server '{self.server.name}' exited during startup")
+                )
+
+    async def _handle_message(self, message: Any) -> None:
+        """Handle notifications from the server."""
+        if isinstance(message, mcp_types.ServerNotification) and isinstance(
+            message.root, mcp_types.ToolListChangedNotification
+        ):
+            logger.info(f"MCPP: Tool list of server '{self.server.name}' changed.")
+            self.tools = None
+            if self.on_tools_changed:
+                self.on_tools_changed(self.server.name)
+
+    async def list_tools(self, refresh: bool = False) -> List[Tool]:
+        """List the tools, cached for the lifetime of the session."""
+        session = await self.get_session()
+        if self.tools is None or refresh:
+            tools = (await session.list_tools()).tools
+            self.tools = tools
+            self.tools_fingerprint = hashlib.sha256(
+                json.dumps(
+                    [tool.model_dump(mode="json") for tool in tools], sort_keys=True
+                ).encode("utf-8")
+            ).hexdigest()
+        self.last_used = time.monotonic()
+        return self.tools
+
+    async def stop(self) -> None:
+        """Close the session and stop the server process."""
+        task = self._task
+        if task is None:
+            return
+        self._task = None
+        self.session = None
+        self.tools = None
+        if not task.done():
+            self._stop.set()
+            try:
+                await asyncio.wait_for(task, timeout=10)
+            except Exception as e:
+                logger.warning(f"MCPP: Killing server '{self.server.name}': {e}")
+                task.cancel()
+        logger.info(f"MCPP: Stopped server '{self.server.name}'.")
+
+    async def is_healthy(self, timeout: float = 5.0) -> bool:
+        """Whether the server answers a ping."""
+        session = self.session
+        if not self.running or session is None:
+            return False
+        try:
+            await asyncio.wait_for(session.send_ping(), timeout=timeout)
+            return True
+        except Exception as e:
+            logger.warning(
+                f"MCPP: Server '{self.server.name}' failed health check: {e}"
+            )
+            return False
+
+
+class MCPSessionPool:
+    """Hands out the shared session of each configured MCP server."""
+
+    def __init__(
+        self, idle_timeout: float = 600.0, health_check_interval: float = 30.0
+    ):
+        """
+        Args:
+            idle_timeout (float): Seconds without calls after which a server is shut down.
+            health_check_interval (float): Seconds between health checks.
+        """
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self._servers: Dict[str, PooledServer] = {}
+        self._health_task: Optional[asyncio.Task] = None
+        self._tools_changed_listeners: List[Callable[[str], None]] = []
+
+    def add_tools_changed_listener(self, listener: Callable[[str], None]) -> None:
+        """Call `listener(server_name)` when a server's tool list changes."""
+        self._tools_changed_listeners.append(listener)
+
+    def _notify_tools_changed(self, server_name: str) -> None:
+        for listener in self._tools_changed_listeners:
+            listener(server_name)
+
+    def is_running(self, server_name: str) -> bool:
+        pooled = self._servers.get(server_name)
+        return pooled is not None and pooled.running
+
+    def tools_fingerprint(self, server_name: str) -> Optional[str]:
+        """Fingerprint of the last tool list fetched from a server."""
+        pooled = self._servers.get(server_name)
+        return pooled.tools_fingerprint if pooled else None
+
+    async def get(self, server: MCPServer) -> PooledServer:
+        """Get the pooled server for a server configuration."""
+        pooled = self._servers.get(server.name)
+        if pooled is not None and pooled.server != server:
+            # Configuration changed, replace the running server
+            logger.info(f"MCPP: Configuration of server '{server.name}' changed.")
+            await pooled.stop()
+            pooled = None
+        if pooled is None:
+            pooled = self._servers[server.name] = PooledServer(server)
+            pooled.on_tools_changed = self._notify_tools_changed
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.create_task(self._check_servers())
+        return pooled
+
+    async def list_tools(self, server: MCPServer, refresh: bool = False) -> List[Tool]:
+        """List the tools of a server, cached for the lifetime of its session."""
+        pooled = await self.get(server)
+        return await pooled.list_tools(refresh=refresh)
+
+    async def call_tool(
+        self, server: MCPServer, tool_name: str, tool_args: Dict[str, Any]
+    ) -> CallToolResult:
+        """Call a tool, waiting while the server has max_concurrency calls running.
+
+        Raises:
+            TimeoutError: If the call takes longer than the server's timeout.
+        """
+        pooled = await self.get(server)
+        async with pooled.semaphore:
+            session = await pooled.get_session()
+            pooled.in_flight += 1
+            started = time.perf_counter()
+            try:
+                return await asyncio.wait_for(
+                    session.call_tool(tool_name, tool_args),
+                    timeout=pooled.timeout.total_seconds(),
+                )
+            except asyncio.TimeoutError:
+                raise TimeoutError(
+                    f"MCPP: Tool '{tool_name}' on server '{server.name}' timed out after {pooled.timeout.total_seconds():g}s."
+                )
+            except Exception as e:
+                if isinstance(e, McpError) and e.error.code == REQUEST_TIMEOUT:
+                    # The read timeout of the session expired first
+                    raise TimeoutError(
+                        f"MCPP: Tool '{tool_name}' on server '{server.name}' timed out after {pooled.timeout.total_seconds():g}s."
+                    ) from e
+                # The server may have crashed, restart it on next use if so
+                if not await pooled.is_healthy():
+                    await pooled.stop()
+                raise
+            finally:
+                pooled.in_flight -= 1
+                pooled.last_used = time.monotonic()
+                metrics.observe("mcp.call_ms", (time.perf_counter() - started) * 1000)
+
+    async def _check_servers(self) -> None:
+        """Shut down idle servers and restart the ones not answering."""
+        while self._servers:
+            await asyncio.sleep(self.health_check_interval)
+            for pooled in list(self._servers.values()):
+                if not pooled.running or pooled.in_flight:
+                    continue
+                if time.monotonic() - pooled.last_used > self.idle_timeout:
+                    logger.info(f"MCPP: Server '{pooled.server.name}' is idle.")
+                    await pooled.stop()
+                elif not await pooled.is_healthy():
+                    await pooled.stop()
+                    metrics.inc("mcp.server_restarts")
+                    try:
+                        await pooled.get_session()
+                    except RuntimeError:
+                        # Started again on next use
+                        pass
+            metrics.set_gauge(
+                "mcp.running_servers",
+                sum(pooled.running for pooled in self._servers.values()),
+            )
+
+    async def aclose(self) -> None:
+        """Stop all servers."""
+        if self._health_task:
+            self._health_task.cancel()
+            self._health_task = None
+        for pooled in self._servers.values():
+            await pooled.stop()
+        self._servers.clear()
+
+
+# Process-wide pool
+mcp_session_pool = MCPSessionPool()
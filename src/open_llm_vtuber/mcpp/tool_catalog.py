@@ -0,0 +1,173 @@
+"""
+Server-level cache of MCP tool catalogs.
+
+Discovering the tools of the enabled MCP servers and formatting them for the
+LLM APIs and the MCP prompt is the same work for every client session that
+enables the same servers. The cache builds a ToolCatalog once per set of
+enabled servers and hands the same catalog (and its read-only ToolManager) to
+every session.
+
+A catalog remembers the fingerprint of each server's tool list. It is checked
+again in the background when a server announces that its tools changed
+(notifications/tools/list_changed) or when the catalog is older than the
+refresh interval, and rebuilt only if a fingerprint differs. Sessions always
+get the current catalog without waiting for the check.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from loguru import logger
+
+from .session_pool import MCPSessionPool, mcp_session_pool
+from .tool_adapter import ToolAdapter
+from .tool_manager import ToolManager
+from ..utils.metrics import metrics
+
+
+@dataclass(frozen=True)
+class ToolCatalog:
+    """Tools of a set of enabled servers, shared by all sessions enabling them.
+
+    Args:
+        servers (Tuple[str, ...]): The enabled servers, in configuration order.
+        fingerprints (Mapping[str, Optional[str]]): Fingerprint of each server's tool list.
+        mcp_prompt (str): The MCP prompt describing the servers and their tools.
+        tool_manager (ToolManager): Tool manager with the formatted tools.
+    """
+
+    servers: Tuple[str, ...]
+    fingerprints: Mapping[str, Optional[str]]
+    mcp_prompt: str
+    tool_manager: ToolManager
+
+
+class _CatalogEntry:
+    def __init__(self, catalog: ToolCatalog):
+        self.catalog = catalog
+        self.checked_at = time.monotonic()
+        self.stale = False
+        self.refresh_task: Optional[asyncio.Task] = None
+
+
+class ToolCatalogCache:
+    """Builds tool catalogs once and refreshes them in the background."""
+
+    def __init__(
+        self,
+        refresh_interval: float = 300.0,
+        session_pool: MCPSessionPool = mcp_session_pool,
+    ):
+        """
+        Args:
+            refresh_interval (float): Seconds after which a catalog is checked again.
+            session_pool (MCPSessionPool): Pool whose tool list changes invalidate catalogs.
+        """
+        self.refresh_interval = refresh_interval
+        self._session_pool = session_pool
+        self._entries: Dict[FrozenSet[str], _CatalogEntry] = {}
+        self._build_locks: Dict[FrozenSet[str], asyncio.Lock] = {}
+        session_pool.add_tools_changed_listener(self._on_tools_changed)
+
+    async def get(
+        self, tool_adapter: ToolAdapter, enabled_servers: List[str]
+    ) -> ToolCatalog:
+        """Get the catalog of the enabled servers, building it on first use."""
+        key = frozenset(enabled_servers)
+        entry = self._entries.get(key)
+        if entry is None:
+            lock = self._build_locks.setdefault(key, asyncio.Lock())
+            async with lock:
+                entry = self._entries.get(key)
+                if entry is None:
+                    metrics.inc("mcp.catalog_misses")
+                    catalog = await self._build(tool_adapter, enabled_servers)
+                    entry = self._entries[key] = _CatalogEntry(catalog)
+                    # Servers that failed to list their tools are retried
+                    entry.stale = None in catalog.fingerprints.values()
+                    return catalog
+
+        metrics.inc("mcp.catalog_hits")
+        expired = time.monotonic() - entry.checked_at > self.refresh_interval
+        if (entry.stale or expired) and (
+            entry.refresh_task is None or entry.refresh_task.done()
+        ):
+            entry.refresh_task = asyncio.create_task(
+                self._refresh(key, entry, tool_adapter)
+            )
+        return entry.catalog
+
+    async def _build(
+        self, tool_adapter: ToolAdapter, enabled_servers: List[str]
+    ) -> ToolCatalog:
+        started = time.perf_counter()
+        servers_info, formatted_tools = await tool_adapter.get_server_and_tool_info(
+            enabled_servers
+        )
+        mcp_prompt = tool_adapter.construct_mcp_prompt_string(servers_info)
+        openai_tools, claude_tools = tool_adapter.format_tools_for_api(formatted_tools)
+        catalog = ToolCatalog(
+            servers=tuple(enabled_servers),
+            fingerprints=MappingProxyType(
+                {
+                    server_name: self._session_pool.tools_fingerprint(server_name)
+                    for server_name in enabled_servers
+                }
+            ),
+            mcp_prompt=mcp_prompt,
+            tool_manager=ToolManager(
+                formatted_tools_openai=openai_tools,
+                formatted_tools_claude=claude_tools,
+                initial_tools_dict=formatted_tools,
+            ),
+        )
+        metrics.observe("mcp.catalog_build_ms", (time.perf_counter() - started) * 1000)
+        logger.info(
+            f"MCP tool catalog built for {list(enabled_servers)}: {len(formatted_tools)} tools."
+        )
+        return catalog
+
+    async def _refresh(
+        self, key: FrozenSet[str], entry: _CatalogEntry, tool_adapter: ToolAdapter
+    ) -> None:
+        """Rebuild the catalog if the tool list of one of its servers changed."""
+        catalog = entry.catalog
+        try:
+            changed = False
+            for server_name in catalog.servers:
+                server = tool_adapter.server_registery.get_server(server_name)
+                old_fingerprint = catalog.fingerprints.get(server_name)
+                if server is None:
+                    continue
+                # Do not start idle servers just to compare their tools
+                if old_fingerprint and not self._session_pool.is_running(server_name):
+                    continue
+                try:
+                    await self._session_pool.list_tools(server, refresh=True)
+                except Exception as e:
+                    logger.warning(f"MCP tool list of '{server_name}' unavailable: {e}")
+                    continue
+                if self._session_pool.tools_fingerprint(server_name) != old_fingerprint:
+                    changed = True
+            if changed:
+                entry.catalog = await self._build(tool_adapter, list(catalog.servers))
+                metrics.inc("mcp.catalog_rebuilds")
+            entry.stale = None in entry.catalog.fingerprints.values()
+            entry.checked_at = time.monotonic()
+        except Exception as e:
+            logger.warning(f"MCP tool catalog refresh for {sorted(key)} failed: {e}")
+
+    def _on_tools_changed(self, server_name: str) -> None:
+        for key, entry in self._entries.items():
+            if server_name in key:
+                entry.stale = True
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Process-wide cache
+tool_catalogs = ToolCatalogCache()
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import datetime
 from loguru import logger
@@ -6,13 +7,16 @@ from typing import (
     Any,
     List,
     Literal,
+    Optional,
+    Tuple,
     Union,
     AsyncIterator,
 )
 
-from .types import ToolCallObject
+from .types import FormattedTool, ToolCachePolicy, ToolCallObject
 from .mcp_client import MCPClient
 from .tool_manager import ToolManager
+from .tool_result_cache import ToolResultCache, tool_result_cache
 
 
 class ToolExecutor:
@@ -20,9 +24,11 @@ class ToolExecutor:
         self,
         mcp_client: MCPClient,
         tool_manager: ToolManager,
+        result_cache: ToolResultCache = tool_result_cache,
     ):
         self._mcp_client = mcp_client
         self._tool_manager = tool_manager
+        self._result_cache = result_cache
 
     def parse_tool_call(self, call: Union[Dict[str, Any], ToolCallObject]) -> tuple:
         """Parse tool call from different formats.
@@ -153,140 +159,170 @@ class ToolExecutor:
         tool_calls: Union[List[Dict[str, Any]], List[ToolCallObject]],
         caller_mode: Literal["Claude", "OpenAI", "Prompt"],
     ) -> AsyncIterator[Dict[str, Any]]:
-        """Execute tools and yield status updates."""
-        tool_results_for_llm = []
+        """Execute tools concurrently and yield status updates.
+
+        All calls are started at once, the session pool limits the calls per
+        server to MCPServer.max_concurrency. 'running' updates are yielded in call order
+        first, then the result of each call in call order, so the frontend and
+        the LLM see the same order as if the calls ran one by one. Calls still
+        running are cancelled if the caller stops iterating (interrupt).
+        """
+        # Results for the LLM, in call order
+        tool_results_for_llm: List[Optional[Dict[str, Any]]] = []
+        running: List[tuple] = []
 
         logger.info(f"Executing {len(tool_calls)} tool(s) for {caller_mode} caller.")
-        for call in tool_calls:
-            (
-                tool_name,
-                tool_id,
-                tool_input,
-                is_error,
-                result_content,
-                parse_error,
-            ) = self.parse_tool_call(call)
-            
-            logger.info(f"Executing tool: {call}")
-            
-            if parse_error:
-                logger.warning(
-                    f"Skipping tool call due to parsing error: {result_content}"
-                )
-                status_update = {
+        try:
+            for call in tool_calls:
+                (
+                    tool_name,
+                    tool_id,
+                    tool_input,
+                    is_error,
+                    result_content,
+                    parse_error,
+                ) = self.parse_tool_call(call)
+
+                logger.info(f"Executing tool: {call}")
+
+                if parse_error:
+                    logger.warning(
+                        f"Skipping tool call due to parsing error: {result_content}"
+                    )
+                    status_update = {
+                        "type": "tool_call_status",
+                        "tool_id": tool_id
+                        or f"parse_error_{datetime.datetime.now(datetime.timezone.utc).isoformat()}",
+                        "tool_name": tool_name or "Unknown Tool",
+                        "status": "error",
+                        "content": result_content,
+                        "timestamp": datetime.datetime.now(
+                            datetime.timezone.utc
+                        ).isoformat()
+                        + "Z",
+                    }
+                    yield status_update
+                    # Even on parse error, we might need to format a result for the LLM
+                    # Use dummy values or the error message
+                    tool_results_for_llm.append(
+                        self.format_tool_result(
+                            caller_mode,
+                            tool_id
+                            or f"parse_error_{datetime.datetime.now(datetime.timezone.utc).isoformat()}",
+                            result_content,
+                            True,  # is_error
+                        )
+                    )
+                    continue  # Skip execution logic for this call
+
+                # Yield 'running' status before execution
+                yield {
                     "type": "tool_call_status",
-                    "tool_id": tool_id
-                    or f"parse_error_{datetime.datetime.now(datetime.timezone.utc).isoformat()}",
-                    "tool_name": tool_name or "Unknown Tool",
-                    "status": "error",
-                    "content": result_content,
+                    "tool_id": tool_id,
+                    "tool_name": tool_name,
+                    "status": "running",
+                    "content": f"Input: {json.dumps(tool_input)}",
                     "timestamp": datetime.datetime.now(
                         datetime.timezone.utc
                     ).isoformat()
                     + "Z",
                 }
-                yield status_update
-                # Even on parse error, we might need to format a result for the LLM
-                # Use dummy values or the error message
-                formatted_result = self.format_tool_result(
-                     caller_mode,
-                     tool_id or f"parse_error_{datetime.datetime.now(datetime.timezone.utc).isoformat()}",
-                     result_content,
-                     True # is_error
-                 )
-                if formatted_result:
-                    tool_results_for_llm.append(formatted_result)
-                continue # Skip execution logic for this call
-
-            # Yield 'running' status before execution
-            yield {
-                "type": "tool_call_status",
-                "tool_id": tool_id,
-                "tool_name": tool_name,
-                "status": "running",
-                "content": f"Input: {json.dumps(tool_input)}",
-                "timestamp": datetime.datetime.now(
-                    datetime.timezone.utc
-                ).isoformat()
-                + "Z",
-            }
-
-            # Execute the tool
-            (
-                is_error,
-                text_content,
-                metadata,
-                content_items,
-            ) = await self.run_single_tool(tool_name, tool_id, tool_input)
-
-            # Determine content for status update and LLM result format
-            status_content = text_content # Default to text content
-            llm_formatted_content = text_content # Default to text content for LLM
-
-            has_image = False
-            if content_items:
-                image_items = [item for item in content_items if item.get('type') == 'image']
-                if image_items:
-                    has_image = True
-                    num_images = len(image_items)
-                    status_content = f"{text_content}\n[Tool returned {num_images} image(s)]".strip()
-
-                    if caller_mode == "Claude":
-                        # Format for Claude: list of blocks
-                        claude_blocks = []
-                        if text_content:
-                            claude_blocks.append({"type": "text", "text": text_content})
-                        for item in content_items:
-                             if item.get('type') == 'image' and 'data' in item and 'mimeType' in item:
-                                 claude_blocks.append({
-                                     "type": "image",
-                                     "source": {
-                                         "type": "base64",
-                                         "media_type": item['mimeType'],
-                                         "data": item['data'],
-                                     }
-                                 })
-                             # Add other non-text types here
-                        llm_formatted_content = claude_blocks if claude_blocks else "" # Use blocks or empty string
-                    elif caller_mode in ["OpenAI", "Prompt"]:
-                        llm_formatted_content = status_content
-
-            # Prepare and yield tool call status update
-            status_update = {
-                "type": "tool_call_status",
-                "tool_id": tool_id,
-                "tool_name": tool_name,
-                "status": "error" if is_error else "completed",
-                "content": status_content if not is_error else f"Error: {text_content}", # Use descriptive content or error message
-                "timestamp": datetime.datetime.now(
-                    datetime.timezone.utc
-                ).isoformat()
-                + "Z",
-            }
 
-            # For stagehand_navigate tool, include browser view links if available
-            if tool_name == "stagehand_navigate" and not is_error:
-                live_view_data = metadata.get("liveViewData", {})
-                if live_view_data:
-                    logger.info(
-                        f"Found live view data for stagehand_navigate: {live_view_data}"
-                    )
-                    status_update["browser_view"] = live_view_data
-
-            yield status_update
-
-            # Format result for LLM and add to list
-            formatted_result = self.format_tool_result(
-                caller_mode, tool_id, llm_formatted_content, is_error
-            )
-            if formatted_result:
-                tool_results_for_llm.append(formatted_result)
+                task = asyncio.create_task(
+                    self.run_single_tool(tool_name, tool_id, tool_input)
+                )
+                running.append((len(tool_results_for_llm), tool_name, tool_id, task))
+                # Filled in once the call has finished
+                tool_results_for_llm.append(None)
 
+            for index, tool_name, tool_id, task in running:
+                status_update, formatted_result = self._build_result(
+                    caller_mode, tool_name, tool_id, await task
+                )
+                yield status_update
+                tool_results_for_llm[index] = formatted_result
+        finally:
+            for _, tool_name, _, task in running:
+                if not task.done():
+                    logger.info(f"Cancelling tool call '{tool_name}'.")
+                    task.cancel()
+
+        tool_results_for_llm = [
+            result for result in tool_results_for_llm if result is not None
+        ]
         logger.info(
             f"Finished executing tools with {len(tool_results_for_llm)} results."
         )
         yield {"type": "final_tool_results", "results": tool_results_for_llm}
 
+    def _build_result(
+        self,
+        caller_mode: Literal["Claude", "OpenAI", "Prompt"],
+        tool_name: str,
+        tool_id: str,
+        run_result: tuple,
+    ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """Build the status update and the LLM result of a finished tool call."""
+        is_error, text_content, metadata, content_items = run_result
+
+        # Determine content for status update and LLM result format
+        status_content = text_content # Default to text content
+        llm_formatted_content = text_content # Default to text content for LLM
+
+        if content_items:
+            image_items = [item for item in content_items if item.get('type') == 'image']
+            if image_items:
+                num_images = len(image_items)
+                status_content = f"{text_content}\n[Tool returned {num_images} image(s)]".strip()
+
+                if caller_mode == "Claude":
+                    # Format for Claude: list of blocks
+                    claude_blocks = []
+                    if text_content:
+                        claude_blocks.append({"type": "text", "text": text_content})
+                    for item in content_items:
+                         if item.get('type') == 'image' and 'data' in item and 'mimeType' in item:
+                             claude_blocks.append({
+                                 "type": "image",
+                                 "source": {
+                                     "type": "base64",
+                                     "media_type": item['mimeType'],
+                                     "data": item['data'],
+                                 }
+                             })
+                         # Add other non-text types here
+                    llm_formatted_content = claude_blocks if claude_blocks else "" # Use blocks or empty string
+                elif caller_mode in ["OpenAI", "Prompt"]:
+                    llm_formatted_content = status_content
+
+        # Prepare tool call status update
+        status_update = {
+            "type": "tool_call_status",
+            "tool_id": tool_id,
+            "tool_name": tool_name,
+            "status": "error" if is_error else "completed",
+            "content": status_content if not is_error else f"Error: {text_content}", # Use descriptive content or error message
+            "timestamp": datetime.datetime.now(
+                datetime.timezone.utc
+            ).isoformat()
+            + "Z",
+        }
+
+        # For stagehand_navigate tool, include browser view links if available
+        if tool_name == "stagehand_navigate" and not is_error:
+            live_view_data = metadata.get("liveViewData", {})
+            if live_view_data:
+                logger.info(
+                    f"Found live view data for stagehand_navigate: {live_view_data}"
+                )
+                status_update["browser_view"] = live_view_data
+
+        # Format result for LLM
+        formatted_result = self.format_tool_result(
+            caller_mode, tool_id, llm_formatted_content, is_error
+        )
+        return status_update, formatted_result
+
     async def run_single_tool(
         self, tool_name: str, tool_id: str, tool_input: Any
     ) -> tuple[bool, str, Dict[str, Any], List[Dict[str, Any]]]:
@@ -317,45 +353,83 @@ class ToolExecutor:
             content_items = [{"type": "error", "text": text_content}]
             is_error = True
         else:
-            try:
-                result_dict = await self._mcp_client.call_tool(
-                    server_name=tool_info.related_server,
-                    tool_name=tool_name,
-                    tool_args=tool_input,
+            policy = self._cache_policy(tool_info.related_server, tool_name)
+            if policy:
+                return await self._result_cache.get_or_call(
+                    tool_info.related_server,
+                    tool_name,
+                    tool_input,
+                    policy,
+                    lambda: self._call_tool(tool_info, tool_name, tool_input),
                 )
+            return await self._call_tool(tool_info, tool_name, tool_input)
 
-                metadata = result_dict.get("metadata", {})
-                content_items = result_dict.get("content_items", [])
-
-                # Check if the first content item is an error reported by MCPClient
-                if content_items and content_items[0].get("type") == "error":
-                    is_error = True
-                    text_content = content_items[0].get("text", "Unknown error from tool execution.")
-                elif content_items and content_items[0].get("type") == "text":
-                    text_content = content_items[0].get("text", "")
-                # If no text item is first, text_content remains ""
-
-                if not is_error:
-                    logger.info(f"Tool '{tool_name}' executed successfully.")
-                    if content_items:
-                        logger.info(f"Content items from tool '{tool_name}':")
-                        for item in content_items:
-                            item_type = item.get('type', 'unknown')
-                            logger.info(f"  Type: {item_type}")
-                            for key, value in item.items():
-                                 if key != 'type' and key != 'data': # Avoid logging large data
-                                     log_value = f"(length: {len(value)})" if isinstance(value, str) and len(value) > 100 else value
-                                     logger.info(f"    {key}: {log_value}")
-
-            except (ValueError, RuntimeError, ConnectionError) as e:
-                logger.exception(f"Error executing tool '{tool_name}': {e}")
-                text_content = f"Error executing tool '{tool_name}': {e}"
-                content_items = [{"type": "error", "text": text_content}]
-                is_error = True
-            except Exception as e:
-                logger.exception(f"Unexpected error executing tool '{tool_name}': {e}")
-                text_content = f"Unexpected error executing tool '{tool_name}': {e}"
-                content_items = [{"type": "error", "text": text_content}]
+        return is_error, text_content, metadata, content_items
+
+    def _cache_policy(
+        self, server_name: str, tool_name: str
+    ) -> Optional[ToolCachePolicy]:
+        """Result cache policy of a tool, None if its results are not cached."""
+        server = self._mcp_client.server_registery.get_server(server_name)
+        return server.tool_cache.get(tool_name) if server else None
+
+    async def _call_tool(
+        self, tool_info: FormattedTool, tool_name: str, tool_input: Any
+    ) -> tuple[bool, str, Dict[str, Any], List[Dict[str, Any]]]:
+        """Call a tool on its server.
+
+        Returns:
+            tuple: (is_error, text_content, metadata, content_items)
+        """
+        is_error = False
+        text_content = ""
+        metadata = {}
+        content_items = []
+
+        try:
+            result_dict = await self._mcp_client.call_tool(
+                server_name=tool_info.related_server,
+                tool_name=tool_name,
+                tool_args=tool_input,
+            )
+
+            metadata = result_dict.get("metadata", {})
+            content_items = result_dict.get("content_items", [])
+
+            # Check if the first content item is an error reported by MCPClient
+            if content_items and content_items[0].get("type") == "error":
                 is_error = True
+                text_content = content_items[0].get("text", "Unknown error from tool execution.")
+            elif content_items and content_items[0].get("type") == "text":
+                text_content = content_items[0].get("text", "")
+            # If no text item is first, text_content remains ""
+
+            if not is_error:
+                logger.info(f"Tool '{tool_name}' executed successfully.")
+                if content_items:
+                    logger.info(f"Content items from tool '{tool_name}':")
+                    for item in content_items:
+                        item_type = item.get('type', 'unknown')
+                        logger.info(f"  Type: {item_type}")
+                        for key, value in item.items():
+                             if key != 'type' and key != 'data': # Avoid logging large data
+                                 log_value = f"(length: {len(value)})" if isinstance(value, str) and len(value) > 100 else value
+                                 logger.info(f"    {key}: {log_value}")
+
+        except TimeoutError as e:
+            logger.error(f"Error executing tool '{tool_name}': {e}")
+            text_content = f"Error executing tool '{tool_name}': {e}"
+            content_items = [{"type": "error", "text": text_content}]
+            is_error = True
+        except (ValueError, RuntimeError, ConnectionError) as e:
+            logger.exception(f"Error executing tool '{tool_name}': {e}")
+            text_content = f"Error executing tool '{tool_name}': {e}"
+            content_items = [{"type": "error", "text": text_content}]
+            is_error = True
+        except Exception as e:
+            logger.exception(f"Unexpected error executing tool '{tool_name}': {e}")
+            text_content = f"Unexpected error executing tool '{tool_name}': {e}"
+            content_items = [{"type": "error", "text": text_content}]
+            is_error = True
 
         return is_error, text_content, metadata, content_items
@@ -1,12 +1,17 @@
 from loguru import logger
-from typing import Dict, Any, List, Literal
+from types import MappingProxyType
+from typing import Dict, Any, List, Literal, Mapping
 from openai import NOT_GIVEN
 
 from .types import FormattedTool
 
 
 class ToolManager:
-    """Tool Manager for managing pre-formatted tools for different LLM APIs."""
+    """Tool Manager for managing pre-formatted tools for different LLM APIs.
+
+    Instances come from the tool catalog cache and are shared by sessions,
+    they must not be modified.
+    """
 
     def __init__(
         self,
@@ -15,8 +20,11 @@ class ToolManager:
         initial_tools_dict: Dict[str, FormattedTool] = None,
     ) -> None:
         """Initialize the Tool Manager with pre-formatted tool lists."""
-        # Store the raw tool data (optional, for get_tool)
-        self.tools: Dict[str, FormattedTool] = initial_tools_dict or {}
+        # Store the raw tool data (optional, for get_tool). Read-only, the
+        # manager is shared by all sessions enabling the same servers.
+        self.tools: Mapping[str, FormattedTool] = MappingProxyType(
+            dict(initial_tools_dict or {})
+        )
 
         # Store the pre-formatted lists
         self._formatted_tools_openai: List[Dict[str, Any]] = (
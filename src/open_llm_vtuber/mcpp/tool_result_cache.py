@@ -0,0 +1,133 @@
+"""
+Process-wide cache of MCP tool results.
+
+Some tools return the same result for the same arguments for a while (a time
+zone conversion, a web search). During a live stream several sessions often
+ask the same thing within seconds, so results of the tools opted in with a
+ToolCachePolicy (`cache` in mcp_servers.json) are kept for `ttl` seconds,
+keyed by server, tool name and the canonical JSON of the arguments.
+
+Concurrent identical calls share one in-flight request. The request runs in
+its own task, so an interrupted session does not cancel it for the others.
+Error results are never cached.
+"""
+
+import asyncio
+import copy
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from loguru import logger
+
+from .types import ToolCachePolicy
+from ..utils.metrics import metrics
+
+# (is_error, text_content, metadata, content_items), see ToolExecutor.run_single_tool
+ToolResult = Tuple[bool, str, Dict[str, Any], list]
+
+
+class ToolResultCache:
+    """TTL and size bounded cache of tool results with shared in-flight calls."""
+
+    def __init__(self):
+        # One LRU per (server, tool), bounded by the policy of the tool
+        self._entries: Dict[Tuple[str, str], OrderedDict] = {}
+        self._in_flight: Dict[Tuple[str, str, str], asyncio.Task] = {}
+        self._hits: Dict[Tuple[str, str], int] = {}
+        self._lookups: Dict[Tuple[str, str], int] = {}
+
+    @staticmethod
+    def canonical_args(tool_args: Any) -> Optional[str]:
+        """Canonical JSON of the arguments, None if they are not JSON."""
+        try:
+            return json.dumps(
+                tool_args, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+            )
+        except (TypeError, ValueError):
+            return None
+
+    async def get_or_call(
+        self,
+        server_name: str,
+        tool_name: str,
+        tool_args: Any,
+        policy: ToolCachePolicy,
+        call: Callable[[], Awaitable[ToolResult]],
+    ) -> ToolResult:
+        """Return the cached result of the call, or run it once for all callers.
+
+        Args:
+            server_name (str): Server of the tool.
+            tool_name (str): Name of the tool.
+            tool_args (Any): Arguments of the call.
+            policy (ToolCachePolicy): Cache policy of the tool.
+            call (Callable[[], Awaitable[ToolResult]]): Runs the tool call.
+        """
+        args_key = self.canonical_args(tool_args)
+        if args_key is None:
+            return await call()
+
+        tool_key = (server_name, tool_name)
+        entries = self._entries.setdefault(tool_key, OrderedDict())
+        entry = entries.get(args_key)
+        if entry is not None:
+            expires_at, result = entry
+            if expires_at > time.monotonic():
+                entries.move_to_end(args_key)
+                self._record(tool_key, hit=True)
+                logger.debug(f"MCP tool result cache hit: {tool_name} {args_key}")
+                return copy.deepcopy(result)
+            del entries[args_key]
+
+        key = (server_name, tool_name, args_key)
+        task = self._in_flight.get(key)
+        if task is not None:
+            # An identical call is running, wait for its result
+            self._record(tool_key, hit=True)
+            metrics.inc("mcp.cache_joined")
+        else:
+            self._record(tool_key, hit=False)
+            task = self._in_flight[key] = asyncio.create_task(
+                self._fill(key, policy, call)
+            )
+        # Shielded, other callers may wait for the same call
+        return copy.deepcopy(await asyncio.shield(task))
+
+    async def _fill(
+        self,
+        key: Tuple[str, str, str],
+        policy: ToolCachePolicy,
+        call: Callable[[], Awaitable[ToolResult]],
+    ) -> ToolResult:
+        server_name, tool_name, args_key = key
+        try:
+            result = await call()
+        finally:
+            del self._in_flight[key]
+        if not result[0]:
+            entries = self._entries.setdefault((server_name, tool_name), OrderedDict())
+            entries[args_key] = (time.monotonic() + policy.ttl, result)
+            entries.move_to_end(args_key)
+            while len(entries) > policy.max_entries:
+                entries.popitem(last=False)
+        return result
+
+    def _record(self, tool_key: Tuple[str, str], hit: bool) -> None:
+        self._lookups[tool_key] = self._lookups.get(tool_key, 0) + 1
+        if hit:
+            self._hits[tool_key] = self._hits.get(tool_key, 0) + 1
+        metrics.inc("mcp.cache_hits" if hit else "mcp.cache_misses")
+        server_name, tool_name = tool_key
+        metrics.set_gauge(
+            f"mcp.cache_hit_rate.{server_name}.{tool_name}",
+            self._hits.get(tool_key, 0) / self._lookups[tool_key],
+        )
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Process-wide cache
+tool_result_cache = ToolResultCache()
@@ -4,6 +4,19 @@ from typing import Dict, List, Optional, Any
 from pathlib import Path
 
 
+@dataclass(frozen=True)
+class ToolCachePolicy:
+    """Class representing the result cache policy of an idempotent tool
+
+    Args:
+        ttl (float): Seconds a result is reused for the same arguments.
+        max_entries (int, optional): Maximum number of cached argument sets. Defaults to 128.
+    """
+
+    ttl: float
+    max_entries: int = 128
+
+
 @dataclass
 class MCPServer:
     """Class representing a MCP Server
@@ -13,7 +26,9 @@ class MCPServer:
         command (str): Command to run the server.
         args (List[str], optional): Arguments for the command. Defaults to an empty list.
         env (Optional[Dict[str, str]], optional): Environment variables for the command. Defaults to None.
-        timeout (Optional[timedelta], optional): Timeout for the command. Defaults to 10 seconds.
+        timeout (Optional[timedelta], optional): Timeout for reads and for each tool call. Defaults to 30 seconds.
+        max_concurrency (int, optional): Maximum number of tool calls running on the server at the same time. Defaults to 4.
+        tool_cache (Dict[str, ToolCachePolicy], optional): Result cache policy of the tools whose results may be reused. Defaults to no caching.
     """
 
     name: str
@@ -22,6 +37,8 @@ class MCPServer:
     env: Optional[Dict[str, str]] = None
     timeout: Optional[timedelta] = timedelta(seconds=30)
     description: str = "No description available."
+    max_concurrency: int = 4
+    tool_cache: Dict[str, ToolCachePolicy] = field(default_factory=dict)
 
 
 @dataclass
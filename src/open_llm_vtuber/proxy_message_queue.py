@@ -1,23 +1,64 @@
 import asyncio
+import time
 from typing import Dict, Optional, Deque, Any, Callable
 from collections import deque
 from loguru import logger
 
+from .utils.metrics import metrics
+
+# Priorities of the queued messages, read from their "priority" field.
+# Messages of a higher priority are forwarded first.
+PRIORITY_NORMAL = 0
+PRIORITY_SUPERCHAT = 10
+
+OVERFLOW_POLICIES = ("drop", "merge")
+
+
+class _QueuedMessage:
+    __slots__ = ("message", "sender_id", "priority", "enqueued_at")
+
+    def __init__(self, message: Dict, sender_id: Optional[str], priority: int):
+        self.message = message
+        self.sender_id = sender_id
+        self.priority = priority
+        self.enqueued_at = time.monotonic()
+
 
 class ProxyMessageQueue:
     """
     Manages message queuing and consumption for the proxy handler.
     Implements a producer-consumer pattern with conversation state awareness.
+
+    The consumer waits for an event set when a message is queued or the
+    conversation ends, and forwards the next message, highest priority first
+    (e.g. BiliBili superchats before danmaku). When the queue is full, the
+    "drop" policy drops the oldest message of the lowest priority, and the
+    "merge" policy appends the text of a new message to the last queued one
+    of the same priority and sender (dropping when there is none).
     """
 
-    def __init__(self):
-        """Initialize the message queue manager"""
-        self.message_queue: Deque[Dict] = deque()
+    def __init__(self, max_messages: int = 50, overflow_policy: str = "drop"):
+        """
+        Initialize the message queue manager
+
+        Args:
+            max_messages: Capacity of the queue
+            overflow_policy: "drop" or "merge", see the class docstring
+        """
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        if max_messages < 1:
+            raise ValueError(f"max_messages must be at least 1, got {max_messages}")
+        self.max_messages = max_messages
+        self.overflow_policy = overflow_policy
+        # priority -> messages of that priority, oldest first
+        self._queues: Dict[int, Deque[_QueuedMessage]] = {}
+        self._length = 0
         self._conversation_active = False
-        self.lock = asyncio.Lock()
+        self._conversation_started_at: Optional[float] = None
+        self._wakeup = asyncio.Event()
         self._consumer_task = None
         self._forward_func = None
-        self._running = False
 
     def initialize(self, forward_func: Callable[[Dict, Optional[str]], Any]):
         """
@@ -34,19 +75,91 @@ class ProxyMessageQueue:
         Add a message to the queue.
 
         Args:
-            message: The message to queue
+            message: The message to queue, with an optional "priority" field
             sender_id: Optional ID of the client that sent the message
         """
-        # Store the message along with its sender ID
-        queue_item = {"message": message, "sender_id": sender_id}
+        try:
+            priority = int(message.get("priority", PRIORITY_NORMAL))
+        except (TypeError, ValueError):
+            priority = PRIORITY_NORMAL
         logger.info(
-            f"Queuing message: {message.get('text', '')} (active conversation: {self._conversation_active})"
+            f"Queuing message: {message.get('text', '')} (priority: {priority}, active conversation: {self._conversation_active})"
         )
-        self.message_queue.append(queue_item)
+        item = _QueuedMessage(message, sender_id, priority)
+        if self._length >= self.max_messages and not self._make_room(item):
+            self._update_length_gauge()
+            return
+        self._queues.setdefault(priority, deque()).append(item)
+        self._length += 1
+        self._update_length_gauge()
+        self._wakeup.set()
 
         # Start consumer if needed
         self._ensure_consumer_running()
 
+    def _make_room(self, item: _QueuedMessage) -> bool:
+        """
+        Handle a message arriving at a full queue.
+
+        Returns:
+            bool: True if the message still has to be queued
+        """
+        if self.overflow_policy == "merge":
+            target = self._merge_target(item)
+            if target is not None:
+                self._merge(target, item)
+                metrics.inc("proxy_queue.merged")
+                return False
+
+        lowest = min(self._queues, default=None)
+        if lowest is None or item.priority < lowest:
+            logger.warning(
+                f"Message queue full, dropping new message: {item.message.get('text', '')}"
+            )
+            metrics.inc("proxy_queue.dropped")
+            return False
+        dropped = self._pop_from(lowest)
+        logger.warning(
+            f"Message queue full, dropping message: {dropped.message.get('text', '')}"
+        )
+        metrics.inc("proxy_queue.dropped")
+        return True
+
+    def _merge_target(self, item: _QueuedMessage) -> Optional[_QueuedMessage]:
+        """Last queued message the new one can be merged into, if any."""
+        queue = self._queues.get(item.priority)
+        if not queue:
+            return None
+        last = queue[-1]
+        same_type = last.message.get("type") == item.message.get("type")
+        if last.sender_id != item.sender_id or not same_type:
+            return None
+        return last
+
+    @staticmethod
+    def _merge(target: _QueuedMessage, item: _QueuedMessage) -> None:
+        """Append the text (and images) of a message to a queued one."""
+        merged = dict(target.message)
+        texts = [merged.get("text", ""), item.message.get("text", "")]
+        merged["text"] = "\n".join(text for text in texts if text)
+        if item.message.get("images"):
+            merged["images"] = list(merged.get("images") or []) + list(
+                item.message["images"]
+            )
+        # The merged message keeps the enqueue time of its first part
+        target.message = merged
+
+    def _pop_from(self, priority: int) -> _QueuedMessage:
+        queue = self._queues[priority]
+        item = queue.popleft()
+        if not queue:
+            del self._queues[priority]
+        self._length -= 1
+        return item
+
+    def _update_length_gauge(self) -> None:
+        metrics.set_gauge("proxy_queue.length", self._length)
+
     @property
     def conversation_active(self) -> bool:
         """Get the conversation active state"""
@@ -63,9 +176,16 @@ class ProxyMessageQueue:
         if self._conversation_active != active:
             logger.debug(f"Setting conversation active state to: {active}")
             self._conversation_active = active
+            if not active and self._conversation_started_at is not None:
+                metrics.observe(
+                    "proxy_queue.conversation_ms",
+                    (time.monotonic() - self._conversation_started_at) * 1000,
+                )
+                self._conversation_started_at = None
 
-            # If conversation becomes inactive, make sure consumer is running to process any queued messages
+            # Wake the consumer up to forward the next queued message
             if not active and self.has_pending_messages():
+                self._wakeup.set()
                 self._ensure_consumer_running()
 
     def has_pending_messages(self) -> bool:
@@ -75,7 +195,7 @@ class ProxyMessageQueue:
         Returns:
             bool: True if there are messages to process, False otherwise
         """
-        return len(self.message_queue) > 0
+        return self._length > 0
 
     def _ensure_consumer_running(self):
         """Ensure the consumer task is running if needed"""
@@ -84,51 +204,41 @@ class ProxyMessageQueue:
             return
 
         if self._consumer_task is None or self._consumer_task.done():
-            self._running = True
             self._consumer_task = asyncio.create_task(self._consume_loop())
             logger.debug("Started message consumer task")
 
     async def _consume_loop(self):
-        """Background task that consumes messages based on conversation state"""
+        """Background task that forwards the next message whenever no conversation is active"""
         try:
-            while self._running:
-                # Wait a short time to prevent CPU hogging
-                await asyncio.sleep(0.1)
-
-                # Try to consume a message if appropriate
-                async with self.lock:
-                    if not self._conversation_active and self.has_pending_messages():
-                        # Get next message
-                        queue_item = self.message_queue.popleft()
-                        message = queue_item["message"]
-                        sender_id = queue_item["sender_id"]
-
-                        logger.info(
-                            f"Consumer processing message: {message.get('text', '')}"
-                        )
-
-                        # Set active before forwarding to prevent race conditions
-                        self._conversation_active = True
-
-                        # Forward the message outside the lock to prevent deadlocks
-                        asyncio.create_task(self._forward_message(message, sender_id))
-
-                # If queue is empty and we've been idle for a while, we can pause the consumer
-                if not self.has_pending_messages() and not self._conversation_active:
-                    await asyncio.sleep(1)  # Wait a bit longer before deciding to stop
-                    if (
-                        not self.has_pending_messages()
-                        and not self._conversation_active
-                    ):
-                        logger.debug(
-                            "No more pending messages and no active conversation, pausing consumer"
-                        )
-                        break
+            while True:
+                # Sleep until a message is queued or the conversation ends
+                while self._conversation_active or not self.has_pending_messages():
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+
+                queue_item = self._pop_from(max(self._queues))
+                self._update_length_gauge()
+                wait_ms = (time.monotonic() - queue_item.enqueued_at) * 1000
+                metrics.observe("proxy_queue.wait_ms", wait_ms)
+                message = queue_item.message
+
+                logger.info(
+                    f"Consumer processing message: {message.get('text', '')} (waited {wait_ms:.0f} ms)"
+                )
+
+                # Set active before forwarding to prevent race conditions
+                self._conversation_active = True
+                self._conversation_started_at = time.monotonic()
+
+                asyncio.create_task(
+                    self._forward_message(message, queue_item.sender_id)
+                )
 
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             logger.error(f"Error in message consumer loop: {e}")
         finally:
-            self._running = False
             logger.debug("Message consumer task ended")
 
     async def _forward_message(self, message: Dict, sender_id: Optional[str] = None):
@@ -150,15 +260,16 @@ class ProxyMessageQueue:
         except Exception as e:
             logger.error(f"Error forwarding message: {e}")
             # If forwarding fails, mark conversation as inactive to allow next message
-            self._conversation_active = False
+            self.conversation_active = False
 
     def stop(self):
         """Stop the consumer task"""
-        self._running = False
         if self._consumer_task and not self._consumer_task.done():
             self._consumer_task.cancel()
 
     def clear(self):
         """Clear all pending messages"""
-        self.message_queue.clear()
+        self._queues.clear()
+        self._length = 0
+        self._update_length_gauge()
         logger.info("Message queue cleared")
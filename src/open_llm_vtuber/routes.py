@@ -1,5 +1,6 @@
 import os
 import json
+from typing import Optional
 from uuid import uuid4
 import numpy as np
 from datetime import datetime
@@ -10,27 +11,51 @@ from loguru import logger
 from .service_context import ServiceContext
 from .websocket_handler import WebSocketHandler
 from .proxy_handler import ProxyHandler
-
-
-def init_client_ws_route(default_context_cache: ServiceContext) -> APIRouter:
+from .utils.metrics import metrics
+from .utils.client_websocket import ClientWebSocket
+from .utils.ws_protocol import negotiate_protocol
+from .workers.bus import MessageBus
+from .workers.router import verified_client_uid
+
+
+def init_client_ws_route(
+    default_context_cache: ServiceContext,
+    bus: MessageBus,
+    worker_id: Optional[int] = None,
+    token: Optional[bytes] = None,
+) -> APIRouter:
     """
     Create and return API routes for handling the `/client-ws` WebSocket connections.
 
     Args:
         default_context_cache: Default service context cache for new sessions.
+        bus: Message bus shared with the other workers.
+        worker_id: Id of the worker in the multi-worker mode, None otherwise.
+        token: Shared token of the processes in the multi-worker mode, checks
+            the client_uids assigned by the sticky router.
 
     Returns:
         APIRouter: Configured router with WebSocket endpoint.
     """
 
     router = APIRouter()
-    ws_handler = WebSocketHandler(default_context_cache)
+    ws_handler = WebSocketHandler(default_context_cache, bus, worker_id or 0)
 
     @router.websocket("/client-ws")
     async def websocket_endpoint(websocket: WebSocket):
         """WebSocket endpoint for client connections"""
-        await websocket.accept()
-        client_uid = str(uuid4())
+        protocol_version, subprotocol = negotiate_protocol(websocket)
+        await websocket.accept(subprotocol=subprotocol)
+        websocket = ClientWebSocket(
+            websocket,
+            protocol_version,
+            **default_context_cache.system_config.send_queue.model_dump(),
+        )
+        client_uid = None
+        if token is not None:
+            # Assigned by the sticky router, which routed the client by it
+            client_uid = verified_client_uid(websocket.query_params, token)
+        client_uid = client_uid or str(uuid4())
 
         try:
             await ws_handler.handle_new_connection(websocket, client_uid)
@@ -41,22 +66,25 @@ def init_client_ws_route(default_context_cache: ServiceContext) -> APIRouter:
             logger.error(f"Error in WebSocket connection: {e}")
             await ws_handler.handle_disconnect(client_uid)
             raise
+        finally:
+            websocket.send_queue.close()
 
     return router
 
 
-def init_proxy_route(server_url: str) -> APIRouter:
+def init_proxy_route(server_url: str, **message_queue_settings) -> APIRouter:
     """
     Create and return API routes for handling proxy connections.
 
     Args:
         server_url: The WebSocket URL of the actual server
+        **message_queue_settings: Settings of the proxy message queue
 
     Returns:
         APIRouter: Configured router with proxy WebSocket endpoint
     """
     router = APIRouter()
-    proxy_handler = ProxyHandler(server_url)
+    proxy_handler = ProxyHandler(server_url, **message_queue_settings)
 
     @router.websocket("/proxy-ws")
     async def proxy_endpoint(websocket: WebSocket):
@@ -93,6 +121,11 @@ def init_webtool_routes(default_context_cache: ServiceContext) -> APIRouter:
         """Redirect /web_tool to /web_tool/index.html"""
         return Response(status_code=302, headers={"Location": "/web-tool/index.html"})
 
+    @router.get("/metrics")
+    async def get_metrics():
+        """Get a snapshot of the in-process metrics"""
+        return JSONResponse(metrics.snapshot())
+
     @router.get("/live2d-models/info")
     async def get_live2d_folder_info():
         """Get information about available Live2D models"""
@@ -6,8 +6,10 @@ the WebSocket connections, serves static files, and manages the web tool.
 It uses FastAPI for the server and Starlette for static file serving.
 """
 
+import asyncio
 import os
 import shutil
+from typing import Optional
 
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
@@ -17,6 +19,10 @@ from starlette.staticfiles import StaticFiles as StarletteStaticFiles
 from .routes import init_client_ws_route, init_webtool_routes, init_proxy_route
 from .service_context import ServiceContext
 from .config_manager.utils import Config
+from .utils.http_client import http_clients
+from .mcpp.session_pool import mcp_session_pool
+from .utils.engine_registry import engine_registry
+from .workers.bus import InProcessBus, MessageBus
 
 
 # Create a custom StaticFiles class that adds CORS headers
@@ -65,15 +71,38 @@ class WebSocketServer:
         default_context_cache (ServiceContext, optional):
             Pre‑initialized service context for sessions' service context to reference to.
             **If omitted, `initialize()` method needs to be called to load service context.**
+        bus (MessageBus, optional): Message bus shared with the other workers
+            in the multi-worker mode. Defaults to an InProcessBus.
+        worker_id (int, optional): Id of the worker in the multi-worker mode.
+        token (bytes, optional): Shared token of the processes in the
+            multi-worker mode, checks the client_uids assigned by the router.
 
     Notes:
         - If default_context_cache is omitted, call `await initialize()` to load service context cache.
         - Use `clean_cache()` to clear and recreate the local cache directory.
     """
 
-    def __init__(self, config: Config, default_context_cache: ServiceContext = None):
+    def __init__(
+        self,
+        config: Config,
+        default_context_cache: ServiceContext = None,
+        bus: Optional[MessageBus] = None,
+        worker_id: Optional[int] = None,
+        token: Optional[bytes] = None,
+    ):
         self.app = FastAPI(title="Open-LLM-VTuber Server")  # Added title for clarity
         self.config = config
+        self.bus = bus or InProcessBus()
+        self.app.add_event_handler("startup", self.bus.start)
+        self.app.add_event_handler("shutdown", self.bus.aclose)
+        http_clients.configure(**config.system_config.http_client.model_dump())
+        self.app.add_event_handler("shutdown", http_clients.aclose)
+        self.app.add_event_handler("shutdown", mcp_session_pool.aclose)
+        engine_registry.configure(
+            memory_budget_mb=config.system_config.engine_registry.memory_budget_mb
+        )
+        self.app.add_event_handler("startup", self._start_engine_preload)
+        self._engine_preload_task = None
         self.default_context_cache = (
             default_context_cache or ServiceContext()
         )  # Use provided context or initialize a new empty one waiting to be loaded
@@ -91,7 +120,12 @@ class WebSocketServer:
         # Include routes, passing the context instance
         # The context will be populated during the initialize step
         self.app.include_router(
-            init_client_ws_route(default_context_cache=self.default_context_cache),
+            init_client_ws_route(
+                default_context_cache=self.default_context_cache,
+                bus=self.bus,
+                worker_id=worker_id,
+                token=token,
+            ),
         )
         self.app.include_router(
             init_webtool_routes(default_context_cache=self.default_context_cache),
@@ -105,7 +139,10 @@ class WebSocketServer:
             port = system_config.port
             server_url = f"ws://{host}:{port}/client-ws"
             self.app.include_router(
-                init_proxy_route(server_url=server_url),
+                init_proxy_route(
+                    server_url=server_url,
+                    **system_config.proxy_queue.model_dump(),
+                ),
             )
 
         # Mount cache directory first (to ensure audio file access)
@@ -148,6 +185,14 @@ class WebSocketServer:
             name="frontend",
         )
 
+    async def _start_engine_preload(self):
+        """Load the engines of the warm characters in the background."""
+        warm_characters = self.config.system_config.engine_registry.warm_characters
+        if warm_characters:
+            self._engine_preload_task = asyncio.create_task(
+                self.default_context_cache.preload_warm_engines(warm_characters)
+            )
+
     async def initialize(self):
         """Asynchronously load the service context from config.
         Calling this function is needed if default_context_cache was not provided to the constructor."""
@@ -1,6 +1,6 @@
 import os
 import json
-from typing import Callable
+from typing import Any, Callable, Collection, Dict, List, Optional, Tuple
 from loguru import logger
 from fastapi import WebSocket
 
@@ -18,12 +18,16 @@ from .mcpp.mcp_client import MCPClient
 from .mcpp.tool_executor import ToolExecutor
 from .mcpp.json_detector import StreamJSONDetector
 from .mcpp.tool_adapter import ToolAdapter
+from .mcpp.tool_catalog import tool_catalogs
 
 from .asr.asr_factory import ASRFactory
 from .tts.tts_factory import TTSFactory
 from .vad.vad_factory import VADFactory
 from .agent.agent_factory import AgentFactory
 from .translate.translate_factory import TranslateFactory
+from .utils.engine_registry import engine_registry
+from .utils.audio_encoder import AudioEncoder
+from .utils.ws_protocol import PROTOCOL_V1
 
 from .config_manager import (
     Config,
@@ -38,6 +42,49 @@ from .config_manager import (
     validate_config,
 )
 
+# (engine type, model, config, factory) of an engine in the engine registry
+EngineSpec = Tuple[str, str, Dict[str, Any], Callable[..., Any]]
+
+
+def _create_translator(provider: str, **kwargs) -> TranslateInterface:
+    return TranslateFactory.get_translator(provider, kwargs)
+
+
+def _asr_spec(asr_config: ASRConfig) -> EngineSpec:
+    return (
+        "asr",
+        asr_config.asr_model,
+        getattr(asr_config, asr_config.asr_model).model_dump(),
+        ASRFactory.get_asr_system,
+    )
+
+
+def _tts_spec(tts_config: TTSConfig) -> EngineSpec:
+    return (
+        "tts",
+        tts_config.tts_model,
+        getattr(tts_config, tts_config.tts_model.lower()).model_dump(),
+        TTSFactory.get_tts_engine,
+    )
+
+
+def _vad_spec(vad_config: VADConfig) -> EngineSpec:
+    return (
+        "vad",
+        vad_config.vad_model,
+        getattr(vad_config, vad_config.vad_model.lower()).model_dump(),
+        VADFactory.get_vad_engine,
+    )
+
+
+def _translate_spec(translator_config: TranslatorConfig) -> EngineSpec:
+    return (
+        "translate",
+        translator_config.translate_provider,
+        getattr(translator_config, translator_config.translate_provider).model_dump(),
+        _create_translator,
+    )
+
 
 class ServiceContext:
     """Initializes, stores, and updates the asr, tts, and llm instances and other
@@ -47,6 +94,9 @@ class ServiceContext:
         self.config: Config = None
         self.system_config: SystemConfig = None
         self.character_config: CharacterConfig = None
+        # True while the configs are the default context's, shared with other
+        # sessions. They must not be modified until copied (copy-on-write).
+        self._config_shared: bool = False
 
         self.live2d_model: Live2dModel = None
         self.asr_engine: ASRInterface = None
@@ -72,6 +122,10 @@ class ServiceContext:
         
         self.send_text: Callable = None
         self.client_uid: str = None
+        # Protocol version negotiated by the client's WebSocket
+        self.ws_protocol: int = PROTOCOL_V1
+        # Encoder of the audio sent to the client, set from the system config
+        self.audio_encoder: AudioEncoder = AudioEncoder()
 
     def __str__(self):
         return (
@@ -99,6 +153,10 @@ class ServiceContext:
             f"Initializing MCP components: use_mcpp={use_mcpp}, enabled_servers={enabled_servers}"
         )
 
+        # The registry of the default context is shared, mcp_servers.json is
+        # read only once
+        shared_registery = self.mcp_server_registery
+
         # Reset MCP components first
         self.mcp_server_registery = None
         self.tool_manager = None
@@ -109,7 +167,7 @@ class ServiceContext:
 
         if use_mcpp and enabled_servers:
             # 1. Initialize ServerRegistry
-            self.mcp_server_registery = ServerRegistry()
+            self.mcp_server_registery = shared_registery or ServerRegistry()
             logger.info("ServerRegistry initialized or referenced.")
 
             # 2. Use ToolAdapter to get the MCP prompt and tools
@@ -119,31 +177,17 @@ class ServiceContext:
                 return # Exit if ToolAdapter is mandatory and not initialized
 
             try:
-                (
-                    mcp_prompt_string,
-                    openai_tools,
-                    claude_tools,
-                ) = await self.tool_adapter.get_tools(enabled_servers)
-                # Store the generated prompt string
-                self.mcp_prompt = mcp_prompt_string
+                # Shared by all sessions enabling the same servers
+                catalog = await tool_catalogs.get(self.tool_adapter, enabled_servers)
+                self.mcp_prompt = catalog.mcp_prompt
+                self.tool_manager = catalog.tool_manager
                 logger.info(
-                    f"Dynamically generated MCP prompt string (length: {len(self.mcp_prompt)})."
+                    f"MCP prompt string from tool catalog (length: {len(self.mcp_prompt)})."
                 )
                 logger.info(
-                    f"Dynamically formatted tools - OpenAI: {len(openai_tools)}, Claude: {len(claude_tools)}."
-                )
-
-                # 3. Initialize ToolManager with the fetched formatted tools
-               
-                _, raw_tools_dict = await self.tool_adapter.get_server_and_tool_info(
-                    enabled_servers
-                )
-                self.tool_manager = ToolManager(
-                    formatted_tools_openai=openai_tools,
-                    formatted_tools_claude=claude_tools,
-                    initial_tools_dict=raw_tools_dict,
+                    f"Formatted tools - OpenAI: {len(self.tool_manager.get_formatted_tools('OpenAI'))}, "
+                    f"Claude: {len(self.tool_manager.get_formatted_tools('Claude'))}."
                 )
-                logger.info("ToolManager initialized with dynamically fetched tools.")
 
             except Exception as e:
                 logger.error(
@@ -193,8 +237,27 @@ class ServiceContext:
             self.mcp_client = None
         if self.agent_engine and hasattr(self.agent_engine, "close"):
             await self.agent_engine.close()  # Ensure agent resources are also closed
+        # The engines are shared, the registry unloads them when idle
+        for engine in self._registered_engines():
+            engine_registry.release(engine)
+        self.asr_engine = None
+        self.tts_engine = None
+        self.vad_engine = None
+        self.translate_engine = None
         logger.info("ServiceContext closed.")
 
+    def _registered_engines(self) -> List[Any]:
+        return [
+            engine
+            for engine in (
+                self.asr_engine,
+                self.tts_engine,
+                self.vad_engine,
+                self.translate_engine,
+            )
+            if engine is not None
+        ]
+
     async def load_cache(
         self,
         config: Config,
@@ -223,12 +286,16 @@ class ServiceContext:
         self.config = config
         self.system_config = system_config
         self.character_config = character_config
+        self._config_shared = True
+        self.init_audio_encoder()
         self.live2d_model = live2d_model
         self.asr_engine = asr_engine
         self.tts_engine = tts_engine
         self.vad_engine = vad_engine
         self.agent_engine = agent_engine
         self.translate_engine = translate_engine
+        for engine in self._registered_engines():
+            engine_registry.retain(engine)
         # Load potentially shared components by reference
         self.mcp_server_registery = mcp_server_registery
         self.tool_adapter = tool_adapter
@@ -238,7 +305,9 @@ class ServiceContext:
         # Initialize session-specific MCP components
         await self._init_mcp_components(self.character_config.agent_config.agent_settings.basic_memory_agent.use_mcpp, self.character_config.agent_config.agent_settings.basic_memory_agent.mcp_enabled_servers)
 
-        logger.debug(f"Loaded service context with cache: {character_config}")
+        logger.debug(
+            f"Loaded service context with cache: {character_config.conf_name}"
+        )
 
     async def load_from_config(self, config: Config) -> None:
         """
@@ -248,11 +317,15 @@ class ServiceContext:
         Parameters:
         - config (Dict): The configuration dictionary.
         """
+        # The init_* methods below update the current character config
+        self._materialize_config()
+
         if not self.config:
             self.config = config
 
         if not self.system_config:
             self.system_config = config.system_config
+            self.init_audio_encoder()
 
         if not self.character_config:
             self.character_config = config.character_config
@@ -263,13 +336,13 @@ class ServiceContext:
         self.init_live2d(config.character_config.live2d_model_name)
 
         # init asr from character config
-        self.init_asr(config.character_config.asr_config)
+        await self.init_asr(config.character_config.asr_config)
 
         # init tts from character config
-        self.init_tts(config.character_config.tts_config)
+        await self.init_tts(config.character_config.tts_config)
 
         # init vad from character config
-        self.init_vad(config.character_config.vad_config)
+        await self.init_vad(config.character_config.vad_config)
 
         # Initialize shared ToolAdapter if it doesn't exist yet
         if not self.tool_adapter and config.character_config.agent_config.agent_settings.basic_memory_agent.use_mcpp:
@@ -288,7 +361,7 @@ class ServiceContext:
             config.character_config.persona_prompt,
         )
 
-        self.init_translate(
+        await self.init_translate(
             config.character_config.tts_preprocessor_config.translator_config
         )
 
@@ -297,6 +370,32 @@ class ServiceContext:
         self.system_config = config.system_config or self.system_config
         self.character_config = config.character_config
 
+    def _materialize_config(self) -> None:
+        """Copy the configs shared with the default context before modifying them."""
+        if not self._config_shared:
+            return
+        self.system_config = self.system_config.model_copy(deep=True)
+        self.character_config = self.character_config.model_copy(deep=True)
+        self.config = self.config.model_copy(
+            update={
+                "system_config": self.system_config,
+                "character_config": self.character_config,
+            }
+        )
+        self._config_shared = False
+
+    def init_audio_encoder(self) -> None:
+        """Create the audio encoder of the session from the system config."""
+        audio_output = self.system_config.audio_output
+        if (
+            audio_output.codec == self.audio_encoder.codec
+            and audio_output.bitrate_kbps == self.audio_encoder.bitrate_kbps
+        ):
+            return
+        self.audio_encoder = AudioEncoder(
+            codec=audio_output.codec, bitrate_kbps=audio_output.bitrate_kbps
+        )
+
     def init_live2d(self, live2d_model_name: str) -> None:
         logger.info(f"Initializing Live2D: {live2d_model_name}")
         try:
@@ -306,41 +405,45 @@ class ServiceContext:
             logger.critical(f"Error initializing Live2D: {e}")
             logger.critical("Try to proceed without Live2D...")
 
-    def init_asr(self, asr_config: ASRConfig) -> None:
+    async def _swap_engine(self, current: Any, spec: EngineSpec) -> Any:
+        """Get an engine from the engine registry and release the current one."""
+        engine = await engine_registry.acquire(*spec)
+        engine_registry.release(current)
+        return engine
+
+    async def init_asr(self, asr_config: ASRConfig) -> None:
         if not self.asr_engine or (self.character_config.asr_config != asr_config):
             logger.info(f"Initializing ASR: {asr_config.asr_model}")
-            self.asr_engine = ASRFactory.get_asr_system(
-                asr_config.asr_model,
-                **getattr(asr_config, asr_config.asr_model).model_dump(),
+            self.asr_engine = await self._swap_engine(
+                self.asr_engine, _asr_spec(asr_config)
             )
             # saving config should be done after successful initialization
             self.character_config.asr_config = asr_config
         else:
             logger.info("ASR already initialized with the same config.")
 
-    def init_tts(self, tts_config: TTSConfig) -> None:
+    async def init_tts(self, tts_config: TTSConfig) -> None:
         if not self.tts_engine or (self.character_config.tts_config != tts_config):
             logger.info(f"Initializing TTS: {tts_config.tts_model}")
-            self.tts_engine = TTSFactory.get_tts_engine(
-                tts_config.tts_model,
-                **getattr(tts_config, tts_config.tts_model.lower()).model_dump(),
+            self.tts_engine = await self._swap_engine(
+                self.tts_engine, _tts_spec(tts_config)
             )
             # saving config should be done after successful initialization
             self.character_config.tts_config = tts_config
         else:
             logger.info("TTS already initialized with the same config.")
 
-    def init_vad(self, vad_config: VADConfig) -> None:
+    async def init_vad(self, vad_config: VADConfig) -> None:
         if vad_config.vad_model is None:
             logger.info("VAD is disabled.")
+            engine_registry.release(self.vad_engine)
             self.vad_engine = None
             return
             
         if not self.vad_engine or (self.character_config.vad_config != vad_config):
             logger.info(f"Initializing VAD: {vad_config.vad_model}")
-            self.vad_engine = VADFactory.get_vad_engine(
-                vad_config.vad_model,
-                **getattr(vad_config, vad_config.vad_model.lower()).model_dump(),
+            self.vad_engine = await self._swap_engine(
+                self.vad_engine, _vad_spec(vad_config)
             )
             # saving config should be done after successful initialization
             self.character_config.vad_config = vad_config
@@ -390,7 +493,7 @@ class ServiceContext:
             logger.error(f"Failed to initialize agent: {e}")
             raise
 
-    def init_translate(self, translator_config: TranslatorConfig) -> None:
+    async def init_translate(self, translator_config: TranslatorConfig) -> None:
         """Initialize or update the translation engine based on the configuration."""
 
         if not translator_config.translate_audio:
@@ -405,11 +508,8 @@ class ServiceContext:
             logger.info(
                 f"Initializing Translator: {translator_config.translate_provider}"
             )
-            self.translate_engine = TranslateFactory.get_translator(
-                translator_config.translate_provider,
-                getattr(
-                    translator_config, translator_config.translate_provider
-                ).model_dump(),
+            self.translate_engine = await self._swap_engine(
+                self.translate_engine, _translate_spec(translator_config)
             )
             self.character_config.tts_preprocessor_config.translator_config = (
                 translator_config
@@ -455,6 +555,79 @@ class ServiceContext:
 
         return persona_prompt
 
+    def _build_config(self, config_file_name: str) -> Optional[Config]:
+        """Build the config of a character config file, merged with the base config."""
+        new_character_config_data = None
+
+        if config_file_name == "conf.yaml":
+            # Load base config
+            new_character_config_data = read_yaml("conf.yaml").get(
+                "character_config"
+            )
+        else:
+            # Load alternative config and merge with base config
+            characters_dir = self.system_config.config_alts_dir
+            file_path = os.path.normpath(
+                os.path.join(characters_dir, config_file_name)
+            )
+            if not file_path.startswith(characters_dir):
+                raise ValueError("Invalid configuration file path")
+
+            alt_config_data = read_yaml(file_path).get("character_config")
+
+            # Start with original config data and perform a deep merge
+            new_character_config_data = deep_merge(
+                self.config.character_config.model_dump(), alt_config_data
+            )
+
+        if not new_character_config_data:
+            return None
+        return validate_config(
+            {
+                "system_config": self.system_config.model_dump(),
+                "character_config": new_character_config_data,
+            }
+        )
+
+    async def preload_warm_engines(
+        self,
+        config_file_names: List[str],
+        kinds: Optional[Collection[str]] = None,
+    ) -> None:
+        """
+        Load the engines of the listed character configs into the engine
+        registry, so switching to them does not wait for model loading.
+
+        Parameters:
+        - config_file_names (List[str]): Character config files, as for switch-config.
+        - kinds (Collection[str], optional): Only load the engines of these kinds.
+        """
+        for config_file_name in config_file_names:
+            try:
+                character_config = self._build_config(config_file_name).character_config
+            except Exception as e:
+                logger.warning(f"Cannot preload engines of {config_file_name}: {e}")
+                continue
+            specs = [
+                _asr_spec(character_config.asr_config),
+                _tts_spec(character_config.tts_config),
+            ]
+            if character_config.vad_config.vad_model is not None:
+                specs.append(_vad_spec(character_config.vad_config))
+            translator_config = character_config.tts_preprocessor_config.translator_config
+            if translator_config.translate_audio:
+                specs.append(_translate_spec(translator_config))
+            for spec in specs:
+                if kinds is not None and spec[0] not in kinds:
+                    continue
+                try:
+                    await engine_registry.preload(*spec)
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to preload {spec[0]} engine of {config_file_name}: {e}"
+                    )
+            logger.info(f"Engines of {config_file_name} are warm.")
+
     async def handle_config_switch(
         self,
         websocket: WebSocket,
@@ -469,35 +642,9 @@ class ServiceContext:
         - config_file_name (str): The name of the configuration file.
         """
         try:
-            new_character_config_data = None
-
-            if config_file_name == "conf.yaml":
-                # Load base config
-                new_character_config_data = read_yaml("conf.yaml").get(
-                    "character_config"
-                )
-            else:
-                # Load alternative config and merge with base config
-                characters_dir = self.system_config.config_alts_dir
-                file_path = os.path.normpath(
-                    os.path.join(characters_dir, config_file_name)
-                )
-                if not file_path.startswith(characters_dir):
-                    raise ValueError("Invalid configuration file path")
-
-                alt_config_data = read_yaml(file_path).get("character_config")
-
-                # Start with original config data and perform a deep merge
-                new_character_config_data = deep_merge(
-                    self.config.character_config.model_dump(), alt_config_data
-                )
+            new_config = self._build_config(config_file_name)
 
-            if new_character_config_data:
-                new_config = {
-                    "system_config": self.system_config.model_dump(),
-                    "character_config": new_character_config_data,
-                }
-                new_config = validate_config(new_config)
+            if new_config:
                 await self.load_from_config(new_config)  # Await the async load
                 logger.debug(f"New config: {self}")
                 logger.debug(
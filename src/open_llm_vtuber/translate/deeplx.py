@@ -1,7 +1,10 @@
 import json
+from typing import List
+
 import httpx
 from loguru import logger
 from .translate_interface import TranslateInterface
+from ..utils.http_client import http_clients
 
 
 class DeepLXTranslate(TranslateInterface):
@@ -26,3 +29,31 @@ class DeepLXTranslate(TranslateInterface):
             raise e
 
         return res
+
+    async def async_translate(self, text: str) -> str:
+        return " ".join(await self._post_texts([text]))
+
+    async def async_translate_batch(self, texts: List[str]) -> List[str]:
+        """Translate several texts with one request, using the text array of the v2 endpoint"""
+        translations = await self._post_texts(texts)
+        if len(translations) != len(texts):
+            raise ValueError(
+                f"Expected {len(texts)} translations from DeepLX, got {len(translations)}"
+            )
+        return translations
+
+    async def _post_texts(self, texts: List[str]) -> List[str]:
+        req = None
+        try:
+            data = {"text": texts, "target_lang": self.target_lang}
+            response = await http_clients.get(self.api_endpoint).post(
+                url=self.api_endpoint, json=data
+            )
+            req = response.text
+            res = [d["text"] for d in response.json()["translations"]]
+        except Exception as e:
+            logger.critical(f"Error translating text {texts}. Error message: {e}")
+            logger.critical(f"Response: {req}")
+            raise e
+
+        return res
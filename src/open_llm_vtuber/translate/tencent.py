@@ -3,11 +3,13 @@ import hmac
 import json
 import time
 from datetime import datetime, timezone
+from typing import List, Tuple
 
 import httpx
 from loguru import logger
 
 from .translate_interface import TranslateInterface
+from ..utils.http_client import http_clients
 
 
 def sign(key, msg):
@@ -33,6 +35,7 @@ class TencentTranslate(TranslateInterface):
         self.host = "tmt.tencentcloudapi.com"
         self.version = "2018-03-21"
         self.action = "TextTranslate"
+        self.batch_action = "TextTranslateBatch"
         self.algorithm = "TC3-HMAC-SHA256"
         self.source_lang = source_lang
         self.target_lang = target_lang
@@ -44,13 +47,16 @@ class TencentTranslate(TranslateInterface):
         secret_signing = sign(secret_service, "tc3_request")
         return secret_signing
 
-    def _prepare_headers(self, payload: str, timestamp: int, date: str) -> dict:
+    def _prepare_headers(
+        self, payload: str, timestamp: int, date: str, action: str = None
+    ) -> dict:
         """Prepare request headers"""
+        action = action or self.action
         ct = "application/json; charset=utf-8"
         canonical_uri = "/"
         canonical_querystring = ""
         canonical_headers = (
-            f"content-type:{ct}\nhost:{self.host}\nx-tc-action:{self.action.lower()}\n"
+            f"content-type:{ct}\nhost:{self.host}\nx-tc-action:{action.lower()}\n"
         )
         signed_headers = "content-type;host;x-tc-action"
         hashed_request_payload = hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -82,7 +88,7 @@ class TencentTranslate(TranslateInterface):
             "Authorization": authorization,
             "Content-Type": ct,
             "Host": self.host,
-            "X-TC-Action": self.action,
+            "X-TC-Action": action,
             "X-TC-Timestamp": str(timestamp),
             "X-TC-Version": self.version,
         }
@@ -93,22 +99,25 @@ class TencentTranslate(TranslateInterface):
 
         return headers
 
-    def translate(self, text: str) -> str:
-        """Translate text"""
+    def _signed_request(self, action: str, body: dict) -> Tuple[str, dict]:
+        """Serialize the request body and sign it. Returns (payload, headers)."""
         timestamp = int(time.time())
         date = datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%d")
+        payload = json.dumps(body)
+        return payload, self._prepare_headers(payload, timestamp, date, action)
 
-        payload = json.dumps(
+    def translate(self, text: str) -> str:
+        """Translate text"""
+        payload, headers = self._signed_request(
+            self.action,
             {
                 "SourceText": text,
                 "Source": self.source_lang,
                 "Target": self.target_lang,
                 "ProjectId": 0,
-            }
+            },
         )
 
-        headers = self._prepare_headers(payload, timestamp, date)
-
         try:
             response = httpx.post(
                 url="https://" + self.host, headers=headers, data=payload
@@ -119,3 +128,53 @@ class TencentTranslate(TranslateInterface):
         except Exception as e:
             logger.critical(f"API call error: {e}")
             raise e
+
+    async def _async_post(self, action: str, body: dict) -> dict:
+        payload, headers = self._signed_request(action, body)
+        url = "https://" + self.host
+        try:
+            response = await http_clients.get(url).post(
+                url=url, headers=headers, content=payload
+            )
+            res = response.json()
+        except Exception as e:
+            logger.critical(f"API call error: {e}")
+            raise e
+        res = res.get("Response", {})
+        # API errors are reported with HTTP 200 and an Error field
+        if "Error" in res:
+            raise ValueError(f"Tencent translation failed: {res['Error']}")
+        logger.info(f"Request successful: {res}")
+        return res
+
+    async def async_translate(self, text: str) -> str:
+        """Translate text without blocking the event loop"""
+        res = await self._async_post(
+            self.action,
+            {
+                "SourceText": text,
+                "Source": self.source_lang,
+                "Target": self.target_lang,
+                "ProjectId": 0,
+            },
+        )
+        translation = res.get("TargetText")
+        if not isinstance(translation, str):
+            raise ValueError(f"Tencent translation failed: {res}")
+        return translation
+
+    async def async_translate_batch(self, texts: List[str]) -> List[str]:
+        """Translate several texts with one TextTranslateBatch request"""
+        res = await self._async_post(
+            self.batch_action,
+            {
+                "SourceTextList": texts,
+                "Source": self.source_lang,
+                "Target": self.target_lang,
+                "ProjectId": 0,
+            },
+        )
+        translations = res.get("TargetTextList")
+        if not isinstance(translations, list) or len(translations) != len(texts):
+            raise ValueError(f"Tencent batch translation failed: {res}")
+        return translations
@@ -1,4 +1,6 @@
 import abc
+import asyncio
+from typing import List
 
 
 class TranslateInterface(metaclass=abc.ABCMeta):
@@ -7,3 +9,25 @@ class TranslateInterface(metaclass=abc.ABCMeta):
         """
         Translate the input text to the target language."""
         raise NotImplementedError
+
+    async def async_translate(self, text: str) -> str:
+        """
+        Asynchronously translate the input text to the target language.
+
+        By default, this runs the synchronous translate in a thread.
+        Subclasses can override this method to provide true async implementation.
+        """
+        return await asyncio.to_thread(self.translate, text)
+
+    async def async_translate_batch(self, texts: List[str]) -> List[str]:
+        """
+        Asynchronously translate several texts to the target language.
+
+        By default, the texts are translated concurrently one by one.
+        Subclasses whose API accepts several texts per request should override
+        this method to translate them in a single request.
+
+        Returns:
+            List[str]: The translations, in the order of the input texts.
+        """
+        return list(await asyncio.gather(*(self.async_translate(t) for t in texts)))
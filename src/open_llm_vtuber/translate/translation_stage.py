@@ -0,0 +1,161 @@
+"""
+Asynchronous translation stage for TTS text.
+
+Sentences are submitted as soon as the agent produces them and translated in
+the background, so the conversation moves on to the next sentence (and its
+TTS) while the translation request is in flight. Sentences submitted while a
+request is running are sent together in the next request, and finished
+translations are kept in a process-wide LRU cache.
+"""
+
+import asyncio
+import time
+import weakref
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
+
+from loguru import logger
+
+from .translate_interface import TranslateInterface
+from ..utils.metrics import metrics
+
+
+class TranslationCache:
+    """LRU cache of translations keyed by (engine, target language, text)."""
+
+    def __init__(self, max_size: int = 2048):
+        self.max_size = max_size
+        self._entries: OrderedDict[Tuple[str, str, str], str] = OrderedDict()
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[str]:
+        translation = self._entries.get(key)
+        if translation is not None:
+            self._entries.move_to_end(key)
+        return translation
+
+    def put(self, key: Tuple[str, str, str], translation: str) -> None:
+        self._entries[key] = translation
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Process-wide cache
+translation_cache = TranslationCache()
+
+
+class TranslationStage:
+    """Translates submitted texts in the background, batched and cached."""
+
+    def __init__(self, engine: TranslateInterface, max_batch_size: int = 16):
+        """
+        Args:
+            engine: The translation engine.
+            max_batch_size: Maximum number of texts sent in one request.
+        """
+        self.engine = engine
+        self.max_batch_size = max_batch_size
+        self._engine_name = type(engine).__name__
+        self._target_lang = str(getattr(engine, "target_lang", ""))
+        # Texts waiting for the next request, and the futures of all
+        # texts that are waiting or in flight
+        self._queue: List[str] = []
+        self._futures: Dict[str, asyncio.Future] = {}
+        self._worker: Optional[asyncio.Task] = None
+
+    def _cache_key(self, text: str) -> Tuple[str, str, str]:
+        return (self._engine_name, self._target_lang, text)
+
+    def translate(self, text: str) -> "asyncio.Future[str]":
+        """
+        Submit a text for translation.
+
+        Returns:
+            asyncio.Future[str]: Resolves to the translation, or raises the
+            error of the translation request.
+        """
+        loop = asyncio.get_running_loop()
+        cached = translation_cache.get(self._cache_key(text))
+        if cached is not None:
+            metrics.inc("translate.cache_hits")
+            future = loop.create_future()
+            future.set_result(cached)
+            return future
+        metrics.inc("translate.cache_misses")
+
+        future = self._futures.get(text)
+        if future is not None:
+            # The same text is already on its way
+            return future
+
+        future = loop.create_future()
+        self._futures[text] = future
+        self._queue.append(text)
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+        return future
+
+    async def _run(self) -> None:
+        while self._queue:
+            batch = self._queue[: self.max_batch_size]
+            del self._queue[: self.max_batch_size]
+
+            try:
+                results = await self._translate_batch(batch)
+            except asyncio.CancelledError:
+                for text in batch + self._queue:
+                    self._futures.pop(text).cancel()
+                self._queue.clear()
+                raise
+
+            for text, result in zip(batch, results):
+                future = self._futures.pop(text)
+                # Done already if the waiting conversation was interrupted
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                    # Nobody may wait for it anymore, do not warn about that
+                    future.exception()
+                else:
+                    translation_cache.put(self._cache_key(text), result)
+                    future.set_result(result)
+
+    async def _translate_batch(self, batch: List[str]) -> List[Union[str, Exception]]:
+        """Translate a batch, falling back to one request per text on failure."""
+        start = time.perf_counter()
+        try:
+            if len(batch) == 1:
+                translations = [await self.engine.async_translate(batch[0])]
+            else:
+                translations = await self.engine.async_translate_batch(batch)
+        except Exception as e:
+            logger.error(f"Translation of {len(batch)} sentences failed: {e}")
+            if len(batch) == 1:
+                return [e]
+            # Keep one bad sentence from failing the others
+            return await asyncio.gather(
+                *(self.engine.async_translate(text) for text in batch),
+                return_exceptions=True,
+            )
+
+        metrics.observe("translate.batch_size", len(batch))
+        metrics.observe("translate.request_ms", (time.perf_counter() - start) * 1000)
+        return translations
+
+
+# One stage per engine, so that all conversations of an engine share batches
+_stages: "weakref.WeakKeyDictionary[TranslateInterface, TranslationStage]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_translation_stage(engine: TranslateInterface) -> TranslationStage:
+    """Get the translation stage of a translation engine."""
+    stage = _stages.get(engine)
+    if stage is None:
+        stage = _stages[engine] = TranslationStage(engine)
+    return stage
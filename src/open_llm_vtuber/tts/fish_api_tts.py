@@ -2,6 +2,7 @@ from typing import Literal
 from fish_audio_sdk import Session, TTSRequest
 from loguru import logger
 from .tts_interface import TTSInterface
+from ..utils.http_client import http_clients
 
 
 class TTSEngine(TTSInterface):
@@ -39,6 +40,8 @@ class TTSEngine(TTSInterface):
 
         self.reference_id = reference_id
         self.latency = latency
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
         self.session = Session(apikey=api_key, base_url=base_url)
 
     def generate_audio(self, text, file_name_no_ext=None):
@@ -58,3 +61,31 @@ class TTSEngine(TTSInterface):
             return None
 
         return file_name
+
+    async def async_generate_audio(self, text, file_name_no_ext=None):
+        """Call the Fish TTS REST endpoint directly through the pooled async client."""
+        file_name = self.generate_cache_file_name(file_name_no_ext, self.file_extension)
+        url = f"{self.base_url}/v1/tts"
+
+        try:
+            async with http_clients.get(url).stream(
+                "POST",
+                url,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                json={
+                    "text": text,
+                    "reference_id": self.reference_id,
+                    "latency": self.latency,
+                    "format": self.file_extension,
+                },
+            ) as response:
+                response.raise_for_status()
+                with open(file_name, "wb") as f:
+                    async for chunk in response.aiter_bytes():
+                        f.write(chunk)
+
+        except Exception as e:
+            logger.critical(f"\nError: Fish TTS API fail to generate audio: {e}")
+            return None
+
+        return file_name
@@ -6,6 +6,7 @@ import re
 import requests
 from loguru import logger
 from .tts_interface import TTSInterface
+from ..utils.http_client import http_clients
 
 
 class TTSEngine(TTSInterface):
@@ -31,11 +32,9 @@ class TTSEngine(TTSInterface):
         self.media_type = media_type
         self.streaming_mode = streaming_mode
 
-    def generate_audio(self, text, file_name_no_ext=None):
-        file_name = self.generate_cache_file_name(file_name_no_ext, self.media_type)
+    def _request_params(self, text):
         cleaned_text = re.sub(r"\[.*?\]", "", text)
-        # Prepare the data for the POST request
-        data = {
+        return {
             "text": cleaned_text,
             "text_lang": self.text_lang,
             "ref_audio_path": self.ref_audio_path,
@@ -47,18 +46,34 @@ class TTSEngine(TTSInterface):
             "streaming_mode": self.streaming_mode,
         }
 
-        # Send POST request to the TTS API
-        response = requests.get(self.api_url, params=data, timeout=120)
-
+    def _save_response(self, status_code, content, file_name):
         # Check if the request was successful
-        if response.status_code == 200:
+        if status_code == 200:
             # Save the audio content to a file
             with open(file_name, "wb") as audio_file:
-                audio_file.write(response.content)
+                audio_file.write(content)
             return file_name
         else:
             # Handle errors or unsuccessful requests
             logger.critical(
-                f"Error: Failed to generate audio. Status code: {response.status_code}"
+                f"Error: Failed to generate audio. Status code: {status_code}"
             )
             return None
+
+    def generate_audio(self, text, file_name_no_ext=None):
+        file_name = self.generate_cache_file_name(file_name_no_ext, self.media_type)
+
+        # Send GET request to the TTS API
+        response = requests.get(
+            self.api_url, params=self._request_params(text), timeout=120
+        )
+        return self._save_response(response.status_code, response.content, file_name)
+
+    async def async_generate_audio(self, text, file_name_no_ext=None):
+        file_name = self.generate_cache_file_name(file_name_no_ext, self.media_type)
+
+        # Reuse the pooled connection to the TTS server
+        response = await http_clients.get(self.api_url).get(
+            self.api_url, params=self._request_params(text), timeout=120
+        )
+        return self._save_response(response.status_code, response.content, file_name)
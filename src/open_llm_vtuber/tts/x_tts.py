@@ -1,6 +1,7 @@
 import requests
 from loguru import logger
 from .tts_interface import TTSInterface
+from ..utils.http_client import http_clients
 
 
 class TTSEngine(TTSInterface):
@@ -16,28 +17,41 @@ class TTSEngine(TTSInterface):
         self.new_audio_dir = "cache"
         self.file_extension = "wav"
 
-    def generate_audio(self, text, file_name_no_ext=None):
-        file_name = self.generate_cache_file_name(file_name_no_ext, self.file_extension)
-
-        # Prepare the data for the POST request
-        data = {
+    def _request_data(self, text):
+        return {
             "text": text,
             "speaker_wav": self.speaker_wav,
             "language": self.language,
         }
 
-        # Send POST request to the TTS API
-        response = requests.post(self.api_url, json=data, timeout=120)
-
+    def _save_response(self, status_code, content, file_name):
         # Check if the request was successful
-        if response.status_code == 200:
+        if status_code == 200:
             # Save the audio content to a file
             with open(file_name, "wb") as audio_file:
-                audio_file.write(response.content)
+                audio_file.write(content)
             return file_name
         else:
             # Handle errors or unsuccessful requests
             logger.critical(
-                f"Error: Failed to generate audio. Status code: {response.status_code}"
+                f"Error: Failed to generate audio. Status code: {status_code}"
             )
             return None
+
+    def generate_audio(self, text, file_name_no_ext=None):
+        file_name = self.generate_cache_file_name(file_name_no_ext, self.file_extension)
+
+        # Send POST request to the TTS API
+        response = requests.post(
+            self.api_url, json=self._request_data(text), timeout=120
+        )
+        return self._save_response(response.status_code, response.content, file_name)
+
+    async def async_generate_audio(self, text, file_name_no_ext=None):
+        file_name = self.generate_cache_file_name(file_name_no_ext, self.file_extension)
+
+        # Reuse the pooled connection to the TTS server
+        response = await http_clients.get(self.api_url).post(
+            self.api_url, json=self._request_data(text), timeout=120
+        )
+        return self._save_response(response.status_code, response.content, file_name)
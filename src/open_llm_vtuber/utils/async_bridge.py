@@ -0,0 +1,88 @@
+"""
+Bridge blocking iterators (local model token generators, synchronous SDK streams)
+to asyncio without blocking the event loop.
+"""
+
+import asyncio
+import threading
+from typing import AsyncIterator, Callable, Iterable, Optional, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class _ProducerError:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+async def iterate_in_thread(
+    iterator_factory: Callable[[], Iterable[T]],
+    max_queue_size: int = 64,
+    lock: Optional[threading.Lock] = None,
+) -> AsyncIterator[T]:
+    """
+    Run a blocking iterator in a worker thread and yield its items asynchronously.
+
+    The worker thread pushes items into a bounded buffer, so a slow consumer
+    pauses the producer instead of letting items pile up. When the consumer stops
+    early (interrupt, cancellation), the producer stops at the next item.
+
+    Parameters:
+        iterator_factory (Callable): Creates the blocking iterator. It is called in
+            the worker thread, so creating it may block as well.
+        max_queue_size (int): Maximum number of items buffered ahead of the consumer.
+        lock (threading.Lock, optional): Held by the worker thread for the whole
+            iteration, for backends that are not thread-safe.
+
+    Yields:
+        The items of the iterator, in order.
+
+    Raises:
+        Any exception raised by the iterator is re-raised in the consumer.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    slots = threading.Semaphore(max_queue_size)
+    stopped = threading.Event()
+
+    def push(item) -> None:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            # The event loop is closed, nobody is listening anymore
+            stopped.set()
+
+    def produce() -> None:
+        try:
+            if lock:
+                lock.acquire()
+            try:
+                for item in iterator_factory():
+                    while not slots.acquire(timeout=0.1):
+                        if stopped.is_set():
+                            return
+                    if stopped.is_set():
+                        return
+                    push(item)
+            finally:
+                if lock:
+                    lock.release()
+        except BaseException as e:
+            push(_ProducerError(e))
+        finally:
+            push(_DONE)
+
+    loop.run_in_executor(None, produce)
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                break
+            if isinstance(item, _ProducerError):
+                raise item.error
+            slots.release()
+            yield item
+    finally:
+        stopped.set()
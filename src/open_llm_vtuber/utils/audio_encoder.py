@@ -0,0 +1,124 @@
+"""
+Encoding of the generated audio for delivery to the client.
+
+The codec is set by `system_config.audio_output.codec`:
+
+- "wav" (default): the audio is sent as uncompressed WAV (raw 16-bit PCM in
+  the binary frames of protocol version 2).
+- "native": the file of the TTS engine is sent as is when it is already
+  compressed (mp3 from edge-tts, OpenAI TTS or MiniMax...), WAV otherwise.
+- "opus" / "aac": the audio is encoded to Opus (in Ogg) or AAC (ADTS) with
+  ffmpeg, passing through engine files already in that format.
+
+Encoding with ffmpeg needs an ffmpeg build with the encoder. Without it the
+encoder falls back to WAV, with a warning. The volumes sent with the audio are
+always computed from the decoded PCM, whatever the codec.
+"""
+
+import functools
+import os
+import shutil
+import subprocess
+from typing import Optional, Tuple
+
+from loguru import logger
+from pydub import AudioSegment
+
+AUDIO_CODECS = ("wav", "native", "opus", "aac")
+
+# Compressed file formats sent as is, by file extension
+_PASSTHROUGH_FORMATS = {
+    "mp3": "mp3",
+    "ogg": "ogg",
+    "opus": "ogg",
+    "aac": "aac",
+    "m4a": "m4a",
+}
+# Format name, pydub export format and ffmpeg encoder of each codec
+_FFMPEG_CODECS = {
+    "opus": ("ogg", "ogg", "libopus"),
+    "aac": ("aac", "adts", "aac"),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _ffmpeg_has_encoder(encoder: str) -> bool:
+    """Whether the ffmpeg used by pydub has an encoder, checked once per process."""
+    converter = shutil.which(AudioSegment.converter) or AudioSegment.converter
+    try:
+        result = subprocess.run(
+            [converter, "-hide_banner", "-encoders"],
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return any(line.split()[1:2] == [encoder] for line in result.stdout.splitlines())
+
+
+class AudioEncoder:
+    """Encodes the audio files of the TTS engine for a session.
+
+    The encoder is created once per session from the session's system config,
+    so the ffmpeg check and the codec settings are not redone per sentence.
+    """
+
+    def __init__(self, codec: str = "wav", bitrate_kbps: int = 32):
+        """
+        Args:
+            codec (str): One of AUDIO_CODECS.
+            bitrate_kbps (int): Bitrate of the "opus" and "aac" codecs.
+        """
+        if codec not in AUDIO_CODECS:
+            raise ValueError(f"Unknown audio codec: {codec}")
+        self.codec = codec
+        self.bitrate_kbps = bitrate_kbps
+        if codec in _FFMPEG_CODECS and not _ffmpeg_has_encoder(
+            _FFMPEG_CODECS[codec][2]
+        ):
+            logger.warning(
+                f"ffmpeg has no {_FFMPEG_CODECS[codec][2]} encoder, "
+                f"sending WAV audio instead of {codec}."
+            )
+            self.codec = "wav"
+
+    @property
+    def compressed(self) -> bool:
+        """Whether the encoder may send compressed audio."""
+        return self.codec != "wav"
+
+    @staticmethod
+    def _file_format(audio_path: str) -> Optional[str]:
+        extension = os.path.splitext(audio_path)[1].lstrip(".").lower()
+        return _PASSTHROUGH_FORMATS.get(extension)
+
+    def encode(self, audio_path: str, audio: AudioSegment) -> Tuple[bytes, str]:
+        """Encode a generated audio file.
+
+        Args:
+            audio_path (str): The file generated by the TTS engine.
+            audio (AudioSegment): The decoded audio of the file.
+
+        Returns:
+            Tuple[bytes, str]: The encoded audio and its format ("wav", "mp3",
+            "ogg", "aac" or "m4a").
+        """
+        file_format = self._file_format(audio_path)
+        if self.codec == "native" and file_format:
+            with open(audio_path, "rb") as f:
+                return f.read(), file_format
+
+        if self.codec in _FFMPEG_CODECS:
+            audio_format, export_format, encoder = _FFMPEG_CODECS[self.codec]
+            if file_format == audio_format:
+                with open(audio_path, "rb") as f:
+                    return f.read(), audio_format
+            encoded = audio.export(
+                format=export_format,
+                codec=encoder,
+                bitrate=f"{self.bitrate_kbps}k",
+            ).read()
+            return encoded, audio_format
+
+        return audio.export(format="wav").read(), "wav"
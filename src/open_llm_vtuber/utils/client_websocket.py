@@ -0,0 +1,315 @@
+"""
+The WebSocket of a /client-ws client: negotiated protocol version and
+outbound send queue.
+
+Messages are not written to the socket by the task that sends them. They are
+queued and written by a writer task of the connection, so a slow client does
+not stall the TTS pipeline or the broadcasts to its group. The queue has two
+lanes:
+
+- control: out-of-band messages (errors, group updates, replies to history
+  and config requests...), written first. A message of a type in
+  COALESCED_TYPES replaces a queued message of the same type.
+- stream: everything else, i.e. the conversation (text, audio and the control
+  signals around them), written in order since the frontend relies on it.
+
+An interrupt signal drops the queued messages of the interrupted conversation
+(CONVERSATION_TYPES) and is written after the stream messages left, so the
+frontend gets nothing of that conversation after it.
+
+A client is a slow consumer when its queue holds more than `max_messages` or
+its oldest queued message waits more than `max_lag_ms`. With the "downgrade"
+policy the audio messages of a lagging client are sent without audio (text and
+actions only) until its queue drains, and it is disconnected only when its
+queue is full. With the "disconnect" policy it is disconnected right away.
+"""
+
+import asyncio
+import json
+import re
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Union
+
+from fastapi import WebSocket
+from loguru import logger
+
+from .metrics import metrics
+from .ws_protocol import (
+    PROTOCOL_V1,
+    decode_audio_frame,
+    describe_audio_frame,
+    encode_audio_frame,
+)
+
+Message = Union[str, bytes]
+
+# Message types written before the conversation stream
+CONTROL_TYPES = frozenset(
+    {
+        "error",
+        "heartbeat-ack",
+        "group-update",
+        "group-operation-result",
+        "history-list",
+        "history-data",
+        "history-deleted",
+        "new-history-created",
+        "config-files",
+        "background-files",
+    }
+)
+# Control messages superseded by a newer message of the same type
+COALESCED_TYPES = frozenset(
+    {"group-update", "history-list", "config-files", "background-files"}
+)
+# Stream messages of a conversation, dropped when it is interrupted
+CONVERSATION_TYPES = frozenset(
+    {
+        "audio",
+        "full-text",
+        "control",
+        "backend-synth-complete",
+        "force-new-message",
+        "user-input-transcription",
+        "tool_call_status",
+    }
+)
+# Close code sent to the slow consumers that are disconnected ("Try Again Later")
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+_TYPE_PATTERN = re.compile(r'\{\s*"type"\s*:\s*"([^"]*)"')
+
+
+def message_type(data: Message) -> Optional[str]:
+    """Type of a message, read from the start of the JSON (binary frames are audio)."""
+    if isinstance(data, bytes):
+        return "audio"
+    match = _TYPE_PATTERN.match(data, 0, 128)
+    return match.group(1) if match else None
+
+
+def strip_audio(data: Message) -> Message:
+    """The audio message without its audio, as sent for silent display."""
+    if isinstance(data, bytes):
+        message = decode_audio_frame(data)
+        for key in ("audio", "volumes", "audio_format"):
+            message.pop(key, None)
+        return encode_audio_frame(message, None, [])
+    message = json.loads(data)
+    message.pop("audio_format", None)
+    message["audio"] = None
+    message["volumes"] = []
+    return json.dumps(message)
+
+
+class _Entry:
+    __slots__ = ("data", "type", "enqueued_at")
+
+    def __init__(self, data: Message, type: Optional[str]):
+        self.data = data
+        self.type = type
+        self.enqueued_at = time.monotonic()
+
+
+class SendQueue:
+    """Outbound messages of a client, written to its socket by a writer task."""
+
+    def __init__(
+        self,
+        websocket: "ClientWebSocket",
+        max_messages: int = 256,
+        max_lag_ms: float = 5000,
+        slow_consumer_policy: str = "downgrade",
+    ):
+        """
+        Args:
+            websocket (ClientWebSocket): The connection the messages are written to.
+            max_messages (int): Capacity of the queue.
+            max_lag_ms (float): Wait of the oldest queued message after which
+                the client is a slow consumer.
+            slow_consumer_policy (str): "downgrade" or "disconnect".
+        """
+        self.websocket = websocket
+        self.max_messages = max_messages
+        self.max_lag_ms = max_lag_ms
+        self.slow_consumer_policy = slow_consumer_policy
+        self.downgraded = False
+        self.closed = False
+        self._control: Deque[_Entry] = deque()
+        self._stream: Deque[_Entry] = deque()
+        self._coalesced: Dict[str, _Entry] = {}
+        self._ready = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._control) + len(self._stream)
+
+    def put(self, data: Message) -> None:
+        """Queue a message. Never waits, a full queue disconnects the client."""
+        if self.closed:
+            raise RuntimeError("The WebSocket is closed")
+        kind = message_type(data)
+        pending = self._coalesced.get(kind)
+        if pending is not None:
+            pending.data = data
+            metrics.inc("ws.coalesced")
+            return
+        if kind == "interrupt-signal":
+            # Nothing of the interrupted conversation is shown or played anymore
+            self.discard_conversation()
+        entry = _Entry(data, kind)
+        if kind == "audio" and self.downgraded:
+            entry.data = strip_audio(data)
+            metrics.inc("ws.audio_downgraded")
+        if kind in CONTROL_TYPES:
+            self._control.append(entry)
+            if kind in COALESCED_TYPES:
+                self._coalesced[kind] = entry
+        else:
+            self._stream.append(entry)
+        self._check_lag()
+        self._ready.set()
+        if self._writer is None and not self.closed:
+            self._writer = asyncio.create_task(self._write_loop())
+
+    def discard_conversation(self) -> None:
+        """Drop the conversation messages waiting in the queue."""
+        kept = deque(
+            entry for entry in self._stream if entry.type not in CONVERSATION_TYPES
+        )
+        if len(kept) != len(self._stream):
+            metrics.inc("ws.conversation_discarded", len(self._stream) - len(kept))
+            self._stream = kept
+
+    def close(self) -> None:
+        """Drop the queued messages and stop the writer task."""
+        self.closed = True
+        self._control.clear()
+        self._stream.clear()
+        self._coalesced.clear()
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+
+    def _lag_ms(self) -> float:
+        oldest = min(
+            (lane[0].enqueued_at for lane in (self._control, self._stream) if lane),
+            default=None,
+        )
+        return 0.0 if oldest is None else (time.monotonic() - oldest) * 1000
+
+    def _check_lag(self) -> None:
+        if len(self) > self.max_messages:
+            self._disconnect(f"{len(self)} messages queued")
+            return
+        lag_ms = self._lag_ms()
+        if lag_ms <= self.max_lag_ms or self.downgraded:
+            return
+        if self.slow_consumer_policy == "disconnect":
+            self._disconnect(f"{lag_ms:.0f} ms behind")
+        else:
+            self._downgrade(lag_ms)
+
+    def _downgrade(self, lag_ms: float) -> None:
+        logger.warning(
+            f"Client is {lag_ms:.0f} ms behind, sending text without audio "
+            "until it catches up."
+        )
+        metrics.inc("ws.slow_consumer_downgrades")
+        self.downgraded = True
+        for entry in self._stream:
+            if entry.type == "audio":
+                entry.data = strip_audio(entry.data)
+                metrics.inc("ws.audio_downgraded")
+
+    def _disconnect(self, reason: str) -> None:
+        logger.warning(f"Disconnecting slow client ({reason}).")
+        metrics.inc("ws.slow_consumer_disconnects")
+        self.close()
+        asyncio.create_task(self._close_socket())
+
+    async def _close_socket(self) -> None:
+        try:
+            await self.websocket.websocket.close(code=SLOW_CONSUMER_CLOSE_CODE)
+        except Exception as e:
+            logger.debug(f"Error closing the WebSocket of a slow client: {e}")
+
+    def _pop(self) -> Optional[_Entry]:
+        lane = self._control or self._stream
+        if not lane:
+            return None
+        entry = lane.popleft()
+        if self._coalesced.get(entry.type) is entry:
+            del self._coalesced[entry.type]
+        return entry
+
+    async def _write_loop(self) -> None:
+        while not self.closed:
+            await self._ready.wait()
+            entry = self._pop()
+            if entry is None:
+                self._ready.clear()
+                if self.downgraded:
+                    logger.info("Client caught up, sending audio again.")
+                    self.downgraded = False
+                continue
+            metrics.observe(
+                "ws.send_lag_ms", (time.monotonic() - entry.enqueued_at) * 1000
+            )
+            try:
+                await self.websocket.send_now(entry.data)
+            except Exception as e:
+                logger.debug(f"Stopped writing to a closed WebSocket: {e}")
+                self.close()
+
+
+class ClientWebSocket:
+    """The WebSocket of a client, with the negotiated protocol version.
+
+    `send_text` queues the message (see SendQueue) and also takes bytes,
+    sent as a binary frame, so binary audio frames go through the same send
+    functions as the JSON messages. Everything else is delegated to the
+    Starlette WebSocket.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        protocol_version: int = PROTOCOL_V1,
+        **send_queue_settings: Any,
+    ):
+        """
+        Args:
+            websocket (WebSocket): The accepted WebSocket.
+            protocol_version (int): The negotiated protocol version.
+            **send_queue_settings: Settings of the SendQueue.
+        """
+        self.websocket = websocket
+        self.protocol_version = protocol_version
+        self.send_queue = SendQueue(self, **send_queue_settings)
+
+    async def send_text(self, data: Message) -> None:
+        self.send_queue.put(data)
+
+    async def send_json(self, data: Any, mode: str = "text") -> None:
+        self.send_queue.put(json.dumps(data))
+
+    async def send_now(self, data: Message) -> None:
+        """Write a message to the socket, bypassing the queue."""
+        if isinstance(data, bytes):
+            metrics.inc("ws.binary_messages")
+            metrics.inc("ws.binary_bytes", len(data))
+            # Keep binary frames readable in debug logs
+            logger.opt(lazy=True).debug(
+                "Sent binary audio frame ({} bytes): {}",
+                lambda: len(data),
+                lambda: describe_audio_frame(data),
+            )
+            await self.websocket.send_bytes(data)
+        else:
+            metrics.inc("ws.text_messages")
+            metrics.inc("ws.text_chars", len(data))
+            await self.websocket.send_text(data)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.websocket, name)
@@ -0,0 +1,264 @@
+"""
+Process-wide registry of loaded ASR, TTS, VAD and translation engines.
+
+Local engines (faster-whisper, sherpa-onnx, MeloTTS...) take seconds to load
+and hold their model in memory. Sessions that use the same engine with the
+same configuration share one instance: engines are keyed by (engine type,
+model, normalized config) and reference counted by the sessions using them.
+
+Engines that no session uses anymore stay loaded, so switching back to a
+character is instant, until the loaded engines exceed the memory budget. The
+idle engines are then evicted, least recently used first and the ones preloaded
+for warm characters last. Memory use is measured as the growth of the process
+RSS while an engine loads (GPU memory is not counted).
+
+Engines are loaded one at a time in a worker thread, so the event loop keeps
+serving the other sessions while a model loads.
+
+In the multi-worker mode, the engines of some kinds are loaded by the engine
+host process instead (see set_remote), and the registry of each worker holds
+proxies to them.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import gc
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Collection, Dict, Optional, Tuple
+
+from loguru import logger
+
+from .metrics import metrics
+
+EngineKey = Tuple[str, str, str]
+
+
+def _rss_bytes() -> int:
+    """Resident memory of the process, 0 if unknown."""
+    try:
+        with open("/proc/self/statm", encoding="utf-8") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        return 0
+
+
+class _EngineEntry:
+    def __init__(self, key: EngineKey):
+        self.key = key
+        self.future: concurrent.futures.Future = concurrent.futures.Future()
+        self.engine: Any = None
+        self.size_bytes = 0
+        self.refcount = 0
+        self.warm = False
+        self.last_used = time.monotonic()
+
+
+class EngineRegistry:
+    """Shares engines with identical configs and evicts idle ones under a memory budget."""
+
+    def __init__(self, memory_budget_mb: float = 0):
+        """
+        Args:
+            memory_budget_mb (float): Memory the loaded engines may use before
+                idle ones are evicted. 0 means no limit.
+        """
+        self.memory_budget_mb = memory_budget_mb
+        self._entries: Dict[EngineKey, _EngineEntry] = {}
+        self._keys_by_engine: Dict[int, EngineKey] = {}
+        # Loads one engine at a time, which also keeps the RSS measurement sane
+        self._load_lock = threading.Lock()
+        self._remote_factory: Optional[Callable[..., Any]] = None
+        self._remote_kinds: frozenset = frozenset()
+
+    def configure(self, memory_budget_mb: float = 0) -> None:
+        self.memory_budget_mb = memory_budget_mb
+
+    def set_remote(
+        self, remote_factory: Callable[..., Any], kinds: Collection[str]
+    ) -> None:
+        """Create the engines of some kinds with `remote_factory` instead.
+
+        The engines of these kinds are then created with
+        `remote_factory(kind, factory, model, **kwargs)`, which returns a
+        proxy to an engine loaded in another process.
+        """
+        self._remote_factory = remote_factory
+        self._remote_kinds = frozenset(kinds)
+
+    @staticmethod
+    def make_key(kind: str, model: str, kwargs: Dict[str, Any]) -> EngineKey:
+        """Key of an engine: its type, model and normalized config."""
+        return kind, model, json.dumps(kwargs, sort_keys=True, default=str)
+
+    async def acquire(
+        self,
+        kind: str,
+        model: str,
+        kwargs: Dict[str, Any],
+        factory: Callable[..., Any],
+    ) -> Any:
+        """Get an engine, loading it with `factory(model, **kwargs)` if needed.
+
+        The caller holds a reference until it calls `release(engine)`.
+        """
+        entry = self._get_entry(kind, model, kwargs, factory)
+        entry.refcount += 1
+        entry.last_used = time.monotonic()
+        try:
+            engine = await self._wait(entry)
+        except BaseException:
+            entry.refcount -= 1
+            raise
+        self._evict_idle()
+        return engine
+
+    async def preload(
+        self,
+        kind: str,
+        model: str,
+        kwargs: Dict[str, Any],
+        factory: Callable[..., Any],
+    ) -> None:
+        """Load an engine ahead of time without holding a reference to it."""
+        entry = self._get_entry(kind, model, kwargs, factory)
+        entry.warm = True
+        await self._wait(entry)
+        self._evict_idle()
+
+    async def _wait(self, entry: _EngineEntry) -> Any:
+        """Wait for an engine to be loaded."""
+        try:
+            # Shielded, other sessions may wait for the same engine
+            engine = await asyncio.shield(asyncio.wrap_future(entry.future))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Not cached, the next acquire tries again
+            if self._entries.get(entry.key) is entry:
+                del self._entries[entry.key]
+            raise
+        self._keys_by_engine[id(engine)] = entry.key
+        return engine
+
+    def _get_entry(
+        self,
+        kind: str,
+        model: str,
+        kwargs: Dict[str, Any],
+        factory: Callable[..., Any],
+    ) -> _EngineEntry:
+        key = self.make_key(kind, model, kwargs)
+        entry = self._entries.get(key)
+        if entry is not None:
+            metrics.inc("engines.hits")
+            return entry
+        metrics.inc("engines.misses")
+        entry = self._entries[key] = _EngineEntry(key)
+        if kind in self._remote_kinds:
+            factory = functools.partial(self._remote_factory, kind, factory)
+        asyncio.get_running_loop().run_in_executor(
+            None, self._load, entry, factory, model, kwargs
+        )
+        return entry
+
+    def _load(
+        self,
+        entry: _EngineEntry,
+        factory: Callable[..., Any],
+        model: str,
+        kwargs: Dict[str, Any],
+    ) -> None:
+        """Load an engine, in a worker thread."""
+        with self._load_lock:
+            logger.info(f"Loading {entry.key[0]} engine: {model}")
+            started = time.perf_counter()
+            rss_before = _rss_bytes()
+            try:
+                engine = factory(model, **kwargs)
+            except BaseException as e:
+                logger.error(f"Failed to load {entry.key[0]} engine {model}: {e}")
+                entry.future.set_exception(e)
+                return
+            entry.engine = engine
+            entry.size_bytes = max(0, _rss_bytes() - rss_before)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            metrics.observe("engines.load_ms", elapsed_ms)
+            logger.info(
+                f"Loaded {entry.key[0]} engine {model} in {elapsed_ms:.0f} ms "
+                f"(~{entry.size_bytes / 2**20:.0f} MB)"
+            )
+            entry.future.set_result(engine)
+
+    def retain(self, engine: Any) -> None:
+        """Take another reference to an engine from the registry."""
+        entry = self._entry_of(engine)
+        if entry is not None:
+            entry.refcount += 1
+            entry.last_used = time.monotonic()
+
+    def release(self, engine: Any) -> None:
+        """Drop a reference taken with acquire() or retain()."""
+        entry = self._entry_of(engine)
+        if entry is None:
+            return
+        entry.refcount = max(0, entry.refcount - 1)
+        entry.last_used = time.monotonic()
+        self._evict_idle()
+
+    def _entry_of(self, engine: Any) -> Optional[_EngineEntry]:
+        if engine is None:
+            return None
+        key = self._keys_by_engine.get(id(engine))
+        entry = self._entries.get(key) if key else None
+        return entry if entry is not None and entry.engine is engine else None
+
+    def _evict_idle(self) -> None:
+        """Evict idle engines while the loaded ones use more than the budget."""
+        loaded = [entry for entry in self._entries.values() if entry.engine is not None]
+        used = sum(entry.size_bytes for entry in loaded)
+        metrics.set_gauge("engines.loaded", len(loaded))
+        metrics.set_gauge("engines.memory_mb", used / 2**20)
+        if not self.memory_budget_mb:
+            return
+        budget = self.memory_budget_mb * 2**20
+        idle = sorted(
+            (entry for entry in loaded if entry.refcount == 0),
+            key=lambda entry: (entry.warm, entry.last_used),
+        )
+        evicted = False
+        for entry in idle:
+            if used <= budget:
+                break
+            logger.info(
+                f"Evicting idle {entry.key[0]} engine {entry.key[1]} "
+                f"(~{entry.size_bytes / 2**20:.0f} MB)"
+            )
+            del self._entries[entry.key]
+            self._keys_by_engine.pop(id(entry.engine), None)
+            entry.engine = None
+            used -= entry.size_bytes
+            evicted = True
+            metrics.inc("engines.evictions")
+        if evicted:
+            gc.collect()
+            metrics.set_gauge("engines.loaded", len(self._entries))
+            metrics.set_gauge("engines.memory_mb", used / 2**20)
+        if used > budget:
+            logger.warning(
+                f"Engines in use need ~{used / 2**20:.0f} MB, "
+                f"more than the budget of {self.memory_budget_mb} MB."
+            )
+
+
+# Process-wide registry
+engine_registry = EngineRegistry()
@@ -0,0 +1,93 @@
+"""
+Process-wide registry of pooled async HTTP clients.
+
+HTTP-based engines (TTS servers, translators, LLM backends) talk to the same few
+hosts for every sentence. Sharing one `httpx.AsyncClient` per origin keeps the
+TCP/TLS connections alive between requests instead of paying the connection
+setup on every call, and the async client does not block a worker thread while
+waiting for the server.
+"""
+
+import asyncio
+import importlib.util
+from typing import Dict, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+from loguru import logger
+
+
+class HTTPClientRegistry:
+    """Hands out one pooled `httpx.AsyncClient` per origin (scheme, host, port)."""
+
+    def __init__(self):
+        self._clients: Dict[Tuple[str, int], httpx.AsyncClient] = {}
+        self.configure()
+
+    def configure(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 60.0,
+        timeout: float = 120.0,
+        connect_timeout: float = 10.0,
+        http2: bool = True,
+    ) -> None:
+        """
+        Set the pool limits and timeouts used for clients created from now on.
+
+        Parameters:
+            max_connections (int): Maximum number of connections per origin.
+            max_keepalive_connections (int): Maximum number of idle connections kept per origin.
+            keepalive_expiry (float): Seconds an idle connection is kept open.
+            timeout (float): Default read/write/pool timeout in seconds.
+            connect_timeout (float): Timeout for establishing a connection in seconds.
+            http2 (bool): Use HTTP/2 when the server supports it. Requires the `h2` package.
+        """
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self._http2 = http2 and importlib.util.find_spec("h2") is not None
+        if http2 and not self._http2:
+            logger.debug("HTTP/2 requested but the 'h2' package is not installed.")
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parts = urlsplit(url)
+        if not parts.scheme or not parts.netloc:
+            raise ValueError(f"Not an absolute URL: {url}")
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def get(self, url: str) -> httpx.AsyncClient:
+        """
+        Get the shared client for the origin of `url`.
+
+        Clients are bound to the event loop they are first used in, so a client
+        is created per (origin, event loop).
+        """
+        origin = self._origin(url)
+        key = (origin, id(asyncio.get_running_loop()))
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            logger.debug(f"Creating pooled HTTP client for {origin}")
+            client = httpx.AsyncClient(
+                limits=self._limits,
+                timeout=self._timeout,
+                http2=self._http2,
+            )
+            self._clients[key] = client
+        return client
+
+    async def aclose(self) -> None:
+        """Close all clients created in the running event loop."""
+        loop_id = id(asyncio.get_running_loop())
+        for key in [key for key in self._clients if key[1] == loop_id]:
+            client = self._clients.pop(key)
+            await client.aclose()
+
+
+# Process-wide registry
+http_clients = HTTPClientRegistry()
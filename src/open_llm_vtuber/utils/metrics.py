@@ -0,0 +1,101 @@
+"""
+Lightweight in-process metrics registry.
+
+Counters, gauges and value summaries are kept in memory and can be read with
+`snapshot()` (exposed over HTTP by the `/metrics` route). This is not meant to
+replace a real monitoring stack, it only makes per-turn numbers inspectable
+without digging through the logs.
+"""
+
+import threading
+from collections import deque
+from typing import Dict, Any
+
+
+class _Summary:
+    """Running summary of observed values with a bounded window for percentiles."""
+
+    def __init__(self, window: int = 512):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self._recent = deque(maxlen=window)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self._recent.append(value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        recent = sorted(self._recent)
+
+        def percentile(p: float):
+            if not recent:
+                return None
+            return recent[min(len(recent) - 1, int(p * len(recent)))]
+
+        return {
+            "count": self.count,
+            "avg": self.total / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": percentile(0.5),
+            "p95": percentile(0.95),
+            "last": self._recent[-1] if self._recent else None,
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe store for counters, gauges and summaries."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._summaries: Dict[str, _Summary] = {}
+
+    def inc(self, name: str, value: float = 1) -> None:
+        """Increase a counter."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Set a gauge to the given value."""
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        """Record one observation (latency, token count...) of a summary."""
+        with self._lock:
+            summary = self._summaries.get(name)
+            if summary is None:
+                summary = self._summaries[name] = _Summary()
+            summary.observe(value)
+
+    def get_counter(self, name: str) -> float:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-serializable copy of all metrics."""
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "summaries": {
+                    name: summary.to_dict() for name, summary in self._summaries.items()
+                },
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._summaries.clear()
+
+
+# Process-wide registry
+metrics = MetricsRegistry()
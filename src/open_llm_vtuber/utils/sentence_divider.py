@@ -1,4 +1,8 @@
+import asyncio
 import re
+import time
+from functools import lru_cache
+from itertools import islice
 from typing import List, Tuple, AsyncIterator, Optional, Union, Dict, Any
 import pysbd
 from loguru import logger
@@ -6,6 +10,8 @@ from langdetect import detect
 from enum import Enum
 from dataclasses import dataclass
 
+from .metrics import metrics
+
 # Constants for additional checks
 COMMAS = [
     ",",
@@ -45,6 +51,15 @@ ABBREVIATIONS = [
     "Dr.",
 ]
 
+# Single characters that can end a sentence ("..." and "。。。" are made of them)
+_END_PUNCTUATION_CHARS = "".join(sorted({p for p in END_PUNCTUATIONS if len(p) == 1}))
+_COMMA_CHARS = "".join(sorted(set(COMMAS)))
+
+# Pattern used by segment_text_by_regex, compiled once
+_REGEX_SENTENCE_PATTERN = re.compile(
+    r"(.*?(?:[" + "|".join(re.escape(p) for p in END_PUNCTUATIONS) + r"]))"
+)
+
 # Set of languages directly supported by pysbd
 SUPPORTED_LANGUAGES = {
     "am",
@@ -73,17 +88,47 @@ SUPPORTED_LANGUAGES = {
 }
 
 
+# Languages whose sentences end with full-width punctuation. Text in these
+# languages is split with a simple pattern instead of pysbd.
+CJK_LANGUAGES = {"zh", "zh-cn", "zh-tw", "ja", "ko"}
+_CJK_SENTENCE_PATTERN = re.compile(r"[^。！？]*[。！？]+[」』”’）》]*")
+_ASCII_END_PUNCTUATION_PATTERN = re.compile(r"[.!?]")
+
+# Minimum text length for a language guess to be kept for the rest of a stream
+LANGUAGE_DETECTION_MIN_CHARS = 16
+
+
+def detect_language_code(text: str) -> Optional[str]:
+    """
+    Detect the language of text.
+    Returns the langdetect language code, or None if detection failed.
+    """
+    try:
+        return detect(text)
+    except Exception as e:
+        logger.debug(f"Language detection failed: {e}")
+        return None
+
+
 def detect_language(text: str) -> str:
     """
     Detect text language and check if it's supported by pysbd.
     Returns None for unsupported languages.
     """
-    try:
-        detected = detect(text)
-        return detected if detected in SUPPORTED_LANGUAGES else None
-    except Exception as e:
-        logger.debug(f"Language detection failed, language not supported by pysdb: {e}")
+    detected = detect_language_code(text)
+    if detected not in SUPPORTED_LANGUAGES:
+        logger.debug(f"Language not supported by pysbd: {detected}")
         return None
+    return detected
+
+
+@lru_cache(maxsize=None)
+def get_segmenter(language: str) -> pysbd.Segmenter:
+    """
+    Get the shared pysbd segmenter for a language.
+    Segmenters keep no state between calls, so one per language is enough.
+    """
+    return pysbd.Segmenter(language=language, clean=False)
 
 
 def is_complete_sentence(text: str) -> bool:
@@ -187,12 +232,8 @@ def segment_text_by_regex(text: str) -> Tuple[List[str], str]:
     complete_sentences = []
     remaining_text = text.strip()
 
-    # Create pattern for matching sentences ending with any end punctuation
-    escaped_punctuations = [re.escape(p) for p in END_PUNCTUATIONS]
-    pattern = r"(.*?(?:[" + "|".join(escaped_punctuations) + r"]))"
-
     while remaining_text:
-        match = re.search(pattern, remaining_text)
+        match = _REGEX_SENTENCE_PATTERN.search(remaining_text)
         if not match:
             break
 
@@ -210,13 +251,39 @@ def segment_text_by_regex(text: str) -> Tuple[List[str], str]:
     return complete_sentences, remaining_text
 
 
-def segment_text_by_pysbd(text: str) -> Tuple[List[str], str]:
+def segment_text_by_cjk(text: str) -> Tuple[List[str], str]:
+    """
+    Segment Chinese, Japanese or Korean text at full-width end punctuation.
+    Much faster than pysbd, but only correct for text without ASCII sentence
+    punctuation.
+
+    Args:
+        text: Text to segment into sentences
+
+    Returns:
+        Tuple[List[str], str]: (list of complete sentences, remaining incomplete text)
+    """
+    complete_sentences = []
+    end_pos = 0
+    for match in _CJK_SENTENCE_PATTERN.finditer(text):
+        sentence = match.group().strip()
+        if sentence:
+            complete_sentences.append(sentence)
+        end_pos = match.end()
+    return complete_sentences, text[end_pos:].strip()
+
+
+def segment_text_by_pysbd(
+    text: str, language: Optional[str] = None
+) -> Tuple[List[str], str]:
     """
     Segment text into complete sentences and remaining text.
-    Uses pysbd for supported languages, falls back to regex for others.
+    Uses pysbd for supported languages, a fast path for CJK text and falls
+    back to regex for others.
 
     Args:
         text: Text to segment into sentences
+        language: langdetect code of the text. Detected from the text if None.
 
     Returns:
         Tuple[List[str], str]: (list of complete sentences, remaining incomplete text)
@@ -225,13 +292,14 @@ def segment_text_by_pysbd(text: str) -> Tuple[List[str], str]:
         return [], ""
 
     try:
-        # Detect language
-        lang = detect_language(text)
+        lang = language or detect_language_code(text)
 
-        if lang is not None:
+        if lang in CJK_LANGUAGES and not _ASCII_END_PUNCTUATION_PATTERN.search(text):
+            return segment_text_by_cjk(text)
+
+        if lang in SUPPORTED_LANGUAGES:
             # Use pysbd for supported languages
-            segmenter = pysbd.Segmenter(language=lang, clean=False)
-            sentences = segmenter.segment(text)
+            sentences = get_segmenter(lang).segment(text)
 
             if not sentences:
                 return [], text
@@ -298,12 +366,58 @@ class SentenceWithTags:
     tags: List[TagInfo]  # List of tags from outermost to innermost
 
 
+# A word for chunking purposes: a CJK character or a run of other non-space characters
+_CJK_CHARS = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af"
+_WORD_PATTERN = re.compile(f"[{_CJK_CHARS}]|[^\\s{_CJK_CHARS}]+")
+# A chunk cut because of the first chunk timeout has at least this many words
+_MIN_TIMEOUT_CHUNK_WORDS = 2
+# Yielded by _items_with_deadline when the first chunk timeout expires
+_DEADLINE = object()
+# A sentence end rejected by the segmentation is segmented again while fewer
+# than this many characters follow it, since the next words can change the
+# decision. The text segmented again starts at a word at least this many
+# characters before it.
+_SEGMENT_CONTEXT = 32
+_WORD_BREAK_PATTERN = re.compile(f"[\\s{_CJK_CHARS}]")
+
+
+@dataclass
+class ChunkingPolicy:
+    """
+    When to cut text that has no sentence end yet, so TTS can start earlier.
+
+    The first chunk is cut after `first_chunk_words` words, or at the last
+    complete word once `first_chunk_timeout_ms` passed since the first text
+    arrived. Later chunks may be `chunk_growth_factor` times longer than the
+    previous one (up to `max_chunk_words`), so that TTS gets longer text with
+    better prosody once the first audio is playing. A value of 0 disables the
+    word limit or the timeout.
+    """
+
+    first_chunk_words: int = 0
+    first_chunk_timeout_ms: float = 0
+    chunk_growth_factor: float = 2.0
+    max_chunk_words: int = 40
+
+    @property
+    def enabled(self) -> bool:
+        return self.first_chunk_words > 0 or self.first_chunk_timeout_ms > 0
+
+    def word_limit(self, chunk_index: int) -> int:
+        """Maximum number of words of the chunk with the given index, 0 for no limit."""
+        if self.first_chunk_words <= 0:
+            return 0
+        limit = self.first_chunk_words * self.chunk_growth_factor**chunk_index
+        return int(min(limit, max(self.max_chunk_words, self.first_chunk_words)))
+
+
 class SentenceDivider:
     def __init__(
         self,
         faster_first_response: bool = True,
         segment_method: str = "pysbd",
         valid_tags: List[str] = None,
+        chunking_policy: Optional[ChunkingPolicy] = None,
     ):
         """
         Initialize the SentenceDivider.
@@ -312,15 +426,47 @@ class SentenceDivider:
             faster_first_response: Whether to split first sentence at commas
             segment_method: Method for segmenting sentences
             valid_tags: List of valid tag names to detect
+            chunking_policy: When to cut long text without sentence end
+                (disabled if None)
         """
         self.faster_first_response = faster_first_response
         self.segment_method = segment_method
         self.valid_tags = valid_tags or ["think"]
+        self.chunking_policy = chunking_policy or ChunkingPolicy()
+        # Number of spoken chunks yielded in the current stream
+        self._chunk_count = 0
+        # When the first text of the current stream arrived
+        self._first_text_at: Optional[float] = None
         self._is_first_sentence = True
         self._buffer = ""
         # Replace active_tags dict with a stack to handle nesting
         self._tag_stack = []
 
+        # One pattern for all tags, mapping each tag string to (name, state)
+        self._tag_lookup: Dict[str, Tuple[str, TagState]] = {}
+        for tag in self.valid_tags:
+            self._tag_lookup[f"<{tag}/>"] = (tag, TagState.SELF_CLOSING)
+            self._tag_lookup[f"<{tag}>"] = (tag, TagState.START)
+            self._tag_lookup[f"</{tag}>"] = (tag, TagState.END)
+        tag_alternatives = "|".join(re.escape(t) for t in self._tag_lookup)
+        self._tag_pattern = re.compile(tag_alternatives)
+
+        # Anything that can make the buffer processable: a tag, an end
+        # punctuation or (for the first sentence) a comma
+        end_class = f"[{re.escape(_END_PUNCTUATION_CHARS)}]"
+        comma_class = f"[{re.escape(_END_PUNCTUATION_CHARS + _COMMA_CHARS)}]"
+        self._boundary_pattern = re.compile(f"{tag_alternatives}|{end_class}")
+        self._first_boundary_pattern = re.compile(f"{tag_alternatives}|{comma_class}")
+        # A tag may be split across tokens, so rescan this many characters
+        self._scan_overlap = max(len(t) for t in self._tag_lookup) - 1
+        # The buffer before this position is known to contain no boundary
+        self._scan_pos = 0
+        # The segmentation found no sentence end before this position
+        self._segment_pos = 0
+        # Language of the current stream, detected once from a long enough text
+        self._language: Optional[str] = None
+        self._language_decided = False
+
     def _get_current_tags(self) -> List[TagInfo]:
         """
         Get all current active tags from outermost to innermost.
@@ -350,44 +496,10 @@ class SentenceDivider:
         Returns:
             Tuple of (TagInfo if tag found else None, remaining text)
         """
-        # Find the first occurrence of any tag
-        first_tag = None
-        first_pos = len(text)
-        tag_type = None
-        matched_tag = None
-
-        # Check for self-closing tags
-        for tag in self.valid_tags:
-            pattern = f"<{tag}/>"
-            match = re.search(pattern, text)
-            if match and match.start() < first_pos:
-                first_pos = match.start()
-                first_tag = match
-                tag_type = TagState.SELF_CLOSING
-                matched_tag = tag
-
-        # Check for opening tags
-        for tag in self.valid_tags:
-            pattern = f"<{tag}>"
-            match = re.search(pattern, text)
-            if match and match.start() < first_pos:
-                first_pos = match.start()
-                first_tag = match
-                tag_type = TagState.START
-                matched_tag = tag
-
-        # Check for closing tags
-        for tag in self.valid_tags:
-            pattern = f"</{tag}>"
-            match = re.search(pattern, text)
-            if match and match.start() < first_pos:
-                first_pos = match.start()
-                first_tag = match
-                tag_type = TagState.END
-                matched_tag = tag
-
+        first_tag = self._tag_pattern.search(text)
         if not first_tag:
             return None, text
+        matched_tag, tag_type = self._tag_lookup[first_tag.group()]
 
         # Handle the found tag
         if tag_type == TagState.START:
@@ -402,15 +514,106 @@ class SentenceDivider:
 
         return (TagInfo(matched_tag, tag_type), text[first_tag.end() :].lstrip())
 
+    def _has_pending_boundary(self) -> bool:
+        """
+        Check whether the buffer contains anything _process_buffer can act on.
+
+        Only the text added since the last check is scanned (plus a few characters
+        for tags split across tokens), so streaming a long sentence without
+        punctuation costs time proportional to its length instead of its square.
+
+        Returns:
+            bool: Whether the buffer contains a tag, an end punctuation or, for
+            the first sentence, a comma
+        """
+        pattern = (
+            self._first_boundary_pattern
+            if self._is_first_sentence and self.faster_first_response
+            else self._boundary_pattern
+        )
+        start = max(self._scan_pos - self._scan_overlap, 0)
+        if pattern.search(self._buffer, start):
+            return True
+        self._scan_pos = len(self._buffer)
+        return False
+
+    def _first_chunk_deadline(self) -> Optional[float]:
+        """Time (perf_counter) at which the first chunk is due, None if there is none"""
+        policy = self.chunking_policy
+        if (
+            policy.first_chunk_timeout_ms <= 0
+            or self._chunk_count > 0
+            or self._first_text_at is None
+            or self._tag_stack
+        ):
+            return None
+        return self._first_text_at + policy.first_chunk_timeout_ms / 1000
+
+    def _chunk_due(self) -> bool:
+        """
+        Check whether the chunking policy wants the buffer to be cut.
+        Looks at no more words than the current word limit.
+        """
+        if not self.chunking_policy.enabled or self._tag_stack:
+            return False
+        deadline = self._first_chunk_deadline()
+        if deadline is not None and time.perf_counter() >= deadline:
+            return True
+        limit = self.chunking_policy.word_limit(self._chunk_count)
+        if limit <= 0:
+            return False
+        # The word after the limit has started, so the limit-th word is complete
+        words = islice(_WORD_PATTERN.finditer(self._buffer), limit + 1)
+        return sum(1 for _ in words) > limit
+
+    def _cut_chunk(self) -> Optional[str]:
+        """
+        Cut a chunk from the start of the buffer at a word boundary if the
+        chunking policy says so.
+
+        The last word of the buffer is never part of a timeout chunk, since it
+        may still be incomplete.
+
+        Returns:
+            Optional[str]: The chunk, or None if the buffer is not cut
+        """
+        if not self._chunk_due():
+            return None
+        limit = self.chunking_policy.word_limit(self._chunk_count)
+        words = list(
+            islice(_WORD_PATTERN.finditer(self._buffer), limit + 1 if limit else None)
+        )
+        if limit and len(words) > limit:
+            # Word limit reached
+            cut_pos = words[limit - 1].end()
+        else:
+            # First chunk timeout
+            complete_words = words if self._buffer[-1:].isspace() else words[:-1]
+            if len(complete_words) < _MIN_TIMEOUT_CHUNK_WORDS:
+                return None
+            cut_pos = complete_words[-1].end()
+
+        chunk = self._buffer[:cut_pos].strip()
+        self._buffer = self._buffer[cut_pos:].lstrip()
+        logger.debug(f"Chunking policy cut: '{chunk}'")
+        return chunk
+
     async def _process_buffer(self) -> AsyncIterator[SentenceWithTags]:
         """
         Process the current buffer, yielding complete sentences with tags.
         This is now an async generator.
         It consumes processed parts from self._buffer.
         """
+        if not self._has_pending_boundary() and not self._chunk_due():
+            return
+
         processed_something = True  # Flag to loop until no more processing can be done
+        original_buffer_len = len(self._buffer)
         while processed_something:
             processed_something = False
+            if len(self._buffer) != original_buffer_len:
+                # Cut by the last pass, the positions in the buffer changed
+                self._segment_pos = 0
             original_buffer_len = len(self._buffer)
 
             if not self._buffer.strip():
@@ -419,13 +622,10 @@ class SentenceDivider:
             # Find the next tag position
             next_tag_pos = len(self._buffer)
             tag_pattern_found = None
-            for tag in self.valid_tags:
-                patterns = [f"<{tag}>", f"</{tag}>", f"<{tag}/>"]
-                for pattern in patterns:
-                    pos = self._buffer.find(pattern)
-                    if pos != -1 and pos < next_tag_pos:
-                        next_tag_pos = pos
-                        tag_pattern_found = pattern  # Store the found pattern
+            tag_match = self._tag_pattern.search(self._buffer)
+            if tag_match:
+                next_tag_pos = tag_match.start()
+                tag_pattern_found = tag_match.group()  # Store the found pattern
 
             if next_tag_pos == 0:
                 # Tag is at the start of buffer
@@ -508,7 +708,7 @@ class SentenceDivider:
 
                 # Process normal sentences based on end punctuation
                 if contains_end_punctuation(self._buffer):
-                    sentences, remaining = self._segment_text(self._buffer)
+                    sentences, remaining = self._segment_buffer()
                     if sentences:  # Only process if segmentation yielded sentences
                         self._buffer = remaining
                         self._is_first_sentence = False
@@ -521,10 +721,26 @@ class SentenceDivider:
                                 )
                         continue  # Restart processing loop
 
+                # Cut long text without sentence end if the chunking policy says so
+                chunk = self._cut_chunk()
+                if chunk:
+                    yield SentenceWithTags(
+                        text=chunk,
+                        tags=current_tags or [TagInfo("", TagState.NONE)],
+                    )
+                    self._is_first_sentence = False
+                    processed_something = True
+                    continue  # Restart processing loop
+
             # If we reached here without processing anything, break the loop
             if not processed_something:
                 break
 
+        # The sentence ends left in the buffer were rejected by the segmentation,
+        # only the last ones may be accepted once more text arrives
+        self._segment_pos = len(self._buffer)
+        self._scan_pos = max(len(self._buffer) - _SEGMENT_CONTEXT, 0)
+
     async def _flush_buffer(self) -> AsyncIterator[SentenceWithTags]:
         """
         Process and yield all remaining content in the buffer at the end of the stream.
@@ -562,23 +778,26 @@ class SentenceDivider:
         self._full_response = []
         self.reset()  # Ensure state is clean
 
-        async for item in segment_stream:
-            if isinstance(item, dict):
+        async for item in self._items_with_deadline(segment_stream):
+            if item is _DEADLINE:
+                # No new text, but the first chunk is due
+                async for sentence in self._process_buffer():
+                    self._track_sentence(sentence)
+                    yield sentence
+            elif isinstance(item, dict):
                 # Before yielding the dict, process and yield any complete sentences formed so far
                 async for sentence in self._process_buffer():
-                    self._full_response.append(
-                        sentence.text
-                    )  # Track for complete response
+                    self._track_sentence(sentence)
                     yield sentence
                 # Now yield the dictionary
                 yield item
             elif isinstance(item, str):
+                if self._first_text_at is None and item.strip():
+                    self._first_text_at = time.perf_counter()
                 self._buffer += item
                 # Process the buffer incrementally as string chunks arrive
                 async for sentence in self._process_buffer():
-                    self._full_response.append(
-                        sentence.text
-                    )  # Track for complete response
+                    self._track_sentence(sentence)
                     yield sentence
             else:
                 logger.warning(
@@ -587,22 +806,138 @@ class SentenceDivider:
 
         # After the stream finishes, flush any remaining text in the buffer
         async for sentence in self._flush_buffer():
-            self._full_response.append(sentence.text)
+            self._track_sentence(sentence)
             yield sentence
 
+    def _track_sentence(self, sentence: SentenceWithTags) -> None:
+        """Record a yielded sentence in the complete response and the chunk count"""
+        self._full_response.append(sentence.text)  # Track for complete response
+        # Only text outside of tags is spoken
+        if all(tag.state == TagState.NONE for tag in sentence.tags):
+            if self._chunk_count == 0 and self._first_text_at is not None:
+                metrics.observe(
+                    "agent.first_chunk_ms",
+                    (time.perf_counter() - self._first_text_at) * 1000,
+                )
+            self._chunk_count += 1
+
+    async def _items_with_deadline(
+        self, segment_stream: AsyncIterator[Union[str, Dict[str, Any]]]
+    ) -> AsyncIterator[Any]:
+        """
+        Yield the items of the stream. While the first chunk timeout of the
+        chunking policy is running, also yield _DEADLINE when it expires before
+        the next item arrives.
+        """
+        stream = segment_stream.__aiter__()
+        pending: Optional[asyncio.Future] = None
+        try:
+            while True:
+                deadline = self._first_chunk_deadline()
+                if deadline is not None and deadline <= time.perf_counter():
+                    # Expired, the buffer is cut as soon as possible
+                    deadline = None
+                if deadline is None and pending is None:
+                    try:
+                        item = await stream.__anext__()
+                    except StopAsyncIteration:
+                        return
+                    yield item
+                    continue
+
+                if pending is None:
+                    pending = asyncio.ensure_future(stream.__anext__())
+                if deadline is not None:
+                    timeout = max(deadline - time.perf_counter(), 0)
+                    done, _ = await asyncio.wait({pending}, timeout=timeout)
+                    if not done:
+                        yield _DEADLINE
+                        continue
+
+                next_item, pending = pending, None
+                try:
+                    item = await next_item
+                except StopAsyncIteration:
+                    return
+                yield item
+        finally:
+            if pending is not None:
+                pending.cancel()
+
     @property
     def complete_response(self) -> str:
         """Get the complete response accumulated so far"""
         return "".join(self._full_response)
 
-    def _segment_text(self, text: str) -> Tuple[List[str], str]:
-        """Segment text using the configured method"""
+    def _stream_language(self, text: str) -> Optional[str]:
+        """
+        Get the language of the current stream.
+
+        The language is detected on the first text that is long enough for a
+        reliable guess and reused for the rest of the stream. Shorter texts are
+        detected on their own until then.
+        """
+        if self._language_decided:
+            return self._language
+        language = detect_language_code(text)
+        if len(text.strip()) >= LANGUAGE_DETECTION_MIN_CHARS:
+            self._language = language
+            self._language_decided = True
+            logger.debug(f"Detected stream language: {language}")
+        return language
+
+    def _segment_text(
+        self, text: str, language_text: Optional[str] = None
+    ) -> Tuple[List[str], str]:
+        """
+        Segment text using the configured method
+
+        Args:
+            text: Text to segment
+            language_text: Text the language is detected on, `text` if None
+        """
         if self.segment_method == "regex":
             return segment_text_by_regex(text)
-        return segment_text_by_pysbd(text)
+        language = self._stream_language(language_text or text)
+        if language is None:
+            return segment_text_by_regex(text)
+        return segment_text_by_pysbd(text, language=language)
+
+    def _segment_buffer(self) -> Tuple[List[str], str]:
+        """
+        Segment the buffer like _segment_text.
+
+        The sentence ends before _segment_pos were rejected when the buffer was
+        segmented before, so only the text from a word some context before the
+        last ones is segmented again. Streaming a long text with rejected
+        sentence ends (versions, decimals, abbreviations) then costs time
+        proportional to its length instead of its square.
+        """
+        start = self._segment_pos - 2 * _SEGMENT_CONTEXT
+        if start <= _SEGMENT_CONTEXT:
+            return self._segment_text(self._buffer)
+        # Start at a word, or anywhere in a long run without word breaks
+        for match in _WORD_BREAK_PATTERN.finditer(
+            self._buffer, start - _SEGMENT_CONTEXT, start
+        ):
+            start = match.end()
+        prefix = self._buffer[:start]
+        sentences, remaining = self._segment_text(
+            self._buffer[start:], language_text=self._buffer
+        )
+        if not sentences:
+            return [], (prefix + remaining).strip()
+        sentences[0] = (prefix + sentences[0]).strip()
+        return sentences, remaining
 
     def reset(self):
         """Reset the divider state for a new conversation"""
         self._is_first_sentence = True
         self._buffer = ""
         self._tag_stack = []
+        self._scan_pos = 0
+        self._segment_pos = 0
+        self._language = None
+        self._language_decided = False
+        self._chunk_count = 0
+        self._first_text_at = None
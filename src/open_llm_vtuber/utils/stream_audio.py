@@ -3,6 +3,10 @@ from pydub import AudioSegment
 from pydub.utils import make_chunks
 from ..agent.output_types import Actions
 from ..agent.output_types import DisplayText
+from .audio_encoder import AudioEncoder
+from .ws_protocol import encode_audio_frame
+
+_wav_encoder = AudioEncoder()
 
 
 def _get_volume_by_chunks(audio: AudioSegment, chunk_length_ms: int) -> list:
@@ -30,6 +34,7 @@ def prepare_audio_payload(
     display_text: DisplayText = None,
     actions: Actions = None,
     forwarded: bool = False,
+    encoder: AudioEncoder | None = None,
 ) -> dict[str, any]:
     """
     Prepares the audio payload for sending to a broadcast endpoint.
@@ -40,6 +45,7 @@ def prepare_audio_payload(
         chunk_length_ms (int): The length of each audio chunk in milliseconds
         display_text (DisplayText, optional): Text to be displayed with the audio
         actions (Actions, optional): Actions associated with the audio
+        encoder (AudioEncoder, optional): Encoder of the session, WAV if None
 
     Returns:
         dict: The audio payload to be sent
@@ -61,10 +67,10 @@ def prepare_audio_payload(
 
     try:
         audio = AudioSegment.from_file(audio_path)
-        audio_bytes = audio.export(format="wav").read()
+        audio_bytes, audio_format = (encoder or _wav_encoder).encode(audio_path, audio)
     except Exception as e:
         raise ValueError(
-            f"Error loading or converting generated audio file to wav file '{audio_path}': {e}"
+            f"Error loading or encoding generated audio file '{audio_path}': {e}"
         )
     audio_base64 = base64.b64encode(audio_bytes).decode("utf-8")
     volumes = _get_volume_by_chunks(audio, chunk_length_ms)
@@ -72,6 +78,7 @@ def prepare_audio_payload(
     payload = {
         "type": "audio",
         "audio": audio_base64,
+        "audio_format": audio_format,
         "volumes": volumes,
         "slice_length": chunk_length_ms,
         "display_text": display_text,
@@ -82,5 +89,60 @@ def prepare_audio_payload(
     return payload
 
 
+def prepare_audio_frame(
+    audio_path: str | None,
+    chunk_length_ms: int = 20,
+    display_text: DisplayText = None,
+    actions: Actions = None,
+    forwarded: bool = False,
+    encoder: AudioEncoder | None = None,
+) -> bytes:
+    """
+    Prepares the audio message as a binary frame of protocol version 2 (see
+    ws_protocol), with the audio as raw 16-bit PCM instead of a base64 WAV file,
+    or compressed if the encoder of the session compresses it.
+
+    Parameters are the same as for prepare_audio_payload.
+
+    Returns:
+        bytes: The binary audio frame to be sent
+    """
+    if isinstance(display_text, DisplayText):
+        display_text = display_text.to_dict()
+
+    message = {
+        "type": "audio",
+        "slice_length": chunk_length_ms,
+        "display_text": display_text,
+        "actions": actions.to_dict() if actions else None,
+        "forwarded": forwarded,
+    }
+    if not audio_path:
+        return encode_audio_frame(message, None, [])
+
+    try:
+        audio = AudioSegment.from_file(audio_path)
+        audio_format = "wav"
+        if encoder is not None and encoder.compressed:
+            audio_bytes, audio_format = encoder.encode(audio_path, audio)
+        if audio_format == "wav":
+            audio = audio.set_sample_width(2)
+            audio_bytes, audio_format = audio.raw_data, "pcm_s16le"
+    except Exception as e:
+        raise ValueError(
+            f"Error loading or encoding generated audio file '{audio_path}': {e}"
+        )
+    volumes = _get_volume_by_chunks(audio, chunk_length_ms)
+
+    return encode_audio_frame(
+        message,
+        audio_bytes,
+        volumes,
+        audio_format,
+        sample_rate=audio.frame_rate,
+        channels=audio.channels,
+    )
+
+
 # Example usage:
 # payload, duration = prepare_audio_payload("path/to/audio.mp3", display_text="Hello", expression_list=[0,1,2])
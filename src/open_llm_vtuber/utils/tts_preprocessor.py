@@ -1,8 +1,166 @@
 import re
 import unicodedata
+from functools import lru_cache
+from typing import List, Tuple
 from loguru import logger
 from ..translate.translate_interface import TranslateInterface
 
+# The rest of an asterisk span of filter_asterisks after its first "*". The
+# scan pattern starts with a character class, which the regex engine searches
+# for quickly, and adds this to it.
+_ASTERISK_SPAN_TAIL = r"(?:(?<=\*)\**((?!\*).)*?\*{1,})?"
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+class _SpecialCharTable(dict):
+    """
+    Translation table for str.translate that deletes every character which is
+    not a letter, number, punctuation or whitespace.
+
+    The Unicode category of each character is looked up once and cached, so
+    filtering runs at the speed of str.translate for characters seen before.
+    """
+
+    def __missing__(self, codepoint: int):
+        char = chr(codepoint)
+        keep = unicodedata.category(char)[0] in "LNP" or char.isspace()
+        value = codepoint if keep else None
+        self[codepoint] = value
+        return value
+
+
+_SPECIAL_CHAR_TABLE = _SpecialCharTable()
+
+
+class TTSTextFilter:
+    """
+    All removals of tts_filter combined into one filter, compiled once for a
+    set of flags.
+
+    Asterisk spans, brackets, parentheses and angle brackets are removed in a
+    single scan with one regex that only stops at "*" and the brackets.
+    Whitespace is then collapsed once, and special characters are removed with
+    NFKC and a cached category table. The output is the same as applying
+    filter_asterisks, filter_brackets, filter_parentheses, filter_angle_brackets
+    and remove_special_characters one after the other.
+    """
+
+    def __init__(
+        self,
+        remove_special_char: bool,
+        ignore_brackets: bool,
+        ignore_parentheses: bool,
+        ignore_asterisks: bool,
+        ignore_angle_brackets: bool,
+    ):
+        self.remove_special_char = remove_special_char
+        self.ignore_brackets = ignore_brackets
+        self.ignore_parentheses = ignore_parentheses
+        self.ignore_asterisks = ignore_asterisks
+        self.ignore_angle_brackets = ignore_angle_brackets
+
+        # Nested pairs in the order the separate filters are applied
+        self._pairs: List[Tuple[str, str]] = [
+            pair
+            for pair, enabled in (
+                (("[", "]"), ignore_brackets),
+                (("(", ")"), ignore_parentheses),
+                (("<", ">"), ignore_angle_brackets),
+            )
+            if enabled
+        ]
+        stops = ("*" if ignore_asterisks else "") + "".join(
+            left + right for left, right in self._pairs
+        )
+        pattern = "[" + re.escape(stops) + "]"
+        if ignore_asterisks:
+            pattern += _ASTERISK_SPAN_TAIL
+        self._scan_pattern = re.compile(pattern) if stops else None
+
+    @classmethod
+    def from_config(cls, tts_preprocessor_config) -> "TTSTextFilter":
+        """Build the filter from a TTSPreprocessorConfig"""
+        return get_tts_text_filter(
+            remove_special_char=tts_preprocessor_config.remove_special_char,
+            ignore_brackets=tts_preprocessor_config.ignore_brackets,
+            ignore_parentheses=tts_preprocessor_config.ignore_parentheses,
+            ignore_asterisks=tts_preprocessor_config.ignore_asterisks,
+            ignore_angle_brackets=tts_preprocessor_config.ignore_angle_brackets,
+        )
+
+    def _scan(self, text: str) -> str:
+        """
+        Remove asterisk spans and the enclosed text of all enabled pairs in
+        one pass.
+
+        Asterisk spans are matched before any bracket inside them, as
+        filter_asterisks runs first. A bracket only reaches the filter of a
+        later pair if the earlier filters kept it, which reproduces applying
+        the filters in sequence.
+        """
+        depths = [0] * len(self._pairs)
+        result = []
+        pos = 0
+        for match in self._scan_pattern.finditer(text):
+            char = match.group()
+            if char == "*":
+                # A lone "*" does not start a span and is kept
+                continue
+            if not any(depths):
+                result.append(text[pos : match.start()])
+            pos = match.end()
+            if char[0] == "*":
+                continue
+            for i, (left, right) in enumerate(self._pairs):
+                if char == left:
+                    depths[i] += 1
+                    break
+                if char == right:
+                    if depths[i] > 0:
+                        depths[i] -= 1
+                    break
+                if depths[i] > 0:
+                    # Removed by this filter, later ones never see it
+                    break
+        if not any(depths):
+            result.append(text[pos:])
+        return "".join(result)
+
+    def __call__(self, text: str) -> str:
+        """
+        Filter the text.
+
+        Args:
+            text (str): The text to filter.
+
+        Returns:
+            str: The filtered text.
+        """
+        if self._scan_pattern is not None:
+            # Every filter except remove_special_characters collapses whitespace
+            text = _WHITESPACE_PATTERN.sub(" ", self._scan(text)).strip()
+        if self.remove_special_char:
+            text = unicodedata.normalize("NFKC", text).translate(_SPECIAL_CHAR_TABLE)
+        return text
+
+
+@lru_cache(maxsize=32)
+def get_tts_text_filter(
+    remove_special_char: bool,
+    ignore_brackets: bool,
+    ignore_parentheses: bool,
+    ignore_asterisks: bool,
+    ignore_angle_brackets: bool,
+) -> TTSTextFilter:
+    """Get the shared TTSTextFilter for a set of flags"""
+    return TTSTextFilter(
+        remove_special_char=remove_special_char,
+        ignore_brackets=ignore_brackets,
+        ignore_parentheses=ignore_parentheses,
+        ignore_asterisks=ignore_asterisks,
+        ignore_angle_brackets=ignore_angle_brackets,
+    )
+
 
 def tts_filter(
     text: str,
@@ -30,42 +188,19 @@ def tts_filter(
     Returns:
         str: The filtered text.
     """
-    if ignore_asterisks:
-        try:
-            text = filter_asterisks(text)
-        except Exception as e:
-            logger.warning(f"Error ignoring asterisks: {e}")
-            logger.warning(f"Text: {text}")
-            logger.warning("Skipping...")
+    try:
+        text = get_tts_text_filter(
+            remove_special_char=remove_special_char,
+            ignore_brackets=ignore_brackets,
+            ignore_parentheses=ignore_parentheses,
+            ignore_asterisks=ignore_asterisks,
+            ignore_angle_brackets=ignore_angle_brackets,
+        )(text)
+    except Exception as e:
+        logger.warning(f"Error filtering text for TTS: {e}")
+        logger.warning(f"Text: {text}")
+        logger.warning("Skipping...")
 
-    if ignore_brackets:
-        try:
-            text = filter_brackets(text)
-        except Exception as e:
-            logger.warning(f"Error ignoring brackets: {e}")
-            logger.warning(f"Text: {text}")
-            logger.warning("Skipping...")
-    if ignore_parentheses:
-        try:
-            text = filter_parentheses(text)
-        except Exception as e:
-            logger.warning(f"Error ignoring parentheses: {e}")
-            logger.warning(f"Text: {text}")
-            logger.warning("Skipping...")
-    if ignore_angle_brackets:
-        try:
-            text = filter_angle_brackets(text)
-        except Exception as e:
-            logger.warning(f"Error ignoring angle brackets: {e}")
-            logger.warning(f"Text: {text}")
-            logger.warning("Skipping...")
-    if remove_special_char:
-        try:
-            text = remove_special_characters(text)
-        except Exception as e:
-            logger.warning(f"Error removing special characters: {e}")
-            logger.warning(f"Text: {text}")
-            logger.warning("Skipping...")
     if translator:
         try:
             logger.info("Translating...")
@@ -0,0 +1,114 @@
+"""
+Versions of the server -> client WebSocket protocol of /client-ws.
+
+Version 1 (default): every message is a JSON text frame. Audio messages carry
+the audio as a base64 WAV file and the volumes as a list of floats.
+
+Version 2: requested by the client with the WebSocket subprotocol "olv.v2"
+(`new WebSocket(url, ["olv.v2"])`). Control and text messages are the same
+JSON text frames as in version 1, so they stay readable in the browser's
+developer tools. Audio messages of the TTS pipeline are binary frames:
+
+    offset  size  content
+    0       4     magic b"OLV\\x02"
+    4       4     header length H, uint32 big endian
+    8       H     header, UTF-8 JSON: the version 1 audio message without
+                  "audio" and "volumes", plus "audio_format", "sample_rate",
+                  "channels" and "volume_count"
+    8+H     N     volumes, one uint8 per slice (volume * 255), N = volume_count
+    8+H+N   ...   audio data in audio_format ("pcm_s16le": raw interleaved
+                  16-bit little-endian samples, or a compressed file format
+                  "mp3", "ogg", "aac" or "m4a", see audio_encoder)
+
+A version 2 client must still accept JSON audio messages (forwarded audio
+and agents that produce their own audio use them).
+
+Both versions benefit from permessage-deflate, which the server accepts when
+the client offers it (browsers do).
+"""
+
+import json
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import WebSocket
+
+PROTOCOL_V1 = 1
+PROTOCOL_V2 = 2
+# WebSocket subprotocols offered by the client, by protocol version
+SUBPROTOCOLS = {PROTOCOL_V2: "olv.v2"}
+
+AUDIO_FRAME_MAGIC = b"OLV\x02"
+_LENGTH = struct.Struct(">I")
+
+
+def negotiate_protocol(websocket: WebSocket) -> Tuple[int, Optional[str]]:
+    """Pick the protocol version from the subprotocols offered by the client.
+
+    Returns:
+        Tuple[int, Optional[str]]: The protocol version and the subprotocol to
+        accept the connection with (None for version 1).
+    """
+    offered = websocket.scope.get("subprotocols") or []
+    for version in sorted(SUBPROTOCOLS, reverse=True):
+        if SUBPROTOCOLS[version] in offered:
+            return version, SUBPROTOCOLS[version]
+    return PROTOCOL_V1, None
+
+
+def encode_audio_frame(
+    message: Dict[str, Any],
+    audio: Optional[bytes],
+    volumes: List[float],
+    audio_format: Optional[str] = None,
+    **audio_info: Any,
+) -> bytes:
+    """Encode an audio message as a version 2 binary frame.
+
+    Args:
+        message: The audio message without "audio" and "volumes".
+        audio: The audio data, or None for silent display.
+        volumes: Normalized volume of each slice.
+        audio_format: Format of the audio data, e.g. "pcm_s16le".
+        **audio_info: Information needed to play the audio (sample_rate, channels...).
+    """
+    header = dict(message)
+    header.update(audio_info)
+    header["audio_format"] = audio_format if audio else None
+    header["volume_count"] = len(volumes)
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    volume_bytes = bytes(min(255, max(0, round(volume * 255))) for volume in volumes)
+    return b"".join(
+        (
+            AUDIO_FRAME_MAGIC,
+            _LENGTH.pack(len(header_bytes)),
+            header_bytes,
+            volume_bytes,
+            audio or b"",
+        )
+    )
+
+
+def decode_audio_frame(frame: bytes) -> Dict[str, Any]:
+    """Decode a version 2 binary audio frame into its header, with the
+    "volumes" (floats) and the "audio" (bytes or None) added."""
+    if frame[:4] != AUDIO_FRAME_MAGIC:
+        raise ValueError("Not an audio frame")
+    (header_length,) = _LENGTH.unpack_from(frame, 4)
+    start = 8 + header_length
+    message = json.loads(frame[8:start].decode("utf-8"))
+    volume_count = message.pop("volume_count")
+    message["volumes"] = [
+        volume / 255 for volume in frame[start : start + volume_count]
+    ]
+    audio = frame[start + volume_count :]
+    message["audio"] = audio if message.get("audio_format") else None
+    return message
+
+
+def describe_audio_frame(frame: bytes) -> Dict[str, Any]:
+    """Decode a binary audio frame for logging, without the data."""
+    message = decode_audio_frame(frame)
+    message["audio"] = f"<{len(message['audio'] or b'')} bytes>"
+    message["volumes"] = f"<{len(message['volumes'])} volumes>"
+    return message
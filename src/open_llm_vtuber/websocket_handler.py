@@ -8,13 +8,16 @@ from loguru import logger
 
 from .service_context import ServiceContext
 from .chat_group import (
-    ChatGroupManager,
     handle_group_operation,
     handle_client_disconnect,
     broadcast_to_group,
 )
 from .message_handler import message_handler
+from .workers.bus import InProcessBus, MessageBus
+from .workers.groups import ClientConnections, ReplicatedChatGroupManager
 from .utils.stream_audio import prepare_audio_payload
+from .utils.client_websocket import ClientWebSocket
+from .utils.ws_protocol import PROTOCOL_V1
 from .chat_history_manager import (
     create_new_history,
     get_history,
@@ -61,11 +64,21 @@ class WSMessage(TypedDict, total=False):
 class WebSocketHandler:
     """Handles WebSocket connections and message routing"""
 
-    def __init__(self, default_context_cache: ServiceContext):
-        """Initialize the WebSocket handler with default context"""
-        self.client_connections: Dict[str, WebSocket] = {}
+    def __init__(
+        self,
+        default_context_cache: ServiceContext,
+        bus: Optional[MessageBus] = None,
+        worker_id: int = 0,
+    ):
+        """Initialize the WebSocket handler with default context
+
+        The connections and the groups are shared with the other workers
+        through the bus (all local with the default InProcessBus).
+        """
+        bus = bus or InProcessBus()
+        self.client_connections = ClientConnections(bus, worker_id)
         self.client_contexts: Dict[str, ServiceContext] = {}
-        self.chat_group_manager = ChatGroupManager()
+        self.chat_group_manager = ReplicatedChatGroupManager(bus, worker_id)
         self.current_conversation_tasks: Dict[str, Optional[asyncio.Task]] = {}
         self.default_context_cache = default_context_cache
         self.received_data_buffers: Dict[str, np.ndarray] = {}
@@ -112,6 +125,9 @@ class WebSocketHandler:
         """
         try:
             session_service_context = await self._init_service_context(websocket.send_text, client_uid)
+            session_service_context.ws_protocol = getattr(
+                websocket, "protocol_version", PROTOCOL_V1
+            )
 
             await self._store_client_data(
                 websocket, client_uid, session_service_context
@@ -141,7 +157,7 @@ class WebSocketHandler:
         self.client_contexts[client_uid] = session_service_context
         self.received_data_buffers[client_uid] = np.array([])
 
-        self.chat_group_manager.client_group_map[client_uid] = ""
+        self.chat_group_manager.register_client(client_uid)
         await self.send_group_update(websocket, client_uid)
 
     async def _send_initial_messages(
@@ -174,16 +190,16 @@ class WebSocketHandler:
         await websocket.send_text(json.dumps({"type": "control", "text": "start-mic"}))
 
     async def _init_service_context(self, send_text: Callable, client_uid: str) -> ServiceContext:
-        """Initialize service context for a new session by cloning the default context"""
+        """Initialize service context for a new session by cloning the default context.
+
+        The configs of the default context are shared, not copied. The session
+        copies them on its first switch-config (see ServiceContext.load_from_config).
+        """
         session_service_context = ServiceContext()
         await session_service_context.load_cache(
-            config=self.default_context_cache.config.model_copy(deep=True),
-            system_config=self.default_context_cache.system_config.model_copy(
-                deep=True
-            ),
-            character_config=self.default_context_cache.character_config.model_copy(
-                deep=True
-            ),
+            config=self.default_context_cache.config,
+            system_config=self.default_context_cache.system_config,
+            character_config=self.default_context_cache.character_config,
             live2d_model=self.default_context_cache.live2d_model,
             asr_engine=self.default_context_cache.asr_engine,
             tts_engine=self.default_context_cache.tts_engine,
@@ -295,7 +311,7 @@ class WebSocketHandler:
 
         # Clean up other client data
         self.client_connections.pop(client_uid, None)
-        self.client_contexts.pop(client_uid, None)
+        context = self.client_contexts.pop(client_uid, None)
         self.received_data_buffers.pop(client_uid, None)
         if client_uid in self.current_conversation_tasks:
             task = self.current_conversation_tasks[client_uid]
@@ -303,8 +319,8 @@ class WebSocketHandler:
                 task.cancel()
             self.current_conversation_tasks.pop(client_uid, None)
 
-        # Call context close to clean up resources (e.g., MCPClient)
-        context = self.client_contexts.get(client_uid)
+        # Call context close to clean up resources (e.g., MCPClient) and
+        # release its engines
         if context:
             await context.close()
 
@@ -352,6 +368,9 @@ class WebSocketHandler:
     ) -> None:
         """Handle conversation interruption"""
         heard_response = data.get("text", "")
+        if isinstance(websocket, ClientWebSocket):
+            # The client stopped the conversation, drop what is still queued of it
+            websocket.send_queue.discard_conversation()
         context = self.client_contexts[client_uid]
         group = self.chat_group_manager.get_client_group(client_uid)
 
@@ -0,0 +1,175 @@
+"""
+Publish/subscribe bus between the workers of the server.
+
+The workers share the state that is not bound to one connection (group
+membership, which client is connected to which worker) and reach the clients
+of the other workers by publishing messages on topics. Two implementations:
+
+- InProcessBus: delivers the messages within the process. Used when the
+  server runs as a single process.
+- SocketBus: a connection to the BusBroker of the supervisor process, which
+  relays the messages of each topic to the workers subscribed to it, in the
+  order it received them.
+
+Messages are delivered asynchronously (never from within `publish`), to all
+the subscribers of the topic including the publisher.
+"""
+
+import abc
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from loguru import logger
+
+from . import ipc
+from ..utils.metrics import metrics
+
+Callback = Callable[[Any], None]
+
+
+class MessageBus(abc.ABC):
+    """Publish/subscribe bus."""
+
+    def __init__(self):
+        self._callbacks: Dict[str, List[Callback]] = {}
+
+    async def start(self) -> None:
+        """Start delivering messages, called once the event loop runs."""
+
+    async def aclose(self) -> None:
+        """Stop delivering messages."""
+
+    @abc.abstractmethod
+    def publish(self, topic: str, message: Any) -> None:
+        """Publish a message on a topic. Never waits."""
+
+    def subscribe(self, topic: str, callback: Callback) -> None:
+        """Call `callback(message)` for each message published on a topic."""
+        self._callbacks.setdefault(topic, []).append(callback)
+
+    def unsubscribe(self, topic: str, callback: Callback) -> None:
+        callbacks = self._callbacks.get(topic, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if not callbacks:
+            self._callbacks.pop(topic, None)
+
+    def _deliver(self, topic: str, message: Any) -> None:
+        for callback in list(self._callbacks.get(topic, ())):
+            try:
+                callback(message)
+            except Exception as e:
+                logger.error(f"Error handling a message of topic {topic}: {e}")
+
+
+class InProcessBus(MessageBus):
+    """Bus within a single process."""
+
+    def publish(self, topic: str, message: Any) -> None:
+        metrics.inc("bus.published")
+        asyncio.get_running_loop().call_soon(self._deliver, topic, message)
+
+
+class SocketBus(MessageBus):
+    """Bus relayed by the BusBroker of the supervisor process."""
+
+    def __init__(self, address: ipc.Address, token: bytes):
+        """
+        Args:
+            address (Address): Address of the broker.
+            token (bytes): Shared token of the processes.
+        """
+        super().__init__()
+        self.address = address
+        self.token = token
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        reader, self._writer = await ipc.connect(self.address, self.token)
+        for topic in self._callbacks:
+            ipc.write_frame(self._writer, ipc.pack(("subscribe", topic)))
+        await self._writer.drain()
+        self._reader_task = asyncio.create_task(self._read_loop(reader))
+
+    async def aclose(self) -> None:
+        if self._reader_task:
+            self._reader_task.cancel()
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+
+    def publish(self, topic: str, message: Any) -> None:
+        if self._writer is None:
+            raise RuntimeError("The bus is not started")
+        metrics.inc("bus.published")
+        # The broker relays the payload without unpickling it
+        ipc.write_frame(self._writer, ipc.pack(("publish", topic)))
+        ipc.write_frame(self._writer, ipc.pack(message))
+
+    def subscribe(self, topic: str, callback: Callback) -> None:
+        if topic not in self._callbacks and self._writer is not None:
+            ipc.write_frame(self._writer, ipc.pack(("subscribe", topic)))
+        super().subscribe(topic, callback)
+
+    def unsubscribe(self, topic: str, callback: Callback) -> None:
+        super().unsubscribe(topic, callback)
+        if topic not in self._callbacks and self._writer is not None:
+            ipc.write_frame(self._writer, ipc.pack(("unsubscribe", topic)))
+
+    async def _read_loop(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while True:
+                topic = ipc.unpack(await ipc.read_frame(reader))
+                message = ipc.unpack(await ipc.read_frame(reader))
+                self._deliver(topic, message)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            logger.critical("Lost the connection to the message bus.")
+
+
+class BusBroker:
+    """Relays the messages of the SocketBus of each worker."""
+
+    def __init__(self, token: bytes):
+        self.token = token
+        self._subscribers: Dict[str, Set[asyncio.StreamWriter]] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> ipc.Address:
+        """Start listening, returns the address of the broker."""
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def aclose(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        if not await ipc.authenticate(reader, self.token):
+            writer.close()
+            return
+        topics: Set[str] = set()
+        try:
+            while True:
+                op, topic = ipc.unpack(await ipc.read_frame(reader))
+                if op == "subscribe":
+                    topics.add(topic)
+                    self._subscribers.setdefault(topic, set()).add(writer)
+                elif op == "unsubscribe":
+                    topics.discard(topic)
+                    self._subscribers.get(topic, set()).discard(writer)
+                elif op == "publish":
+                    payload = await ipc.read_frame(reader)
+                    header = ipc.pack(topic)
+                    for subscriber in self._subscribers.get(topic, ()):
+                        ipc.write_frame(subscriber, header)
+                        ipc.write_frame(subscriber, payload)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            for topic in topics:
+                self._subscribers.get(topic, set()).discard(writer)
+            writer.close()
@@ -0,0 +1,228 @@
+"""
+Engine host: the process holding the model-heavy engines of the workers.
+
+Loading a local ASR or TTS model in each worker would multiply its memory use
+and load time by the number of workers. With the multi-worker mode, the
+engines of the kinds listed in `workers.shared_engines` are loaded once, by
+the engine registry of the engine host process, and the workers get proxies
+(RemoteASR, RemoteTTS) forwarding the calls to it.
+
+A request carries the engine spec (kind, model, config, factory) of the
+caller, so the engine host loads the engines the sessions of the workers ask
+for, and shares them the same way the registry does within one process. The
+TTS engines return the path of a file in the cache directory, which the
+workers read since all the processes run on the same machine.
+"""
+
+import asyncio
+import itertools
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from . import ipc
+from ..asr.asr_interface import ASRInterface
+from ..tts.tts_interface import TTSInterface
+from ..utils.engine_registry import engine_registry
+from ..utils.metrics import metrics
+
+EngineSpec = Tuple[str, str, Dict[str, Any], Callable[..., Any]]
+
+# Engine methods the workers may call
+REMOTE_METHODS = frozenset({"async_transcribe_np", "async_generate_audio"})
+
+
+class EngineHost:
+    """Serves the calls of the workers to the engines of the engine registry."""
+
+    def __init__(self, token: bytes):
+        """
+        Args:
+            token (bytes): Shared token of the processes.
+        """
+        self.token = token
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> ipc.Address:
+        """Start listening, returns the address of the engine host."""
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def aclose(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        if not await ipc.authenticate(reader, self.token):
+            writer.close()
+            return
+        calls = set()
+        try:
+            while True:
+                request = ipc.unpack(await ipc.read_frame(reader))
+                # Calls of a worker run concurrently, replies are sent as they finish
+                task = asyncio.create_task(self._call(writer, *request))
+                calls.add(task)
+                task.add_done_callback(calls.discard)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            for task in calls:
+                task.cancel()
+            writer.close()
+
+    async def _call(
+        self,
+        writer: asyncio.StreamWriter,
+        request_id: int,
+        spec: EngineSpec,
+        method: str,
+        args: tuple,
+    ) -> None:
+        try:
+            if method not in REMOTE_METHODS:
+                raise ValueError(f"{method} is not an engine method")
+            engine = await engine_registry.acquire(*spec)
+            try:
+                result = await getattr(engine, method)(*args)
+            finally:
+                engine_registry.release(engine)
+            reply = (request_id, True, result)
+            metrics.inc("engine_host.calls")
+        except Exception as e:
+            logger.error(f"Engine host: {spec[0]} {method} failed: {e}")
+            metrics.inc("engine_host.errors")
+            reply = (request_id, False, e)
+        try:
+            payload = ipc.pack(reply)
+        except Exception:
+            # Exceptions of some engine libraries cannot be pickled
+            payload = ipc.pack((request_id, False, RuntimeError(str(reply[2]))))
+        ipc.write_frame(writer, payload)
+
+
+class _Connection:
+    """Connection of a worker to the engine host, shared by concurrent calls."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.pending: Dict[int, asyncio.Future] = {}
+        self.closed = False
+        self._reader_task = asyncio.create_task(self._read_loop(reader))
+
+    async def _read_loop(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while True:
+                request_id, ok, result = ipc.unpack(await ipc.read_frame(reader))
+                future = self.pending.pop(request_id, None)
+                if future is None or future.done():
+                    continue
+                if ok:
+                    future.set_result(result)
+                else:
+                    future.set_exception(result)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            logger.error("Lost the connection to the engine host.")
+        finally:
+            self.closed = True
+            self.writer.close()
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(
+                        ConnectionError("Lost the connection to the engine host")
+                    )
+            self.pending.clear()
+
+
+class EngineHostClient:
+    """Calls the engines of the engine host."""
+
+    def __init__(self, address: ipc.Address, token: bytes):
+        """
+        Args:
+            address (Address): Address of the engine host.
+            token (bytes): Shared token of the processes.
+        """
+        self.address = address
+        self.token = token
+        self._request_ids = itertools.count()
+        # One connection per event loop: the synchronous engine methods run
+        # their own loop (see RemoteASR.transcribe_np)
+        self._connections: Dict[asyncio.AbstractEventLoop, asyncio.Task] = {}
+
+    async def _connect(self) -> _Connection:
+        return _Connection(*await ipc.connect(self.address, self.token))
+
+    async def _connection(self) -> _Connection:
+        loop = asyncio.get_running_loop()
+        for closed_loop in [other for other in self._connections if other.is_closed()]:
+            del self._connections[closed_loop]
+        connecting = self._connections.get(loop)
+        if connecting is not None and connecting.done():
+            if connecting.exception() is not None or connecting.result().closed:
+                connecting = None
+        if connecting is None:
+            connecting = self._connections[loop] = loop.create_task(self._connect())
+        return await asyncio.shield(connecting)
+
+    async def call(self, spec: EngineSpec, method: str, *args: Any) -> Any:
+        """Call a method of the engine of `spec` in the engine host."""
+        connection = await self._connection()
+        request_id = next(self._request_ids)
+        future = asyncio.get_running_loop().create_future()
+        connection.pending[request_id] = future
+        ipc.write_frame(connection.writer, ipc.pack((request_id, spec, method, args)))
+        try:
+            return await future
+        finally:
+            # The reply of a cancelled call is dropped
+            connection.pending.pop(request_id, None)
+
+    def engine(
+        self, kind: str, factory: Callable[..., Any], model: str, **kwargs: Any
+    ) -> Any:
+        """Proxy of an engine of the engine host.
+
+        Used as the engine registry factory of the shared kinds, see
+        EngineRegistry.set_remote.
+        """
+        spec = (kind, model, kwargs, factory)
+        if kind == "asr":
+            return RemoteASR(self, spec)
+        if kind == "tts":
+            return RemoteTTS(self, spec)
+        raise ValueError(f"{kind} engines cannot run in the engine host")
+
+
+class RemoteASR(ASRInterface):
+    """ASR engine running in the engine host."""
+
+    def __init__(self, client: EngineHostClient, spec: EngineSpec):
+        self.client = client
+        self.spec = spec
+
+    async def async_transcribe_np(self, audio: np.ndarray) -> str:
+        return await self.client.call(self.spec, "async_transcribe_np", audio)
+
+    def transcribe_np(self, audio: np.ndarray) -> str:
+        return asyncio.run(self.async_transcribe_np(audio))
+
+
+class RemoteTTS(TTSInterface):
+    """TTS engine running in the engine host."""
+
+    def __init__(self, client: EngineHostClient, spec: EngineSpec):
+        self.client = client
+        self.spec = spec
+
+    async def async_generate_audio(self, text: str, file_name_no_ext=None) -> str:
+        return await self.client.call(
+            self.spec, "async_generate_audio", text, file_name_no_ext
+        )
+
+    def generate_audio(self, text: str, file_name_no_ext=None) -> str:
+        return asyncio.run(self.async_generate_audio(text, file_name_no_ext))
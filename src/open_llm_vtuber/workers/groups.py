@@ -0,0 +1,153 @@
+"""
+Group membership and client connections shared by the workers through the bus.
+
+Each worker keeps a replica of the group membership. A worker applies the
+changes it makes right away and publishes them, the other workers replay
+them when they receive them. Concurrent conflicting changes made on two
+workers (e.g. two owners inviting the same client at the same time) are
+resolved by each replica in the order it receives them.
+
+The connections of the clients of the other workers are reachable through
+ClientConnections as RemoteClient objects, whose messages are published to
+the worker holding the connection. With the InProcessBus of a single process
+server, all the clients are local and nothing goes through the bus.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, Iterator, List, MutableMapping, Tuple
+
+from fastapi import WebSocket
+from loguru import logger
+
+from .bus import MessageBus
+from ..chat_group import ChatGroupManager
+
+GROUPS_TOPIC = "groups"
+CLIENTS_TOPIC = "clients"
+
+
+def client_topic(worker_id: int) -> str:
+    """Topic of the messages to the clients of a worker."""
+    return f"client-ws.{worker_id}"
+
+
+class ReplicatedChatGroupManager(ChatGroupManager):
+    """ChatGroupManager whose changes are replayed by the other workers."""
+
+    def __init__(self, bus: MessageBus, worker_id: int = 0):
+        super().__init__()
+        self.bus = bus
+        self.worker_id = worker_id
+        bus.subscribe(GROUPS_TOPIC, self._on_change)
+
+    def register_client(self, client_uid: str) -> None:
+        super().register_client(client_uid)
+        self._publish("register_client", client_uid)
+
+    def create_group_for_client(self, client_uid: str) -> str:
+        group_id = super().create_group_for_client(client_uid)
+        self._publish("create_group_for_client", client_uid)
+        return group_id
+
+    def add_client_to_group(
+        self, inviter_uid: str, invitee_uid: str
+    ) -> Tuple[bool, str]:
+        success, message = super().add_client_to_group(inviter_uid, invitee_uid)
+        if success:
+            self._publish("add_client_to_group", inviter_uid, invitee_uid)
+        return success, message
+
+    def remove_client_from_group(
+        self, remover_uid: str, target_uid: str
+    ) -> Tuple[bool, str]:
+        success, message = super().remove_client_from_group(remover_uid, target_uid)
+        if success:
+            self._publish("remove_client_from_group", remover_uid, target_uid)
+        return success, message
+
+    def remove_client(self, client_uid: str) -> List[str]:
+        affected_members = super().remove_client(client_uid)
+        self._publish("remove_client", client_uid)
+        return affected_members
+
+    def _publish(self, method: str, *args: Any) -> None:
+        self.bus.publish(GROUPS_TOPIC, (self.worker_id, method, args))
+
+    def _on_change(self, change: Tuple[int, str, tuple]) -> None:
+        worker_id, method, args = change
+        if worker_id == self.worker_id:
+            return
+        # Apply without publishing again
+        getattr(ChatGroupManager, method)(self, *args)
+
+
+class RemoteClient:
+    """A client connected to another worker."""
+
+    def __init__(self, client_uid: str, worker_id: int, bus: MessageBus):
+        self.client_uid = client_uid
+        self.worker_id = worker_id
+        self.bus = bus
+
+    async def send_text(self, data: Any) -> None:
+        self.bus.publish(client_topic(self.worker_id), (self.client_uid, data))
+
+    async def send_json(self, data: Any, mode: str = "text") -> None:
+        await self.send_text(json.dumps(data))
+
+
+class ClientConnections(MutableMapping):
+    """client_uid -> connection of the clients of all the workers.
+
+    The connections of this worker are stored as usual, the others are
+    RemoteClient objects.
+    """
+
+    def __init__(self, bus: MessageBus, worker_id: int = 0):
+        self.bus = bus
+        self.worker_id = worker_id
+        self._local: Dict[str, WebSocket] = {}
+        self._remote: Dict[str, RemoteClient] = {}
+        bus.subscribe(CLIENTS_TOPIC, self._on_client_change)
+        bus.subscribe(client_topic(worker_id), self._on_message)
+
+    def __getitem__(self, client_uid: str) -> Any:
+        if client_uid in self._local:
+            return self._local[client_uid]
+        return self._remote[client_uid]
+
+    def __setitem__(self, client_uid: str, websocket: WebSocket) -> None:
+        self._local[client_uid] = websocket
+        self.bus.publish(CLIENTS_TOPIC, (self.worker_id, "connect", client_uid))
+
+    def __delitem__(self, client_uid: str) -> None:
+        del self._local[client_uid]
+        self.bus.publish(CLIENTS_TOPIC, (self.worker_id, "disconnect", client_uid))
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._local
+        yield from self._remote
+
+    def __len__(self) -> int:
+        return len(self._local) + len(self._remote)
+
+    def is_local(self, client_uid: str) -> bool:
+        return client_uid in self._local
+
+    def _on_client_change(self, change: Tuple[int, str, str]) -> None:
+        worker_id, event, client_uid = change
+        if worker_id == self.worker_id:
+            return
+        if event == "connect":
+            self._remote[client_uid] = RemoteClient(client_uid, worker_id, self.bus)
+        else:
+            self._remote.pop(client_uid, None)
+
+    def _on_message(self, message: Tuple[str, Any]) -> None:
+        client_uid, data = message
+        websocket = self._local.get(client_uid)
+        if websocket is None:
+            logger.debug(f"Dropped a message to disconnected client {client_uid}")
+            return
+        asyncio.create_task(websocket.send_text(data))
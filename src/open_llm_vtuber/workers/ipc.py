@@ -0,0 +1,52 @@
+"""
+Framing of the messages exchanged by the processes of the multi-worker mode.
+
+The processes talk over TCP connections on the loopback interface. Each
+message is a frame: a uint32 big endian length and the payload, a pickled
+object. A connection starts with a frame holding the shared token of the
+processes, checked before anything is unpickled.
+"""
+
+import asyncio
+import hmac
+import pickle
+import struct
+from typing import Any, Tuple
+
+_LENGTH = struct.Struct(">I")
+
+Address = Tuple[str, int]
+
+
+def pack(obj: Any) -> bytes:
+    return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def unpack(payload: bytes) -> Any:
+    return pickle.loads(payload)
+
+
+def write_frame(writer: asyncio.StreamWriter, payload: bytes) -> None:
+    writer.write(_LENGTH.pack(len(payload)) + payload)
+
+
+async def read_frame(reader: asyncio.StreamReader) -> bytes:
+    (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+    return await reader.readexactly(length)
+
+
+async def connect(address: Address, token: bytes):
+    """Open an authenticated connection to another process."""
+    reader, writer = await asyncio.open_connection(*address)
+    write_frame(writer, token)
+    await writer.drain()
+    return reader, writer
+
+
+async def authenticate(reader: asyncio.StreamReader, token: bytes) -> bool:
+    """Check the token sent by a process that connected."""
+    try:
+        received = await asyncio.wait_for(read_frame(reader), timeout=10)
+    except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+        return False
+    return hmac.compare_digest(received, token)
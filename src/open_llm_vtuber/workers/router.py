@@ -0,0 +1,154 @@
+"""
+Sticky router in front of the workers of the multi-worker mode.
+
+The router listens on the configured host and port and forwards each TCP
+connection to one of the workers. It only reads the HTTP request head of a
+connection to pick the worker, then relays the bytes both ways.
+
+A /client-ws connection gets its client_uid from the router, passed to the
+worker in the CLIENT_UID_PARAM query parameter, and is routed by it, so the
+whole session of a client runs on one worker. Other requests (static files,
+web tool, REST routes) are spread round robin.
+
+The router signs the client_uid with the shared token of the processes
+(CLIENT_UID_MAC_PARAM), and the worker only uses a client_uid with a valid
+signature. The heads of the later requests of a keep-alive connection are
+relayed as sent by the client, so a client_uid in them is not trusted and the
+worker generates a new one.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import itertools
+import zlib
+from typing import List, Mapping, Optional, Tuple
+from urllib.parse import quote
+from uuid import uuid4
+
+from loguru import logger
+
+from .ipc import Address
+
+CLIENT_UID_PARAM = "client_uid"
+CLIENT_UID_MAC_PARAM = "client_uid_mac"
+
+_CLIENT_WS_PATH = b"/client-ws"
+_BUFFER_SIZE = 65536
+
+
+def sign_client_uid(client_uid: str, token: bytes) -> str:
+    """Signature of a client_uid assigned by the router."""
+    return hmac.new(token, client_uid.encode(), hashlib.sha256).hexdigest()
+
+
+def verified_client_uid(query_params: Mapping[str, str], token: bytes) -> Optional[str]:
+    """The client_uid assigned by the router, None if missing or not signed by it."""
+    client_uid = query_params.get(CLIENT_UID_PARAM)
+    if not client_uid:
+        return None
+    mac = query_params.get(CLIENT_UID_MAC_PARAM, "")
+    expected = sign_client_uid(client_uid, token)
+    if not hmac.compare_digest(mac.encode(), expected.encode()):
+        return None
+    return client_uid
+
+
+class StickyRouter:
+    """Forwards the connections of the clients to the workers."""
+
+    def __init__(self, worker_addresses: List[Address], token: bytes):
+        """
+        Args:
+            worker_addresses (List[Address]): Addresses of the workers.
+            token (bytes): Shared token of the processes, signs the client_uids.
+        """
+        self.worker_addresses = worker_addresses
+        self.token = token
+        self._round_robin = itertools.cycle(worker_addresses)
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def worker_for(self, client_uid: str) -> Address:
+        """Address of the worker of a client."""
+        index = zlib.crc32(client_uid.encode()) % len(self.worker_addresses)
+        return self.worker_addresses[index]
+
+    async def start(self, host: str, port: int) -> None:
+        self._server = await asyncio.start_server(self._handle, host, port)
+
+    async def aclose(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def _route(self, head: bytes) -> Tuple[bytes, Address]:
+        """Worker of a request, and its head as forwarded to the worker."""
+        request_line, _, rest = head.partition(b"\r\n")
+        parts = request_line.split(b" ", 2)
+        if len(parts) != 3:
+            return head, next(self._round_robin)
+        method, target, version = parts
+        path, _, query = target.partition(b"?")
+        if path != _CLIENT_WS_PATH:
+            # A keep-alive connection stays on its worker, so a /client-ws
+            # upgrade sent after other requests gets its client_uid there
+            return head, next(self._round_robin)
+
+        client_uid = str(uuid4())
+        uid_prefix = CLIENT_UID_PARAM.encode() + b"="
+        mac_prefix = CLIENT_UID_MAC_PARAM.encode() + b"="
+        # Values sent by the client are replaced
+        params = [
+            param
+            for param in query.split(b"&")
+            if param
+            and not param.startswith(uid_prefix)
+            and not param.startswith(mac_prefix)
+        ]
+        params.append(uid_prefix + quote(client_uid).encode())
+        params.append(mac_prefix + sign_client_uid(client_uid, self.token).encode())
+        target = path + b"?" + b"&".join(params)
+        head = b" ".join((method, target, version)) + b"\r\n" + rest
+        return head, self.worker_for(client_uid)
+
+    async def _handle(
+        self, client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            head = await client_reader.readuntil(b"\r\n\r\n")
+        except (
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+            ConnectionError,
+        ):
+            client_writer.close()
+            return
+
+        head, address = self._route(head)
+        try:
+            worker_reader, worker_writer = await asyncio.open_connection(*address)
+        except OSError as e:
+            logger.error(f"Cannot reach the worker at {address[0]}:{address[1]}: {e}")
+            client_writer.close()
+            return
+
+        worker_writer.write(head)
+        await asyncio.gather(
+            _relay(client_reader, worker_writer),
+            _relay(worker_reader, client_writer),
+        )
+
+
+async def _relay(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Copy the bytes of one direction of a connection until it closes."""
+    try:
+        while True:
+            data = await reader.read(_BUFFER_SIZE)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
@@ -0,0 +1,220 @@
+"""
+Supervisor of the multi-worker mode (`workers.count` > 1).
+
+The supervisor process runs:
+
+- the BusBroker relaying the messages of the workers (see bus.py),
+- the engine host process, when `workers.shared_engines` is not empty,
+- `workers.count` worker processes, each one a WebSocketServer listening on
+  a free port of the loopback interface,
+- the StickyRouter listening on the configured host and port.
+
+The processes authenticate with a token generated at startup. When one of the
+processes exits, the supervisor stops the others: a restarted worker would
+not get the group membership of the running ones.
+"""
+
+import asyncio
+import multiprocessing
+import secrets
+import socket
+from typing import Callable, List, Optional, Sequence
+
+import uvicorn
+from loguru import logger
+
+from .bus import BusBroker, SocketBus
+from .engine_host import EngineHost, EngineHostClient
+from .ipc import Address
+from .router import StickyRouter
+from ..config_manager.utils import Config
+from ..server import WebSocketServer
+from ..service_context import ServiceContext
+from ..utils.engine_registry import engine_registry
+
+_LOOPBACK = "127.0.0.1"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind((_LOOPBACK, 0))
+        return sock.getsockname()[1]
+
+
+def run_engine_host(
+    config: Config,
+    port: int,
+    token: bytes,
+    shared_engines: Sequence[str],
+    init_logger: Callable[[str], None],
+    console_log_level: str,
+) -> None:
+    """Entry point of the engine host process."""
+    init_logger(console_log_level)
+    asyncio.run(_serve_engines(config, port, token, shared_engines))
+
+
+async def _serve_engines(
+    config: Config, port: int, token: bytes, shared_engines: Sequence[str]
+) -> None:
+    engine_registry_config = config.system_config.engine_registry
+    engine_registry.configure(memory_budget_mb=engine_registry_config.memory_budget_mb)
+    engine_host = EngineHost(token)
+    await engine_host.start(_LOOPBACK, port)
+    logger.info(f"Engine host listening on {_LOOPBACK}:{port}")
+
+    # Load the engines of the default character, and of the warm ones
+    context = ServiceContext()
+    context.config = config
+    context.system_config = config.system_config
+    warm_characters = ["conf.yaml"] + [
+        name for name in engine_registry_config.warm_characters if name != "conf.yaml"
+    ]
+    await context.preload_warm_engines(warm_characters, kinds=shared_engines)
+    await asyncio.Event().wait()
+
+
+def run_worker(
+    config: Config,
+    worker_id: int,
+    port: int,
+    token: bytes,
+    bus_address: Address,
+    engine_host_address: Optional[Address],
+    init_logger: Callable[[str], None],
+    console_log_level: str,
+) -> None:
+    """Entry point of a worker process."""
+    init_logger(console_log_level)
+    if engine_host_address:
+        engine_registry.set_remote(
+            EngineHostClient(engine_host_address, token).engine,
+            config.system_config.workers.shared_engines,
+        )
+    server = WebSocketServer(
+        config=config,
+        bus=SocketBus(bus_address, token),
+        worker_id=worker_id,
+        token=token,
+    )
+    logger.info(f"Initializing worker {worker_id}...")
+    asyncio.run(server.initialize())
+    uvicorn.run(
+        app=server.app,
+        host=_LOOPBACK,
+        port=port,
+        log_level=console_log_level.lower(),
+        ws_per_message_deflate=True,
+    )
+
+
+async def _wait_until_listening(
+    address: Address, processes: List[multiprocessing.Process]
+) -> None:
+    """Wait for a child process to listen on its port."""
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(*address)
+        except OSError:
+            exited = [process.name for process in processes if not process.is_alive()]
+            if exited:
+                raise RuntimeError(f"{', '.join(exited)} exited during startup")
+            await asyncio.sleep(0.5)
+            continue
+        writer.close()
+        return
+
+
+async def _supervise(
+    config: Config,
+    init_logger: Callable[[str], None],
+    console_log_level: str,
+    processes: List[multiprocessing.Process],
+) -> None:
+    system_config = config.system_config
+    workers_config = system_config.workers
+    token = secrets.token_bytes(32)
+    # Spawned, not forked: the children must not share the supervisor's loop
+    mp_context = multiprocessing.get_context("spawn")
+
+    broker = BusBroker(token)
+    bus_address = await broker.start(_LOOPBACK)
+
+    engine_host_address = None
+    if workers_config.shared_engines:
+        engine_host_address = (_LOOPBACK, _free_port())
+        processes.append(
+            mp_context.Process(
+                target=run_engine_host,
+                args=(
+                    config,
+                    engine_host_address[1],
+                    token,
+                    workers_config.shared_engines,
+                    init_logger,
+                    console_log_level,
+                ),
+                name="engine-host",
+            )
+        )
+
+    worker_addresses = [(_LOOPBACK, _free_port()) for _ in range(workers_config.count)]
+    for worker_id, address in enumerate(worker_addresses):
+        processes.append(
+            mp_context.Process(
+                target=run_worker,
+                args=(
+                    config,
+                    worker_id,
+                    address[1],
+                    token,
+                    bus_address,
+                    engine_host_address,
+                    init_logger,
+                    console_log_level,
+                ),
+                name=f"worker-{worker_id}",
+            )
+        )
+
+    for process in processes:
+        process.start()
+    for address in worker_addresses:
+        await _wait_until_listening(address, processes)
+
+    router = StickyRouter(worker_addresses, token)
+    await router.start(system_config.host, system_config.port)
+    logger.info(
+        f"{workers_config.count} workers serving on "
+        f"{system_config.host}:{system_config.port}"
+    )
+
+    while all(process.is_alive() for process in processes):
+        await asyncio.sleep(1)
+    exited = [process.name for process in processes if not process.is_alive()]
+    logger.critical(f"{', '.join(exited)} exited, stopping the server.")
+    await router.aclose()
+    await broker.aclose()
+
+
+def run_workers(
+    config: Config, init_logger: Callable[[str], None], console_log_level: str
+) -> None:
+    """Run the server as a supervisor of worker processes, until one exits.
+
+    Args:
+        config (Config): The application config.
+        init_logger (Callable[[str], None]): Sets up the logger of a child
+            process, given the console log level. Must be picklable.
+        console_log_level (str): Console log level.
+    """
+    processes: List[multiprocessing.Process] = []
+    try:
+        asyncio.run(_supervise(config, init_logger, console_log_level, processes))
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            if process.pid is not None:
+                process.join(timeout=10)